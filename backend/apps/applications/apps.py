@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ApplicationsConfig(AppConfig):
     name = "apps.applications"
+
+    def ready(self):
+        from apps.applications import signals  # noqa: F401
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.applications.services import ApplicationCounterServices
+
+
+class Command(BaseCommand):
+    help = "Recount application status counters from the applications table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many counters have drifted",
+        )
+
+    def handle(self, *args, **options):
+        drifted = ApplicationCounterServices.reconcile(dry_run=options["dry_run"])
+
+        if options["dry_run"]:
+            self.stdout.write(f"{drifted} counter(s) out of sync")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Reconciled {drifted} counter(s)"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.applications.services import ApplicationMatchServices
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute applicant match scores (run periodically, as experience "
+        "grows with time, or with --missing after bulk inserts)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="Only score applications without a match score",
+        )
+
+    def handle(self, *args, **options):
+        scored = ApplicationMatchServices.score_all(missing_only=options["missing"])
+        self.stdout.write(self.style.SUCCESS(f"Scored {scored} application(s)"))
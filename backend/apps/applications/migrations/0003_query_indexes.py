@@ -0,0 +1,44 @@
+# Generated by Django 6.0.2 on 2026-10-17 11:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0002_application_status_counter"),
+        ("jobs", "0005_query_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["applicant", "-applied_at", "-id"],
+                name="application_applicant_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["job", "status", "-applied_at"],
+                name="application_job_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["job", "-applied_at", "-id"], name="application_job_applied_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["job", "-applied_at"],
+                name="application_pending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-17 12:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0003_query_indexes"),
+        ("jobs", "0005_query_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["-applied_at", "-id"], name="application_applied_idx"
+            ),
+        ),
+    ]
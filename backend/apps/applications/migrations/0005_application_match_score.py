@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-17 16:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0004_applied_at_index"),
+        ("jobs", "0006_similar_jobs"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="application",
+            name="match_score",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["job", "-match_score", "-applied_at"],
+                name="application_job_match_idx",
+            ),
+        ),
+    ]
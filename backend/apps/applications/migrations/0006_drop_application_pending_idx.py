@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-17 18:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0005_application_match_score"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="application",
+            name="application_pending_idx",
+        ),
+    ]
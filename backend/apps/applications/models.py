@@ -47,8 +47,38 @@ class Application(models.Model):
     applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Skill/experience match with the job (0-1), stored by
+    # ApplicationMatchServices on create and when the profile or job changes
+    match_score = models.FloatField(blank=True, null=True, editable=False)
+
     class Meta:
         unique_together = ("job", "applicant")
+        indexes = [
+            # Default list ordering; (-applied_at, -id) is also the keyset order.
+            # Recruiters with many jobs walk this and stop after one page
+            models.Index(fields=["-applied_at", "-id"], name="application_applied_idx"),
+            # Seeker listings (get_queryset, my_applications) by -applied_at
+            models.Index(
+                fields=["applicant", "-applied_at", "-id"],
+                name="application_applicant_idx",
+            ),
+            # Recruiter listings: job__recruiter joins into job_id, then
+            # ?status= (e.g. the pending queue) and the default -applied_at
+            # ordering
+            models.Index(
+                fields=["job", "status", "-applied_at"],
+                name="application_job_status_idx",
+            ),
+            models.Index(
+                fields=["job", "-applied_at", "-id"],
+                name="application_job_applied_idx",
+            ),
+            # job_applications?order=match
+            models.Index(
+                fields=["job", "-match_score", "-applied_at"],
+                name="application_job_match_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.applicant.email} - {self.job.title}"
@@ -73,3 +103,46 @@ class ApplicationFeedback(models.Model):
 
     def __str__(self):
         return f"Feedback for {self.application.applicant.email} - {self.status_given}"
+
+
+class ApplicationStatusCounter(models.Model):
+    """
+    Denormalized application counts per status for one user, maintained on
+    application create/status change/delete (see ApplicationCounterServices).
+    Seekers are counted by the applications they sent, recruiters by the
+    applications received on their jobs.
+    """
+
+    ROLE_CHOICES = (
+        ("seeker", "Job Seeker"),
+        ("recruiter", "Recruiter"),
+    )
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="application_counters"
+    )
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES)
+
+    total = models.IntegerField(default=0)
+    pending = models.IntegerField(default=0)
+    reviewed = models.IntegerField(default=0)
+    accepted = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "role")
+        verbose_name_plural = "Application Status Counters"
+
+    def __str__(self):
+        return f"{self.user.email} ({self.role}) - {self.total} applications"
+
+    def as_summary(self):
+        return {
+            "total": self.total,
+            "pending": self.pending,
+            "reviewed": self.reviewed,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+        }
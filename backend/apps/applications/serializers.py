@@ -30,6 +30,13 @@ class ApplicationListSerializer(serializers.ModelSerializer):
         read_only_fields = ("applied_at", "updated_at", "id")
 
 
+class ApplicationMatchSerializer(ApplicationListSerializer):
+    """Application list item with the applicant's match score (order=match)"""
+
+    class Meta(ApplicationListSerializer.Meta):
+        fields = ApplicationListSerializer.Meta.fields + ("match_score",)
+
+
 class ApplicationDetailSerializer(serializers.ModelSerializer):
     """Serializer for application detail view"""
 
@@ -0,0 +1,514 @@
+import csv
+import io
+import json
+from collections import defaultdict
+import numpy as np
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from apps.applications.models import (
+    Application,
+    ApplicationFeedback,
+    ApplicationStatusCounter,
+)
+from apps.core.services import EmailOutboxServices
+from apps.jobs.models import Job
+from apps.jobs.similarity import words
+
+STATUSES = [choice[0] for choice in Application.STATUS_CHOICES]
+
+
+class ApplicationCounterServices:
+    """Maintain and read the per-user ApplicationStatusCounter rows"""
+
+    @staticmethod
+    def summarize(applications):
+        """Total and per-status counts of a queryset in one aggregate query"""
+        return applications.aggregate(
+            total=Count("id"),
+            **{status: Count("id", filter=Q(status=status)) for status in STATUSES},
+        )
+
+    @staticmethod
+    def summary_for(user, role):
+        """Counter-backed summary for a seeker or recruiter"""
+        counter = ApplicationStatusCounter.objects.filter(user=user, role=role).first()
+        if counter is None:
+            return {"total": 0, **{status: 0 for status in STATUSES}}
+        return counter.as_summary()
+
+    @staticmethod
+    def apply(user_id, role, deltas, create=False):
+        """
+        Add deltas (e.g. {"total": 1, "pending": 1}) to a user's counter.
+        Uses F() increments so concurrent writers never lose updates.
+        Missing counters are only created when create=True (new applications);
+        decrements never recreate a counter, e.g. while its user is deleted.
+        """
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas or user_id is None:
+            return
+
+        counters = ApplicationStatusCounter.objects.filter(user_id=user_id, role=role)
+        updates = {field: F(field) + delta for field, delta in deltas.items()}
+
+        if not counters.update(**updates) and create:
+            ApplicationStatusCounter.objects.get_or_create(user_id=user_id, role=role)
+            counters.update(**updates)
+
+    @staticmethod
+    def record(applicant_id, recruiter_id, deltas, create=False):
+        """Apply the same deltas to the applicant's and the recruiter's counter"""
+        ApplicationCounterServices.apply(applicant_id, "seeker", deltas, create)
+        ApplicationCounterServices.apply(recruiter_id, "recruiter", deltas, create)
+
+    @staticmethod
+    def record_created(application, recruiter_id):
+        ApplicationCounterServices.record(
+            application.applicant_id,
+            recruiter_id,
+            {"total": 1, application.status: 1},
+            create=True,
+        )
+
+    @staticmethod
+    def record_deleted(application, recruiter_id):
+        ApplicationCounterServices.record(
+            application.applicant_id,
+            recruiter_id,
+            {"total": -1, application.status: -1},
+        )
+
+    @staticmethod
+    def grouped_deltas():
+        """{role: {user_id: {field: delta}}} to fill for apply_grouped"""
+        return {
+            "seeker": defaultdict(lambda: defaultdict(int)),
+            "recruiter": defaultdict(lambda: defaultdict(int)),
+        }
+
+    @staticmethod
+    def apply_grouped(deltas):
+        """
+        Apply per-user deltas from grouped_deltas. Users with the same deltas
+        share one UPDATE, so changing many applications costs a handful of
+        queries instead of two per application.
+        """
+        for role, by_user in deltas.items():
+            users_by_delta = defaultdict(list)
+            for user_id, user_deltas in by_user.items():
+                key = tuple(sorted((f, d) for f, d in user_deltas.items() if d))
+                if key:
+                    users_by_delta[key].append(user_id)
+
+            for key, user_ids in users_by_delta.items():
+                ApplicationStatusCounter.objects.filter(
+                    user_id__in=user_ids, role=role
+                ).update(**{field: F(field) + delta for field, delta in key})
+
+    @staticmethod
+    def record_status_changes(changes, new_status):
+        """
+        Counter moves for many applications switching to new_status.
+        changes: (applicant_id, recruiter_id, old_status) tuples.
+        """
+        deltas = ApplicationCounterServices.grouped_deltas()
+        for applicant_id, recruiter_id, old_status in changes:
+            if old_status == new_status:
+                continue
+            for role, user_id in (
+                ("seeker", applicant_id),
+                ("recruiter", recruiter_id),
+            ):
+                deltas[role][user_id][old_status] -= 1
+                deltas[role][user_id][new_status] += 1
+
+        ApplicationCounterServices.apply_grouped(deltas)
+
+    @staticmethod
+    def record_deleted_many(applications):
+        """
+        Counter moves for a queryset of applications about to be deleted
+        (a job or a user and everything cascading from it). One aggregate
+        query reads the counts per applicant, recruiter and status.
+        """
+        rows = (
+            applications.values("applicant_id", "job__recruiter_id", "status")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+
+        deltas = ApplicationCounterServices.grouped_deltas()
+        for row in rows:
+            for role, user_id in (
+                ("seeker", row["applicant_id"]),
+                ("recruiter", row["job__recruiter_id"]),
+            ):
+                deltas[role][user_id]["total"] -= row["n"]
+                deltas[role][user_id][row["status"]] -= row["n"]
+
+        ApplicationCounterServices.apply_grouped(deltas)
+
+    @staticmethod
+    def record_status_change(application, recruiter_id, old_status):
+        if old_status == application.status:
+            return
+        ApplicationCounterServices.record(
+            application.applicant_id,
+            recruiter_id,
+            {old_status: -1, application.status: 1},
+        )
+
+    @staticmethod
+    def expected_counters():
+        """Recount every counter from the applications table"""
+        expected = defaultdict(lambda: {"total": 0, **{s: 0 for s in STATUSES}})
+
+        for role, user_field in (
+            ("seeker", "applicant"),
+            ("recruiter", "job__recruiter"),
+        ):
+            rows = (
+                Application.objects.values(user_field, "status")
+                .annotate(n=Count("id"))
+                .order_by()
+            )
+            for row in rows:
+                counts = expected[(row[user_field], role)]
+                counts[row["status"]] += row["n"]
+                counts["total"] += row["n"]
+
+        return expected
+
+    @staticmethod
+    def reconcile(dry_run=False):
+        """
+        Repair counter drift against the applications table.
+
+        Returns:
+            int: number of counters that were missing, wrong or stale
+        """
+        fields = ["total"] + STATUSES
+
+        with transaction.atomic():
+            expected = ApplicationCounterServices.expected_counters()
+            existing = {
+                (counter.user_id, counter.role): counter
+                for counter in ApplicationStatusCounter.objects.select_for_update()
+            }
+
+            to_create, to_update = [], []
+            for key, counts in expected.items():
+                counter = existing.pop(key, None)
+                if counter is None:
+                    to_create.append(
+                        ApplicationStatusCounter(user_id=key[0], role=key[1], **counts)
+                    )
+                elif counter.as_summary() != counts:
+                    for field in fields:
+                        setattr(counter, field, counts[field])
+                    to_update.append(counter)
+
+            # Counters left over have no applications behind them
+            stale = [c for c in existing.values() if any(c.as_summary().values())]
+
+            if not dry_run:
+                ApplicationStatusCounter.objects.bulk_create(to_create)
+                for counter in stale:
+                    for field in fields:
+                        setattr(counter, field, 0)
+                ApplicationStatusCounter.objects.bulk_update(to_update + stale, fields)
+
+        return len(to_create) + len(to_update) + len(stale)
+
+
+class ApplicationStatusServices:
+    """Status changes with recruiter feedback, for one or many applications"""
+
+    @staticmethod
+    def validate(status_value, feedback_text):
+        """Error message for an invalid status/feedback pair, or None"""
+        if status_value not in STATUSES:
+            return f'Invalid status. Must be one of: {", ".join(STATUSES)}'
+
+        if not feedback_text or len(feedback_text.strip()) == 0:
+            return "Feedback is required when updating application status"
+
+        if len(feedback_text) > 1000:
+            return "Feedback must be less than 1000 characters"
+
+        return None
+
+    @staticmethod
+    def bulk_update(recruiter, application_ids, status_value, feedback_text):
+        """
+        Set the status and feedback of many of the recruiter's applications in
+        one transaction: one UPDATE for the applications, one UPDATE plus one
+        INSERT for the feedback, grouped counter updates and one outbox INSERT
+        for the notification emails.
+
+        Returns:
+            tuple: updated applications and the ids that were not found
+        """
+        now = timezone.now()
+
+        with transaction.atomic():
+            applications = list(
+                Application.objects.select_for_update(of=("self",))
+                .filter(pk__in=application_ids, job__recruiter=recruiter)
+                .select_related("job", "applicant")
+                .order_by("pk")
+            )
+            found = {application.pk for application in applications}
+            missing = [pk for pk in application_ids if pk not in found]
+            if not applications:
+                return [], missing
+
+            ApplicationCounterServices.record_status_changes(
+                [
+                    (application.applicant_id, recruiter.pk, application.status)
+                    for application in applications
+                ],
+                status_value,
+            )
+
+            Application.objects.filter(pk__in=found).update(
+                status=status_value, updated_at=now
+            )
+            for application in applications:
+                application.status = status_value
+                application.updated_at = now
+
+            feedback_values = {
+                "recruiter": recruiter,
+                "feedback_text": feedback_text,
+                "status_given": status_value,
+            }
+            existing = set(
+                ApplicationFeedback.objects.filter(
+                    application_id__in=found
+                ).values_list("application_id", flat=True)
+            )
+            ApplicationFeedback.objects.filter(application_id__in=existing).update(
+                updated_at=now, **feedback_values
+            )
+            ApplicationFeedback.objects.bulk_create(
+                [
+                    ApplicationFeedback(application=application, **feedback_values)
+                    for application in applications
+                    if application.pk not in existing
+                ]
+            )
+
+            EmailOutboxServices.queue_status_update_emails(applications, feedback_text)
+
+        return applications, missing
+
+
+class ApplicationMatchServices:
+    """
+    Rank applicants by how well their profile fits the job.
+
+    Skills: cosine between the applicant's skill words and the job's
+    requirement words, each counted once. Experience: years of experience
+    over experience_required, capped at 1. Scores are stored on
+    Application.match_score when an application is created or its profile
+    or job changes (see apps.applications.signals), so rankings only read
+    them; score_all refreshes the whole table.
+    """
+
+    SKILL_WEIGHT = 0.7
+    EXPERIENCE_WEIGHT = 0.3
+
+    # Applications scored per batch by score_all()
+    BATCH_SIZE = 5000
+
+    @staticmethod
+    def score_job(requirements, experience_required, profiles):
+        """
+        Match scores of applicants for one job.
+
+        Args:
+            requirements: Job.requirements text
+            experience_required: Job.experience_required in years
+            profiles: (skills text, experience start date) per applicant
+
+        Returns:
+            numpy.ndarray: one score between 0 and 1 per profile
+        """
+        required = set(words(requirements))
+        skills = [set(words(text)) for text, _ in profiles]
+
+        overlap = np.array([len(s & required) for s in skills], dtype=np.float64)
+        norms = np.sqrt(np.array([len(s) for s in skills]) * len(required))
+        skill_score = np.divide(
+            overlap, norms, out=np.zeros_like(overlap), where=norms > 0
+        )
+
+        # Same formula as UserProfile.get_experience_years
+        today = np.datetime64(timezone.now().date(), "D")
+        starts = np.array(
+            [start or today for _, start in profiles], dtype="datetime64[D]"
+        )
+        years = np.maximum((today - starts).astype(np.float64) / 365.25, 0)
+        if experience_required:
+            experience_score = np.minimum(years / experience_required, 1)
+        else:
+            experience_score = np.ones(len(profiles))
+
+        return (
+            ApplicationMatchServices.SKILL_WEIGHT * skill_score
+            + ApplicationMatchServices.EXPERIENCE_WEIGHT * experience_score
+        )
+
+    @staticmethod
+    def score(applications):
+        """
+        Compute and store match_score for the applications of a queryset:
+        one query for the profiles, one for the jobs and batched updates,
+        instead of a profile fetch per applicant.
+
+        Returns:
+            int: number of applications scored
+        """
+        rows = list(
+            applications.values_list(
+                "pk",
+                "job_id",
+                "applicant__profile__skills",
+                "applicant__profile__experience",
+            )
+        )
+        if not rows:
+            return 0
+
+        by_job = defaultdict(list)
+        for row in rows:
+            by_job[row[1]].append(row)
+        jobs = {
+            pk: (requirements, experience_required)
+            for pk, requirements, experience_required in Job.objects.filter(
+                pk__in=by_job
+            ).values_list("pk", "requirements", "experience_required")
+        }
+
+        scored = []
+        for job_id, job_rows in by_job.items():
+            scores = ApplicationMatchServices.score_job(
+                *jobs[job_id],
+                [(skills, experience) for _, _, skills, experience in job_rows],
+            )
+            scored.extend(
+                Application(pk=row[0], match_score=round(float(score), 4))
+                for row, score in zip(job_rows, scores)
+            )
+
+        Application.objects.bulk_update(scored, ["match_score"], batch_size=1000)
+        return len(scored)
+
+    @staticmethod
+    def score_all(missing_only=False):
+        """
+        Score every application (or only unscored ones, such as rows
+        bulk-inserted without signals) in BATCH_SIZE primary key ranges.
+        Experience grows with time, so a periodic full run keeps it current.
+
+        Returns:
+            int: number of applications scored
+        """
+        applications = Application.objects.order_by("pk")
+        if missing_only:
+            applications = applications.filter(match_score__isnull=True)
+
+        scored, last = 0, 0
+        while pks := list(
+            applications.filter(pk__gt=last).values_list("pk", flat=True)[
+                : ApplicationMatchServices.BATCH_SIZE
+            ]
+        ):
+            scored += ApplicationMatchServices.score(
+                Application.objects.filter(pk__in=pks)
+            )
+            last = pks[-1]
+        return scored
+
+
+class ApplicationExportServices:
+    """
+    Stream a recruiter's applications as CSV or NDJSON.
+
+    Rows come from a server-side cursor (iterator) over one joined values
+    query, and are written out a chunk at a time, so memory stays constant
+    however many applications are exported.
+    """
+
+    # Output column -> ORM lookup
+    COLUMNS = {
+        "id": "id",
+        "job_id": "job_id",
+        "job_title": "job__title",
+        "company_name": "job__company_name",
+        "applicant_name": "applicant__full_name",
+        "applicant_email": "applicant__email",
+        "status": "status",
+        "cover_letter": "cover_letter",
+        "resume": "resume",
+        "feedback": "feedback__feedback_text",
+        "applied_at": "applied_at",
+        "updated_at": "updated_at",
+    }
+
+    FORMATS = {
+        "csv": "text/csv",
+        "ndjson": "application/x-ndjson",
+    }
+
+    @staticmethod
+    def rows(applications):
+        """Yield one tuple per application, in COLUMNS order"""
+        chunk_size = settings.APPLICATION_EXPORT_CHUNK_SIZE
+        resume_index = list(ApplicationExportServices.COLUMNS).index("resume")
+
+        values = applications.order_by("-applied_at", "-id").values_list(
+            *ApplicationExportServices.COLUMNS.values()
+        )
+        for row in values.iterator(chunk_size=chunk_size):
+            resume = row[resume_index]
+            if resume:
+                # CloudinaryField values are resources; export their URL
+                row = list(row)
+                row[resume_index] = getattr(resume, "url", str(resume))
+            yield row
+
+    @staticmethod
+    def stream(applications, export_format):
+        """Yield the export as text chunks of APPLICATION_EXPORT_CHUNK_SIZE rows"""
+        columns = list(ApplicationExportServices.COLUMNS)
+        chunk_size = settings.APPLICATION_EXPORT_CHUNK_SIZE
+        buffer = io.StringIO()
+
+        if export_format == "csv":
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            write = writer.writerow
+        else:
+
+            def write(row):
+                buffer.write(
+                    json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+                )
+
+        count = 0
+        for row in ApplicationExportServices.rows(applications):
+            write(row)
+            count += 1
+            if count % chunk_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
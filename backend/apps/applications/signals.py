@@ -0,0 +1,65 @@
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.applications.models import Application
+from apps.applications.services import (
+    ApplicationCounterServices,
+    ApplicationMatchServices,
+)
+from apps.authentication.models import User, UserProfile
+from apps.jobs.models import Job
+
+# Columns ApplicationMatchServices scores on
+MATCH_PROFILE_FIELDS = {"skills", "experience"}
+MATCH_JOB_FIELDS = {"requirements", "experience_required"}
+
+
+@receiver(pre_delete, sender=Job)
+def count_job_applications_deleted(sender, instance, **kwargs):
+    """The job's applications cascade with it; move the counters in bulk"""
+    ApplicationCounterServices.record_deleted_many(
+        Application.objects.filter(job=instance)
+    )
+
+
+@receiver(pre_delete, sender=User)
+def count_user_applications_deleted(sender, instance, **kwargs):
+    """
+    Applications sent by a deleted seeker cascade with them. A recruiter's
+    received applications are counted by their jobs' own pre_delete.
+    """
+    ApplicationCounterServices.record_deleted_many(
+        Application.objects.filter(applicant=instance)
+    )
+
+
+@receiver(post_save, sender=Application)
+def score_new_application(sender, instance, created, **kwargs):
+    """Store the match score when the application is made"""
+    if created:
+        ApplicationMatchServices.score(Application.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=UserProfile)
+def rescore_applicant_applications(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    """Skills or experience may have changed; rescore the applications"""
+    # Profiles are created with the user, before any application
+    if created:
+        return
+    if update_fields is not None and not MATCH_PROFILE_FIELDS & set(update_fields):
+        return
+
+    ApplicationMatchServices.score(
+        Application.objects.filter(applicant_id=instance.user_id)
+    )
+
+
+@receiver(post_save, sender=Job)
+def rescore_job_applications(sender, instance, created, update_fields=None, **kwargs):
+    """Requirements may have changed; rescore the job's applicants"""
+    if created or not instance.fields_changed(MATCH_JOB_FIELDS, update_fields):
+        return
+
+    ApplicationMatchServices.score(Application.objects.filter(job=instance))
@@ -1,3 +1,377 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.applications.models import Application
+from apps.applications.services import (
+    ApplicationCounterServices,
+    ApplicationMatchServices,
+)
+from apps.authentication.models import User, UserProfile
+from apps.jobs.models import Job
+
+
+def make_user(email, role):
+    return User.objects.create_user(
+        email=email, password="pass12345", full_name=email.split("@")[0], role=role
+    )
+
+
+def make_job(recruiter, title="Backend developer"):
+    return Job.objects.create(
+        recruiter=recruiter,
+        category="it",
+        title=title,
+        description="Build APIs",
+        requirements="python django",
+        location="Dhaka",
+        job_type="full_time",
+        company_name="Acme",
+    )
+
+
+class ApplicationCounterTests(TestCase):
+    """Counters must always match a recount of the applications table"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.recruiter = make_user("recruiter@example.com", "recruiter")
+        self.seekers = [
+            make_user(f"seeker{index}@example.com", "seeker") for index in range(3)
+        ]
+        self.jobs = [make_job(self.recruiter, f"Job {index}") for index in range(2)]
+
+    def apply(self, seeker, job):
+        self.client.force_authenticate(seeker)
+        response = self.client.post(
+            "/api/applications/", {"job_id": job.pk, "cover_letter": "Hi"}
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        return Application.objects.get(pk=response.data["id"])
+
+    def apply_all(self):
+        return [self.apply(seeker, job) for seeker in self.seekers for job in self.jobs]
+
+    def assertConsistent(self):
+        self.assertEqual(ApplicationCounterServices.reconcile(dry_run=True), 0)
+
+    def summary(self, user, role):
+        return ApplicationCounterServices.summary_for(user, role)
+
+    def test_create(self):
+        self.apply_all()
+
+        self.assertConsistent()
+        self.assertEqual(
+            self.summary(self.recruiter, "recruiter"),
+            {"total": 6, "pending": 6, "reviewed": 0, "accepted": 0, "rejected": 0},
+        )
+        self.assertEqual(self.summary(self.seekers[0], "seeker")["pending"], 2)
+
+    def test_update_status(self):
+        application = self.apply_all()[0]
+        self.client.force_authenticate(self.recruiter)
+
+        for value in ("reviewed", "accepted", "accepted"):
+            response = self.client.post(
+                f"/api/applications/{application.pk}/update_status/",
+                {"status": value, "feedback_text": "Thanks"},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 200, response.data)
+
+        self.assertConsistent()
+        summary = self.summary(self.recruiter, "recruiter")
+        self.assertEqual((summary["pending"], summary["accepted"]), (5, 1))
+
+    def test_partial_update(self):
+        application = self.apply_all()[0]
+        self.client.force_authenticate(self.recruiter)
+
+        response = self.client.patch(
+            f"/api/applications/{application.pk}/",
+            {"status": "rejected"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertConsistent()
+        self.assertEqual(self.summary(self.seekers[0], "seeker")["rejected"], 1)
+
+    def test_bulk_update_status(self):
+        applications = self.apply_all()
+        self.client.force_authenticate(self.recruiter)
+
+        response = self.client.post(
+            "/api/applications/bulk_update_status/",
+            {
+                "application_ids": [a.pk for a in applications[:4]],
+                "status": "reviewed",
+                "feedback_text": "Shortlisted",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertConsistent()
+        self.assertEqual(self.summary(self.recruiter, "recruiter")["reviewed"], 4)
+
+    def test_delete(self):
+        application = self.apply_all()[0]
+        self.client.force_authenticate(application.applicant)
+
+        response = self.client.delete(f"/api/applications/{application.pk}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertConsistent()
+        self.assertEqual(self.summary(self.recruiter, "recruiter")["total"], 5)
+
+    def test_job_delete_cascades(self):
+        applications = self.apply_all()
+        self.client.force_authenticate(self.recruiter)
+        self.client.post(
+            f"/api/applications/{applications[0].pk}/update_status/",
+            {"status": "reviewed", "feedback_text": "Thanks"},
+            format="json",
+        )
+
+        response = self.client.delete(f"/api/jobs/{self.jobs[0].pk}/")
+        self.assertEqual(response.status_code, 204)
+
+        self.assertConsistent()
+        self.assertEqual(self.summary(self.recruiter, "recruiter")["total"], 3)
+        self.assertEqual(self.summary(self.seekers[0], "seeker")["reviewed"], 0)
+
+    def test_seeker_delete_cascades(self):
+        self.apply_all()
+        self.seekers[0].delete()
+
+        self.assertConsistent()
+        self.assertEqual(self.summary(self.recruiter, "recruiter")["total"], 4)
+
+    def test_recruiter_delete_cascades(self):
+        self.apply_all()
+        self.recruiter.delete()
+
+        self.assertConsistent()
+        self.assertEqual(self.summary(self.seekers[0], "seeker")["total"], 0)
+
+
+class ApplicationExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.recruiter = make_user("recruiter@example.com", "recruiter")
+        self.jobs = [make_job(self.recruiter, f"Job {index}") for index in range(2)]
+        other_job = make_job(make_user("other@example.com", "recruiter"))
+        self.seekers = [
+            make_user(f"seeker{index}@example.com", "seeker") for index in range(3)
+        ]
+        for seeker in self.seekers:
+            for job in (*self.jobs, other_job):
+                Application.objects.create(
+                    job=job, applicant=seeker, cover_letter=f"Hi from {seeker.pk}"
+                )
+        self.client.force_authenticate(self.recruiter)
+
+    def export(self, query=""):
+        response = self.client.get(f"/api/applications/export/{query}")
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_csv(self):
+        application = Application.objects.filter(job=self.jobs[0]).first()
+        self.client.post(
+            f"/api/applications/{application.pk}/update_status/",
+            {"status": "reviewed", "feedback_text": "Strong profile"},
+            format="json",
+        )
+
+        response, body = self.export()
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(
+            response["Content-Disposition"],
+            'attachment; filename="applications.csv"',
+        )
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual({row["company_name"] for row in rows}, {"Acme"})
+        expected = Application.objects.filter(job__recruiter=self.recruiter)
+        self.assertEqual(
+            [int(row["id"]) for row in rows],
+            list(expected.order_by("-applied_at", "-id").values_list("id", flat=True)),
+        )
+        exported = next(row for row in rows if int(row["id"]) == application.pk)
+        self.assertEqual(
+            (exported["status"], exported["feedback"]), ("reviewed", "Strong profile")
+        )
+
+    def test_ndjson(self):
+        response, body = self.export("?export_format=ndjson")
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0]["applicant_email"][-12:], "@example.com")
+        self.assertIsNone(rows[0]["feedback"])
+
+    def test_filters(self):
+        _, body = self.export(f"?export_format=ndjson&job_id={self.jobs[1].pk}")
+        self.assertEqual(
+            {json.loads(line)["job_id"] for line in body.splitlines()},
+            {self.jobs[1].pk},
+        )
+
+        _, body = self.export("?status=accepted")
+        self.assertEqual(body.splitlines()[1:], [])
+
+    def test_bad_requests(self):
+        for query in ("?export_format=xlsx", "?job_id=abc"):
+            response = self.client.get(f"/api/applications/export/{query}")
+            self.assertEqual(response.status_code, 400, query)
+
+        self.client.force_authenticate(self.seekers[0])
+        response = self.client.get("/api/applications/export/")
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(APPLICATION_EXPORT_CHUNK_SIZE=2)
+    def test_queries_do_not_grow_with_the_export(self):
+        def export_queries(query):
+            with CaptureQueriesContext(connection) as queries:
+                _, body = self.export(query)
+            return len(queries), len(body.splitlines())
+
+        one_job = export_queries(f"?job_id={self.jobs[0].pk}")
+        every_job = export_queries("")
+        self.assertEqual((one_job[1], every_job[1]), (4, 7))
+        self.assertEqual(one_job[0], every_job[0])
+
+
+class ApplicationMatchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.recruiter = make_user("recruiter@example.com", "recruiter")
+        self.job = make_job(self.recruiter)
+        self.job.experience_required = 2
+        self.job.save()
+        self.seekers = [
+            make_user(f"seeker{index}@example.com", "seeker") for index in range(3)
+        ]
+        self.set_profile(self.seekers[0], "Python, Django and SQL", years=4)
+        self.set_profile(self.seekers[1], "python react", years=1)
+        self.set_profile(self.seekers[2], "", years=0)
+
+    def set_profile(self, user, skills, years):
+        UserProfile.objects.update_or_create(
+            user=user,
+            defaults={
+                "skills": skills,
+                "experience": timezone.now().date() - timedelta(days=365.25 * years),
+            },
+        )
+
+    def apply(self, seeker):
+        self.client.force_authenticate(seeker)
+        response = self.client.post(
+            "/api/applications/", {"job_id": self.job.pk, "cover_letter": "Hi"}
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        return Application.objects.get(pk=response.data["id"])
+
+    def ranking(self):
+        self.client.force_authenticate(self.recruiter)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f"/api/applications/job_applications/?order=match&job_id={self.job.pk}"
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        # Rankings only read the stored scores
+        self.assertFalse(
+            [query for query in queries if query["sql"].startswith("UPDATE")]
+        )
+        return [
+            (item["applicant_email"], item["match_score"]) for item in response.data
+        ]
+
+    def test_score_job(self):
+        today = timezone.now().date()
+        scores = ApplicationMatchServices.score_job(
+            "python django",
+            2,
+            [
+                ("python django", today - timedelta(days=1461)),
+                ("python react", today - timedelta(days=365)),
+                (None, None),
+            ],
+        )
+        # 0.7 * skill cosine + 0.3 * min(years / required, 1)
+        self.assertAlmostEqual(scores[0], 1.0, places=3)
+        self.assertAlmostEqual(scores[1], 0.7 * 0.5 + 0.3 * 0.5, places=3)
+        self.assertEqual(scores[2], 0)
+
+        no_experience_needed = ApplicationMatchServices.score_job(
+            "python", 0, [(None, None)]
+        )
+        self.assertAlmostEqual(no_experience_needed[0], 0.3)
+
+    def test_scores_are_stored_when_applying(self):
+        application = self.apply(self.seekers[1])
+        self.assertAlmostEqual(application.match_score, 0.5, places=3)
+
+    def test_match_ordering(self):
+        for seeker in reversed(self.seekers):
+            self.apply(seeker)
+
+        self.assertEqual(
+            [email for email, _ in self.ranking()],
+            [seeker.email for seeker in self.seekers],
+        )
+
+        response = self.client.get("/api/applications/job_applications/?order=best")
+        self.assertEqual(response.status_code, 400)
+
+    def test_profile_and_job_edits_rescore(self):
+        for seeker in self.seekers:
+            self.apply(seeker)
+
+        self.set_profile(self.seekers[2], "python django", years=5)
+        self.assertEqual(self.ranking()[0][0], self.seekers[2].email)
+
+        before = dict(self.ranking())
+        self.job.requirements = "react"
+        self.job.save(update_fields=["requirements"])
+        after = dict(self.ranking())
+        self.assertGreater(after[self.seekers[1].email], before[self.seekers[1].email])
+        self.assertEqual(self.ranking()[0][0], self.seekers[1].email)
+
+    def test_unrelated_saves_keep_scores(self):
+        application = self.apply(self.seekers[0])
+        Application.objects.filter(pk=application.pk).update(match_score=0.123)
+
+        self.job.title = "Platform developer"
+        self.job.save(update_fields=["title"])
+        UserProfile.objects.get(user=self.seekers[0]).save(update_fields=["bio"])
+
+        application.refresh_from_db()
+        self.assertEqual(application.match_score, 0.123)
+
+    def test_unscored_applications_rank_last_until_scored(self):
+        scored = self.apply(self.seekers[2])
+        Application.objects.bulk_create(
+            [Application(job=self.job, applicant=self.seekers[0])]
+        )
+        self.assertEqual(
+            self.ranking(),
+            [
+                (self.seekers[2].email, scored.match_score),
+                (self.seekers[0].email, None),
+            ],
+        )
+
+        call_command("score_applications", "--missing", stdout=io.StringIO())
+        self.assertEqual(self.ranking()[0][0], self.seekers[0].email)
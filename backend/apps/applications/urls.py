@@ -26,11 +26,16 @@ urlpatterns = [
 # GET    /api/applications/my_applications/         - My applications (job seeker)
 # GET    /api/applications/job_applications/        - Applications for my jobs (recruiter)
 # POST   /api/applications/{id}/update_status/      - Update status with feedback (recruiter)
+# POST   /api/applications/bulk_update_status/      - Update many statuses with feedback (recruiter)
 # GET    /api/applications/{id}/applicant_profile/  - Get applicant's full profile
 # GET    /api/applications/{id}/feedback/           - Get feedback for application
 # GET    /api/applications/status_summary/          - Summary of application counts
+# GET    /api/applications/export/                  - Download applications for my jobs (recruiter)
 
 # Query Parameters Examples:
 # /api/applications/my_applications/
 # /api/applications/job_applications/?job_id=5
+# /api/applications/job_applications/?job_id=5&order=match (best profile match first)
+# /api/applications/export/?export_format=ndjson&job_id=5
 # /api/applications/status_summary/
+# /api/applications/?pagination=cursor (keyset pages on -applied_at, id)
@@ -1,3 +1,8 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from drf_yasg import openapi
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -6,15 +11,22 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
 from apps.applications.models import Application, ApplicationFeedback
+from apps.applications.services import (
+    ApplicationCounterServices,
+    ApplicationExportServices,
+    ApplicationStatusServices,
+)
 from apps.applications.serializers import (
     ApplicationListSerializer,
+    ApplicationMatchSerializer,
     ApplicationDetailSerializer,
     ApplicationCreateSerializer,
     ApplicationStatusUpdateSerializer,
 )
 from apps.authentication.serializers import UserDetailSerializer
 from apps.applications.serializers import ApplicationFeedbackSerializer
-from apps.core.services import Services, EmailServices
+from apps.core.services import Services, EmailOutboxServices
+from apps.core.swagger_docs import SwaggerDocumentation
 
 
 class ApplicationViewSet(viewsets.ModelViewSet):
@@ -51,10 +63,15 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         """Filter applications based on user role"""
         user = self.request.user
 
+        applications = Application.objects.all()
+        if self.action == "list":
+            # ApplicationListSerializer reads the job and applicant of each row
+            applications = applications.select_related("job", "applicant")
+
         if Services.user_role(user) == "seeker":
-            return Application.objects.filter(applicant=user)
+            return applications.filter(applicant=user)
         elif Services.user_role(user) == "recruiter":
-            return Application.objects.filter(job__recruiter=user)
+            return applications.filter(job__recruiter=user)
 
         return Application.objects.none()
 
@@ -69,14 +86,16 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        application = serializer.save()
-
-        # Send email notifications
-        # 1. Email to job seeker confirming application
-        EmailServices.send_application_received_email(application)
+        with transaction.atomic():
+            application = serializer.save()
+            ApplicationCounterServices.record_created(
+                application, application.job.recruiter_id
+            )
 
-        # 2. Email to recruiter notifying of new application
-        EmailServices.send_new_application_notification_email(application)
+            # Queue email notifications (sent by the outbox worker):
+            # 1. Email to job seeker confirming application
+            # 2. Email to recruiter notifying of new application
+            EmailOutboxServices.queue_application_emails(application)
 
         return Response(
             ApplicationDetailSerializer(application).data,
@@ -95,7 +114,13 @@ class ApplicationViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(application, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+
+        old_status = application.status
+        with transaction.atomic():
+            serializer.save()
+            ApplicationCounterServices.record_status_change(
+                application, application.job.recruiter_id, old_status
+            )
 
         return Response(
             ApplicationDetailSerializer(application).data, status=status.HTTP_200_OK
@@ -105,13 +130,17 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         """Delete application (applicant only)"""
         application = self.get_object()
 
-        if application.applicant != request.user:
+        if application.applicant_id != request.user.pk:
             return Response(
                 {"error": "You can only delete your own applications"},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        application.delete()
+        with transaction.atomic():
+            application.delete()
+            ApplicationCounterServices.record_deleted(
+                application, application.job.recruiter_id
+            )
         return Response(
             {"message": "Application deleted successfully"},
             status=status.HTTP_204_NO_CONTENT,
@@ -130,6 +159,27 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         serializer = ApplicationListSerializer(applications, many=True)
         return Response(serializer.data)
 
+    @SwaggerDocumentation.custom_action(
+        method="get",
+        manual_parameters=[
+            openapi.Parameter(
+                "job_id",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+                description="Only applications for this job",
+            ),
+            openapi.Parameter(
+                "order",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=["applied", "match"],
+                required=False,
+                description="match: best skill/experience match first, with match_score",
+            ),
+        ],
+        description="Get applications for my jobs",
+    )
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
     def job_applications(self, request):
         """Get all applications for recruiter's jobs"""
@@ -139,15 +189,100 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        applications = Application.objects.filter(job__recruiter=request.user)
+        order = request.query_params.get("order", "applied")
+        if order not in ("applied", "match"):
+            return Response(
+                {"error": "order must be 'applied' or 'match'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        applications = Application.objects.filter(
+            job__recruiter=request.user
+        ).select_related("job", "applicant")
 
         job_id = request.query_params.get("job_id")
         if job_id:
             applications = applications.filter(job_id=job_id)
 
+        if order == "match":
+            # Scores are stored on write; unscored rows (bulk inserts) go last
+            applications = applications.order_by(
+                F("match_score").desc(nulls_last=True), "-applied_at"
+            )
+            serializer = ApplicationMatchSerializer(applications, many=True)
+            return Response(serializer.data)
+
         serializer = ApplicationListSerializer(applications, many=True)
         return Response(serializer.data)
 
+    @SwaggerDocumentation.custom_action(
+        method="get",
+        manual_parameters=[
+            openapi.Parameter(
+                "export_format",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=list(ApplicationExportServices.FORMATS),
+                required=False,
+                description="csv (default) or ndjson",
+            ),
+            openapi.Parameter(
+                "job_id",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+                description="Only applications for this job",
+            ),
+            openapi.Parameter(
+                "status",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Only applications with this status",
+            ),
+        ],
+        description="Download applications for my jobs as CSV or NDJSON",
+    )
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
+    def export(self, request):
+        """Stream all applications for recruiter's jobs (constant memory)"""
+        if Services.user_role(request.user) != "recruiter":
+            return Response(
+                {"error": "Only recruiters can export job applications"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        export_format = request.query_params.get("export_format", "csv")
+        if export_format not in ApplicationExportServices.FORMATS:
+            return Response(
+                {"error": "export_format must be csv or ndjson"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        applications = Application.objects.filter(job__recruiter=request.user)
+
+        job_id = request.query_params.get("job_id")
+        if job_id:
+            if not job_id.isdigit():
+                return Response(
+                    {"error": "job_id must be an integer"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            applications = applications.filter(job_id=job_id)
+
+        status_value = request.query_params.get("status")
+        if status_value:
+            applications = applications.filter(status=status_value)
+
+        response = StreamingHttpResponse(
+            ApplicationExportServices.stream(applications, export_format),
+            content_type=ApplicationExportServices.FORMATS[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="applications.{export_format}"'
+        )
+        return response
+
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
     def update_status(self, request, pk=None):
         """
@@ -165,60 +300,132 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         status_value = request.data.get("status")
         feedback_text = request.data.get("feedback_text")
 
-        valid_statuses = [choice[0] for choice in Application.STATUS_CHOICES]
-        if status_value not in valid_statuses:
-            return Response(
-                {
-                    "error": f'Invalid status. Must be one of: {", ".join(valid_statuses)}'
+        error = ApplicationStatusServices.validate(status_value, feedback_text)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            # Update application status
+            old_status = application.status
+            application.status = status_value
+            application.save()
+            ApplicationCounterServices.record_status_change(
+                application, application.job.recruiter_id, old_status
+            )
+
+            # Create or update feedback
+            feedback, created = ApplicationFeedback.objects.update_or_create(
+                application=application,
+                defaults={
+                    "recruiter": request.user,
+                    "feedback_text": feedback_text,
+                    "status_given": status_value,
                 },
-                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if not feedback_text or len(feedback_text.strip()) == 0:
+            # Queue the email notification matching the new status
+            EmailOutboxServices.queue_status_update_email(application, feedback_text)
+
+        return Response(
+            {
+                "message": "Application status updated with feedback",
+                "application": ApplicationDetailSerializer(application).data,
+                "feedback": {
+                    "id": feedback.id,
+                    "feedback_text": feedback.feedback_text,
+                    "status_given": feedback.status_given,
+                    "created_at": feedback.created_at,
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @SwaggerDocumentation.custom_action(
+        method="post",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["application_ids", "status", "feedback_text"],
+            properties={
+                "application_ids": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_INTEGER),
+                ),
+                "status": openapi.Schema(type=openapi.TYPE_STRING),
+                "feedback_text": openapi.Schema(type=openapi.TYPE_STRING),
+            },
+        ),
+        response_schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "message": openapi.Schema(type=openapi.TYPE_STRING),
+                "updated": openapi.Schema(type=openapi.TYPE_INTEGER),
+                "not_found": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_INTEGER),
+                ),
+            },
+        ),
+        description="Update the status of many applications with one feedback",
+    )
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
+    def bulk_update_status(self, request):
+        """
+        Same as update_status for many applications at once (recruiter only).
+        Requires 'application_ids', 'status' and 'feedback_text'.
+        """
+        if Services.user_role(request.user) != "recruiter":
+            return Response(
+                {"error": "Only recruiters can update application status"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        application_ids = request.data.get("application_ids")
+        if (
+            not isinstance(application_ids, list)
+            or not application_ids
+            or not all(
+                isinstance(pk, int) and not isinstance(pk, bool)
+                for pk in application_ids
+            )
+        ):
             return Response(
-                {"error": "Feedback is required when updating application status"},
+                {"error": "application_ids must be a non-empty list of ids"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if len(feedback_text) > 1000:
+        max_ids = settings.APPLICATION_BULK_UPDATE_MAX
+        if len(application_ids) > max_ids:
             return Response(
-                {"error": "Feedback must be less than 1000 characters"},
+                {"error": f"At most {max_ids} applications per request"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Update application status
-        application.status = status_value
-        application.save()
-
-        # Create or update feedback
-        feedback, created = ApplicationFeedback.objects.update_or_create(
-            application=application,
-            defaults={
-                "recruiter": request.user,
-                "feedback_text": feedback_text,
-                "status_given": status_value,
-            },
+        status_value = request.data.get("status")
+        feedback_text = request.data.get("feedback_text")
+
+        error = ApplicationStatusServices.validate(status_value, feedback_text)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        updated, missing = ApplicationStatusServices.bulk_update(
+            request.user,
+            list(dict.fromkeys(application_ids)),
+            status_value,
+            feedback_text,
         )
 
-        # Send appropriate email notification based on status
-        if status_value == "accepted":
-            EmailServices.send_application_accepted_email(application)
-        elif status_value == "rejected":
-            EmailServices.send_application_rejected_email(application, feedback_text)
-        else:
-            # For pending and reviewed statuses
-            EmailServices.send_application_status_update_email(application, feedback_text)
+        if not updated:
+            return Response(
+                {"error": "No applications found for your jobs", "not_found": missing},
+                status=status.HTTP_404_NOT_FOUND,
+            )
 
         return Response(
             {
-                "message": "Application status updated with feedback",
-                "application": ApplicationDetailSerializer(application).data,
-                "feedback": {
-                    "id": feedback.id,
-                    "feedback_text": feedback.feedback_text,
-                    "status_given": feedback.status_given,
-                    "created_at": feedback.created_at,
-                },
+                "message": "Application statuses updated with feedback",
+                "updated": len(updated),
+                "status": status_value,
+                "not_found": missing,
             },
             status=status.HTTP_200_OK,
         )
@@ -245,20 +452,15 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
     def status_summary(self, request):
         """Get summary of application statuses"""
-        if Services.user_role(request.user) == "seeker":
-            applications = Application.objects.filter(applicant=request.user)
-        elif Services.user_role(request.user) == "recruiter":
-            applications = Application.objects.filter(job__recruiter=request.user)
-        else:
+        role = Services.user_role(request.user)
+        if role not in ("seeker", "recruiter"):
             return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
 
-        summary = {
-            "total": applications.count(),
-            "pending": applications.filter(status="pending").count(),
-            "reviewed": applications.filter(status="reviewed").count(),
-            "accepted": applications.filter(status="accepted").count(),
-            "rejected": applications.filter(status="rejected").count(),
-        }
+        if settings.APPLICATION_STATUS_COUNTERS:
+            # Denormalized counters maintained on every application write
+            summary = ApplicationCounterServices.summary_for(request.user, role)
+        else:
+            summary = ApplicationCounterServices.summarize(self.get_queryset())
 
         return Response(summary)
 
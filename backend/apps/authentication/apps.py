@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class AuthenticationsConfig(AppConfig):
     name = "apps.authentication"
+
+    def ready(self):
+        from apps.authentication import checks, signals  # noqa: F401
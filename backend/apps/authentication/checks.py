@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends whose entries only live in the process that wrote them
+PROCESS_LOCAL_CACHES = {"django.core.cache.backends.locmem.LocMemCache"}
+
+
+@register(Tags.caches)
+def check_user_cache_is_shared(app_configs, **kwargs):
+    """
+    CachedJWTAuthentication evicts a saved user from the cache, which only
+    reaches other workers through a shared cache
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if settings.AUTH_USER_CACHE_TIMEOUT <= 0 or backend not in PROCESS_LOCAL_CACHES:
+        return []
+
+    return [
+        Error(
+            "AUTH_USER_CACHE_TIMEOUT needs a cache shared by every worker.",
+            hint=(
+                f"{backend} is per process, so deactivated or changed users "
+                "stay cached in other workers. Configure a shared CACHE_BACKEND "
+                "(e.g. FileBasedCache, DatabaseCache, Redis) or set "
+                "AUTH_USER_CACHE_TIMEOUT=0."
+            ),
+            id="authentication.E001",
+        )
+    ]
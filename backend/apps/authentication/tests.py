@@ -1,3 +1,53 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from apps.authentication.authentication import CachedJWTAuthentication
+from apps.authentication.checks import check_user_cache_is_shared
+from apps.authentication.models import User
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+FILE_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": "/tmp/jobly-test-cache",
+    }
+}
+
+
+class UserCacheCheckTests(TestCase):
+    @override_settings(CACHES=LOCMEM, AUTH_USER_CACHE_TIMEOUT=60)
+    def test_process_local_cache_is_rejected(self):
+        errors = check_user_cache_is_shared(None)
+        self.assertEqual([error.id for error in errors], ["authentication.E001"])
+
+    @override_settings(CACHES=LOCMEM, AUTH_USER_CACHE_TIMEOUT=0)
+    def test_disabled_user_cache_needs_nothing(self):
+        self.assertEqual(check_user_cache_is_shared(None), [])
+
+    @override_settings(CACHES=FILE_CACHE, AUTH_USER_CACHE_TIMEOUT=60)
+    def test_shared_cache_is_accepted(self):
+        self.assertEqual(check_user_cache_is_shared(None), [])
+
+
+@override_settings(AUTH_USER_CACHE_TIMEOUT=60)
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="seeker@example.com", password="pass12345", full_name="Seeker"
+        )
+        self.token = AccessToken.for_user(self.user)
+        self.authentication = CachedJWTAuthentication()
+
+    def test_user_is_served_from_the_cache(self):
+        self.authentication.get_user(self.token)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authentication.get_user(self.token), self.user)
+
+    def test_saved_user_is_reloaded(self):
+        self.authentication.get_user(self.token)
+        self.user.full_name = "Renamed"
+        self.user.save()
+
+        self.assertEqual(self.authentication.get_user(self.token).full_name, "Renamed")
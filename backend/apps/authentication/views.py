@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.db import transaction
 from rest_framework import viewsets, status, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -9,7 +10,7 @@ from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django.contrib.auth.tokens import default_token_generator
 from typing import cast
 from drf_yasg import openapi
-from apps.core.services import EmailServices
+from apps.core.services import EmailServices, EmailOutboxServices
 from apps.core.swagger_docs import SwaggerDocumentation
 
 from apps.authentication.models import User, EmailVerification
@@ -49,22 +50,15 @@ class AuthViewSet(viewsets.GenericViewSet):
     )
     @action(detail=False, methods=["post"], permission_classes=[AllowAny])
     def register(self, request):
-        """Register new user account. Sends verification email."""
+        """Register new user account. Queues verification email."""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = cast(User, serializer.save())
 
-        email_sent = EmailServices.send_verification_email(user)
+        with transaction.atomic():
+            user = cast(User, serializer.save())
 
-        if not email_sent:
-            return Response(
-                {
-                    "message": "User created but email could not be sent. Try resending.",
-                    "user_id": str(user.id),
-                    "email": user.email,
-                },
-                status=status.HTTP_201_CREATED,
-            )
+            # Verification email is sent by the outbox worker
+            EmailOutboxServices.queue_verification_email(user)
 
         return Response(
             {
@@ -0,0 +1,477 @@
+from typing import Any, Callable, NamedTuple
+from urllib.parse import urlencode
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management.base import CommandError
+from django.db.models import Exists, OuterRef
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.applications.models import Application, ApplicationFeedback
+from apps.authentication.models import EmailVerification
+from apps.jobs.models import Job
+from apps.reviews.models import Review
+
+User = get_user_model()
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+# Routes that are not driven, with the reason
+SKIPPED_ROUTES = {
+    ("application-list", "post"): "uploads a resume to Cloudinary",
+}
+
+
+class Endpoint(NamedTuple):
+    """One request against the API, filled with ids from the current database"""
+
+    name: str
+    user: Any
+    url: str
+    method: str = "get"
+    # Request body, or a callable returning it (called after setup)
+    data: Any = None
+    # Called before the request, inside the transaction that is rolled back
+    setup: Callable | None = None
+    status: int = 200
+
+
+def sample_data():
+    """Rows the endpoints are built around"""
+    job = Job.objects.order_by("-created_at").select_related("recruiter").first()
+    application = Application.objects.select_related("applicant", "job").first()
+    review = Review.objects.order_by("-created_at").select_related("reviewer").first()
+
+    if job is None or application is None or review is None:
+        raise CommandError(
+            "Need at least one job, application and review "
+            "(seed data with `manage.py generate_data`)"
+        )
+
+    return job, application, review
+
+
+def sample_endpoints():
+    """
+    Representative read endpoints.
+    Used by the explain_endpoints and benchmark_endpoints commands.
+    """
+    job, application, review = sample_data()
+    recruiter = job.recruiter
+    seeker = application.applicant
+    job_recruiter = application.job.recruiter
+
+    return [
+        # Jobs (public)
+        Endpoint("jobs-list", None, "/api/jobs/"),
+        Endpoint("jobs-list-category", None, f"/api/jobs/?category={job.category}"),
+        Endpoint("jobs-list-job-type", None, f"/api/jobs/?job_type={job.job_type}"),
+        Endpoint(
+            "jobs-list-location",
+            None,
+            f"/api/jobs/?{urlencode({'location': job.location})}",
+        ),
+        Endpoint("jobs-list-salary", None, "/api/jobs/?ordering=-salary"),
+        Endpoint(
+            "jobs-list-salary-range",
+            None,
+            "/api/jobs/?min_salary=60000&max_salary=120000",
+        ),
+        Endpoint("jobs-list-open", None, "/api/jobs/?open_only=true"),
+        Endpoint(
+            "jobs-list-ranges",
+            None,
+            f"/api/jobs/?category={job.category}&open_only=true&max_experience=5"
+            "&min_salary=50000",
+        ),
+        Endpoint(
+            "jobs-list-search", None, f"/api/jobs/?{urlencode({'search': job.title})}"
+        ),
+        Endpoint("jobs-list-cursor", None, "/api/jobs/?pagination=cursor"),
+        Endpoint("jobs-list-facets", None, "/api/jobs/?facets=true"),
+        Endpoint(
+            "jobs-list-facets-only",
+            None,
+            f"/api/jobs/?{urlencode({'search': job.title, 'facets_only': 'true'})}",
+        ),
+        Endpoint("jobs-detail", None, f"/api/jobs/{job.pk}/"),
+        Endpoint("jobs-similar", None, f"/api/jobs/{job.pk}/similar_jobs/"),
+        # Jobs (seeker)
+        Endpoint("jobs-feed", seeker, "/api/jobs/feed/"),
+        # Jobs (recruiter)
+        Endpoint("jobs-mine", recruiter, "/api/jobs/my_jobs/"),
+        # Applications
+        Endpoint("applications-list-recruiter", recruiter, "/api/applications/"),
+        Endpoint(
+            "applications-list-status",
+            recruiter,
+            "/api/applications/?status=pending",
+        ),
+        Endpoint(
+            "applications-for-job",
+            job_recruiter,
+            f"/api/applications/job_applications/?job_id={application.job_id}",
+        ),
+        # Scores are computed cold (the previous iteration was rolled back)
+        Endpoint(
+            "applications-for-job-match",
+            job_recruiter,
+            f"/api/applications/job_applications/?job_id={application.job_id}"
+            "&order=match",
+        ),
+        Endpoint(
+            "applications-for-recruiter-match",
+            job_recruiter,
+            "/api/applications/job_applications/?order=match",
+        ),
+        Endpoint(
+            "applications-summary", recruiter, "/api/applications/status_summary/"
+        ),
+        Endpoint(
+            "applications-export",
+            job_recruiter,
+            f"/api/applications/export/?job_id={application.job_id}",
+        ),
+        Endpoint(
+            "applications-export-ndjson",
+            job_recruiter,
+            "/api/applications/export/?export_format=ndjson",
+        ),
+        Endpoint("applications-list-seeker", seeker, "/api/applications/"),
+        Endpoint("applications-mine", seeker, "/api/applications/my_applications/"),
+        Endpoint("applications-detail", seeker, f"/api/applications/{application.pk}/"),
+        Endpoint(
+            "applications-applicant-profile",
+            job_recruiter,
+            f"/api/applications/{application.pk}/applicant_profile/",
+        ),
+        Endpoint(
+            "applications-feedback",
+            seeker,
+            f"/api/applications/{application.pk}/feedback/",
+            setup=lambda: ApplicationFeedback.objects.update_or_create(
+                application=application,
+                defaults={
+                    "recruiter": job_recruiter,
+                    "feedback_text": "Thanks for applying",
+                    "status_given": application.status,
+                },
+            ),
+        ),
+        # Reviews
+        Endpoint("reviews-list", None, "/api/reviews/"),
+        Endpoint(
+            "reviews-list-recruiter",
+            None,
+            f"/api/reviews/?recruiter={review.recruiter_id}",
+        ),
+        Endpoint(
+            "reviews-for-recruiter",
+            None,
+            f"/api/reviews/recruiter_reviews/?recruiter_id={review.recruiter_id}",
+        ),
+        Endpoint(
+            "reviews-for-job", None, f"/api/reviews/job_reviews/?job_id={review.job_id}"
+        ),
+        Endpoint(
+            "reviews-statistics",
+            None,
+            f"/api/reviews/recruiter_statistics/?recruiter_id={review.recruiter_id}",
+        ),
+        Endpoint("reviews-top-recruiters", None, "/api/reviews/top_recruiters/"),
+        Endpoint("reviews-received", recruiter, "/api/reviews/my_received_reviews/"),
+        Endpoint("reviews-mine", seeker, "/api/reviews/my_reviews/"),
+        Endpoint("reviews-detail", None, f"/api/reviews/{review.pk}/"),
+        Endpoint(
+            "reviews-helpful-votes", seeker, f"/api/reviews/{review.pk}/helpful_votes/"
+        ),
+        # Auth
+        Endpoint("auth-profile", seeker, "/api/auth/profile/"),
+    ]
+
+
+def set_password(user):
+    user.set_password(BENCHMARK_PASSWORD)
+    user.save(update_fields=["password"])
+
+
+def set_verified(user, verified):
+    User.objects.filter(pk=user.pk).update(is_verified=verified)
+    user.is_verified = verified
+
+
+def write_endpoints():
+    """
+    Endpoints that change data. Callers run each one in a transaction that is
+    rolled back, so the dataset is the same for every iteration.
+    """
+    job, application, review = sample_data()
+    seeker = application.applicant
+    job_recruiter = application.job.recruiter
+    reviewer = review.reviewer
+
+    # An application its applicant has not reviewed yet
+    unreviewed = (
+        Application.objects.filter(
+            ~Exists(
+                Review.objects.filter(
+                    job=OuterRef("job"), reviewer=OuterRef("applicant")
+                )
+            )
+        )
+        .select_related("applicant")
+        .first()
+    )
+
+    job_body = {
+        "title": "Benchmark Engineer",
+        "description": job.description,
+        "requirements": job.requirements,
+        "location": job.location,
+        "job_type": job.job_type,
+        "category": job.category,
+        "salary": 100000,
+        "experience_required": 2,
+        "position_count": 1,
+        "company_name": job.company_name,
+    }
+
+    def reset_token_body():
+        user = User.objects.get(pk=seeker.pk)
+        return {
+            "uid": urlsafe_base64_encode(force_bytes(user.pk)),
+            "token": default_token_generator.make_token(user),
+            "new_password": "benchmark-password-2",
+        }
+
+    endpoints = [
+        # Jobs
+        Endpoint(
+            "jobs-create",
+            job.recruiter,
+            "/api/jobs/",
+            "post",
+            job_body,
+            status=201,
+        ),
+        Endpoint(
+            "jobs-update",
+            job.recruiter,
+            f"/api/jobs/{job.pk}/",
+            "put",
+            job_body,
+        ),
+        Endpoint(
+            "jobs-partial-update",
+            job.recruiter,
+            f"/api/jobs/{job.pk}/",
+            "patch",
+            {"salary": 120000},
+        ),
+        Endpoint(
+            "jobs-delete", job.recruiter, f"/api/jobs/{job.pk}/", "delete", status=204
+        ),
+        Endpoint(
+            "jobs-bulk-import",
+            job.recruiter,
+            "/api/jobs/bulk_import/",
+            "post",
+            {
+                "jobs": [
+                    dict(job_body, title=f"Benchmark Engineer {i}") for i in range(50)
+                ]
+            },
+            status=201,
+        ),
+        # Applications
+        Endpoint(
+            "applications-update",
+            job_recruiter,
+            f"/api/applications/{application.pk}/",
+            "put",
+            {"cover_letter": "Updated cover letter"},
+        ),
+        Endpoint(
+            "applications-partial-update",
+            job_recruiter,
+            f"/api/applications/{application.pk}/",
+            "patch",
+            {"cover_letter": "Updated cover letter"},
+        ),
+        Endpoint(
+            "applications-delete",
+            seeker,
+            f"/api/applications/{application.pk}/",
+            "delete",
+            status=204,
+        ),
+        Endpoint(
+            "applications-update-status",
+            job_recruiter,
+            f"/api/applications/{application.pk}/update_status/",
+            "post",
+            {"status": "reviewed", "feedback_text": "Thanks, we are reviewing it"},
+        ),
+        Endpoint(
+            "applications-bulk-update-status",
+            job_recruiter,
+            "/api/applications/bulk_update_status/",
+            "post",
+            {
+                "application_ids": list(
+                    Application.objects.filter(job__recruiter=job_recruiter)
+                    .order_by("id")
+                    .values_list("id", flat=True)[:50]
+                ),
+                "status": "reviewed",
+                "feedback_text": "Thanks, we are reviewing it",
+            },
+        ),
+        # Reviews
+        Endpoint(
+            "reviews-update",
+            reviewer,
+            f"/api/reviews/{review.pk}/",
+            "put",
+            {"rating": 4, "comment": "Updated review"},
+        ),
+        Endpoint(
+            "reviews-partial-update",
+            reviewer,
+            f"/api/reviews/{review.pk}/",
+            "patch",
+            {"rating": 3},
+        ),
+        Endpoint(
+            "reviews-delete",
+            reviewer,
+            f"/api/reviews/{review.pk}/",
+            "delete",
+            status=204,
+        ),
+        Endpoint(
+            "reviews-helpful", seeker, f"/api/reviews/{review.pk}/helpful/", "post"
+        ),
+        # Auth
+        Endpoint(
+            "auth-register",
+            None,
+            "/api/auth/register/",
+            "post",
+            {
+                "full_name": "Benchmark User",
+                "email": "benchmark.register@example.com",
+                "role": "seeker",
+                "password": BENCHMARK_PASSWORD,
+            },
+            status=201,
+        ),
+        Endpoint(
+            "auth-verify-email",
+            None,
+            "/api/auth/verify_email/",
+            "post",
+            {"token": "benchmark-verification-token"},
+            setup=lambda: EmailVerification.objects.update_or_create(
+                user=seeker,
+                defaults={
+                    "token": "benchmark-verification-token",
+                    "is_verified": False,
+                },
+            ),
+        ),
+        Endpoint(
+            "auth-resend-verification",
+            None,
+            "/api/auth/resend_verification/",
+            "post",
+            {"email": seeker.email},
+            setup=lambda: set_verified(seeker, False),
+        ),
+        Endpoint(
+            "auth-login",
+            None,
+            "/api/auth/login/",
+            "post",
+            {"email": seeker.email, "password": BENCHMARK_PASSWORD},
+            setup=lambda: set_password(seeker),
+        ),
+        Endpoint("auth-logout", seeker, "/api/auth/logout/", "post"),
+        Endpoint(
+            "auth-request-password-reset",
+            None,
+            "/api/auth/request_password_reset/",
+            "post",
+            {"email": seeker.email},
+            setup=lambda: set_verified(seeker, True),
+        ),
+        Endpoint(
+            "auth-confirm-password-reset",
+            None,
+            "/api/auth/confirm_password_reset/",
+            "post",
+            reset_token_body,
+            setup=lambda: set_verified(seeker, True),
+        ),
+        Endpoint(
+            "auth-update-profile",
+            seeker,
+            "/api/auth/update_profile/",
+            "patch",
+            {"full_name": "Benchmark Seeker"},
+        ),
+        Endpoint(
+            "auth-change-password",
+            seeker,
+            "/api/auth/change_password/",
+            "post",
+            {
+                "old_password": BENCHMARK_PASSWORD,
+                "new_password": "benchmark-password-2",
+            },
+            setup=lambda: set_password(seeker),
+        ),
+        Endpoint(
+            "auth-refresh-token",
+            None,
+            "/api/auth/refresh_token/",
+            "post",
+            lambda: {"refresh": str(RefreshToken.for_user(seeker))},
+        ),
+    ]
+
+    if unreviewed is not None:
+        endpoints.append(
+            Endpoint(
+                "reviews-create",
+                unreviewed.applicant,
+                "/api/reviews/",
+                "post",
+                {"job_id": unreviewed.job_id, "rating": 5, "comment": "Great"},
+                status=201,
+            )
+        )
+
+    return endpoints
+
+
+def api_routes(resolver=None, prefix=""):
+    """
+    Every (route name, HTTP method) served by the API viewsets, e.g.
+    ("job-list", "get"), used to check that every route is benchmarked.
+    """
+    resolver = resolver or get_resolver()
+    routes = set()
+
+    for pattern in resolver.url_patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            routes |= api_routes(pattern, route)
+        elif isinstance(pattern, URLPattern) and route.startswith("api/"):
+            actions = getattr(pattern.callback, "actions", None) or {}
+            # DRF adds HEAD for every GET; it runs the same code
+            routes |= {(pattern.name, method) for method in actions if method != "head"}
+
+    return routes
@@ -0,0 +1,275 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from smtplib import SMTPServerDisconnected
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template import engines
+from django.template.loader import get_template
+
+from apps.core.metrics import record_email
+from apps.core.timing import measure
+
+logger = logging.getLogger(__name__)
+
+# One open mail connection per worker thread, reused across messages
+_local = threading.local()
+
+
+@lru_cache(maxsize=None)
+def _compiled_templates(name):
+    return get_template(f"emails/{name}.html"), get_template(f"emails/{name}.txt")
+
+
+def email_templates(name):
+    """
+    Compiled (html, txt) templates of templates/emails/<name>.*, loaded once
+    per process. With DEBUG they are loaded every time so edits show up.
+    """
+    if settings.DEBUG:
+        return _compiled_templates.__wrapped__(name)
+    return _compiled_templates(name)
+
+
+def build_message(name, subject, to, context, from_email=None):
+    """Render an HTML/TXT email template pair into an unsent message"""
+    html_template, text_template = email_templates(name)
+
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=text_template.render(context),
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=to,
+    )
+    message.attach_alternative(html_template.render(context), "text/html")
+    return message
+
+
+def pooled_connection():
+    """
+    This worker's open mail connection, opened on first use and kept open
+    (one SMTP session / HTTP session for every email the worker sends).
+    A new one is opened if EMAIL_BACKEND changed, e.g. under override_settings.
+    """
+    backend = settings.EMAIL_BACKEND
+    connection = getattr(_local, "connection", None)
+    if connection is not None and _local.backend == backend:
+        return connection
+
+    close_connection()
+    connection = get_connection(backend)
+    connection.open()
+    _local.connection, _local.backend = connection, backend
+    return connection
+
+
+def close_connection():
+    """Close and forget this worker's pooled connection"""
+    connection = getattr(_local, "connection", None)
+    _local.connection = None
+    if connection is None:
+        return
+
+    try:
+        connection.close()
+    except Exception:
+        logger.warning("Error closing the pooled mail connection", exc_info=True)
+
+
+def _send(message, connection):
+    with measure("email"):
+        return connection.send_messages([message])
+
+
+def send(message, connection=None):
+    """
+    Send one message over the given connection or the pooled one.
+    Only failures where nothing was sent are retried once on a new pooled
+    connection: opening the connection, or the server having dropped an
+    idle SMTP session. Anything else (e.g. a refused recipient) is raised.
+
+    Returns:
+        int: number of messages sent (0 or 1)
+    """
+    if connection is not None:
+        return _send(message, connection)
+
+    try:
+        connection = pooled_connection()
+    except OSError:
+        # ConnectionError, socket timeouts and SMTP errors while connecting
+        close_connection()
+        connection = pooled_connection()
+
+    try:
+        return _send(message, connection)
+    except SMTPServerDisconnected:
+        close_connection()
+        return _send(message, pooled_connection())
+
+
+def send_batch(messages, connection=None):
+    """
+    Send many messages over one connection (the pooled one by default).
+    A failing message does not stop the others.
+
+    Returns:
+        list: one entry per message, None if it was sent or the error text
+    """
+    errors = []
+    for message in messages:
+        try:
+            sent = send(message, connection)
+        except Exception as e:
+            errors.append(str(e) or e.__class__.__name__)
+            continue
+        errors.append(None if sent else "Rejected by the mail backend")
+    return errors
+
+
+class RateLimiter:
+    """Space calls at least 1/rate seconds apart, across threads (0 = no limit)"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.lock = threading.Lock()
+        self.next_at = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_at, now)
+            self.next_at = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class BulkTemplates:
+    """Subject/HTML/text templates compiled once for every recipient of a blast"""
+
+    def __init__(self, subject, html_message, plain_message):
+        engine = engines["django"]
+        self.subject = engine.from_string(self.verbatim(subject))
+        self.html = engine.from_string(html_message)
+        self.text = engine.from_string(self.verbatim(plain_message))
+
+    @staticmethod
+    def verbatim(source):
+        # Subject and text bodies are not HTML, so nothing is escaped
+        return "{% autoescape off %}" + source + "{% endautoescape %}"
+
+    def build(self, email, context):
+        message = EmailMultiAlternatives(
+            subject=" ".join(self.subject.render(context).split()),
+            body=self.text.render(context),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[email],
+        )
+        message.attach_alternative(self.html.render(context), "text/html")
+        return message
+
+
+def _recipient(recipient, base_context):
+    """(email, context) of an address or a {"email": ..., **context} dict"""
+    if isinstance(recipient, str):
+        return recipient, {**base_context, "email": recipient}
+    return recipient["email"], {**base_context, **recipient}
+
+
+def _unique(recipients):
+    """Recipients without repeated addresses (each one gets a single email)"""
+    seen = set()
+    for recipient in recipients:
+        email = recipient if isinstance(recipient, str) else recipient["email"]
+        if email not in seen:
+            seen.add(email)
+            yield recipient
+
+
+def _send_chunk(chunk, templates, base_context, limiter, kind):
+    """
+    Send one chunk over its own connection, one message per recipient.
+    Returns {email: None if sent, else the error}.
+    """
+    outcomes = {}
+    try:
+        connection = get_connection()
+        connection.open()
+    except Exception as e:
+        logger.exception("Could not open a mail connection for a bulk chunk")
+        return {_recipient(r, base_context)[0]: str(e) for r in chunk}
+
+    try:
+        for recipient in chunk:
+            email, context = _recipient(recipient, base_context)
+            started = time.perf_counter()
+            try:
+                message = templates.build(email, context)
+                limiter.wait()
+                sent = connection.send_messages([message])
+                error = None if sent else "Rejected by the mail backend"
+            except Exception as e:
+                error = str(e) or e.__class__.__name__
+            record_email(kind, error is None, time.perf_counter() - started)
+            outcomes[email] = error
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            logger.warning("Error closing a bulk mail connection", exc_info=True)
+
+    return outcomes
+
+
+def send_bulk(
+    recipients, subject, html_message, plain_message, context=None, kind="bulk"
+):
+    """
+    Send one personalized email per recipient.
+
+    The subject and bodies are Django template strings compiled once and
+    rendered per recipient with context plus the recipient's own values.
+    Recipients are split into chunks of EMAIL_BULK_CHUNK_SIZE, each sent
+    over one connection; up to EMAIL_BULK_WORKERS chunks run concurrently
+    and all of them share the EMAIL_BULK_RATE_PER_SECOND limit. A failing
+    recipient or chunk does not stop the others.
+
+    Args:
+        recipients: Iterable of email addresses or dicts with an "email" key
+            and per-recipient context (e.g. {"email": ..., "user_name": ...})
+        subject: Subject template
+        html_message: HTML body template
+        plain_message: Plain text body template
+        context: Optional context shared by all recipients
+        kind: Email kind for the metrics
+
+    Returns:
+        dict: {email: None if sent, else the error}
+    """
+    templates = BulkTemplates(subject, html_message, plain_message)
+    limiter = RateLimiter(settings.EMAIL_BULK_RATE_PER_SECOND)
+    base_context = context or {}
+    chunk_size = max(1, settings.EMAIL_BULK_CHUNK_SIZE)
+
+    recipients = _unique(recipients)
+    chunks = iter(lambda: list(islice(recipients, chunk_size)), [])
+
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=max(1, settings.EMAIL_BULK_WORKERS)) as pool:
+        results = pool.map(
+            lambda chunk: _send_chunk(chunk, templates, base_context, limiter, kind),
+            chunks,
+        )
+        for chunk_outcomes in results:
+            outcomes.update(chunk_outcomes)
+
+    failed = sum(1 for error in outcomes.values() if error)
+    if failed:
+        logger.warning("Bulk email: %s of %s recipients failed", failed, len(outcomes))
+    return outcomes
@@ -0,0 +1,275 @@
+import json
+import math
+import os
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import resolve
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.endpoints import (
+    SKIPPED_ROUTES,
+    api_routes,
+    sample_endpoints,
+    write_endpoints,
+)
+from apps.jobs.cache import JobCache
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a sorted list"""
+    index = max(0, math.ceil(pct / 100 * len(values)) - 1)
+    return values[min(index, len(values) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every API route against the current (seeded) database: "
+        "latency percentiles, SQL query counts and response sizes, checked "
+        "against benchmarks/budgets.json"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--warmup", type=int, default=2, help="Unmeasured runs per endpoint"
+        )
+        parser.add_argument(
+            "--budgets",
+            default=str(settings.BASE_DIR / "benchmarks" / "budgets.json"),
+            help="Budget file to check against (or write with --update-budgets)",
+        )
+        parser.add_argument(
+            "--output", help="Write the JSON report to this path ('-' for stdout)"
+        )
+        parser.add_argument(
+            "--only",
+            help="Only run endpoints whose name contains this text",
+        )
+        parser.add_argument(
+            "--time-tolerance",
+            type=float,
+            default=1.5,
+            help="Allowed p95 latency as a multiple of the budget",
+        )
+        parser.add_argument(
+            "--bytes-tolerance",
+            type=float,
+            default=0.1,
+            help="Allowed response size growth over the budget (0.1 = 10%%)",
+        )
+        parser.add_argument(
+            "--warm-cache",
+            action="store_true",
+            help="Keep cached job responses between iterations",
+        )
+        parser.add_argument(
+            "--update-budgets",
+            action="store_true",
+            help="Write the measured values (with headroom) as the new budgets",
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.client = APIClient()
+        self.tokens = {}
+
+        endpoints = sample_endpoints() + write_endpoints()
+        if options["only"]:
+            endpoints = [e for e in endpoints if options["only"] in e.name]
+
+        budgets = self.load_budgets(options["budgets"])
+
+        # Keep outgoing mail in memory; writes are rolled back anyway
+        with override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend"
+        ):
+            results = [self.measure(endpoint) for endpoint in endpoints]
+
+        if options["update_budgets"]:
+            for result in results:
+                result["violations"] = []
+            self.print_table(results)
+            self.write_budgets(options["budgets"], results)
+            return
+
+        failures = []
+        for result in results:
+            result["violations"] = self.violations(result, budgets.get(result["name"]))
+            failures.extend(f"{result['name']}: {v}" for v in result["violations"])
+
+        covered = {(result["route"], result["method"]) for result in results}
+        uncovered = sorted(api_routes() - covered - set(SKIPPED_ROUTES))
+        if not options["only"]:
+            failures.extend(
+                f"{name} {method.upper()}: not benchmarked"
+                for name, method in uncovered
+            )
+
+        report = {
+            "database": connection.vendor,
+            "iterations": options["iterations"],
+            "endpoints": results,
+            "unbudgeted": [r["name"] for r in results if r["name"] not in budgets],
+            "uncovered_routes": [
+                f"{name} {method.upper()}" for name, method in uncovered
+            ],
+            "skipped_routes": {
+                f"{name} {method.upper()}": reason
+                for (name, method), reason in SKIPPED_ROUTES.items()
+            },
+            "failures": failures,
+        }
+        self.print_table(results)
+        self.write_report(report)
+
+        if failures:
+            raise CommandError(
+                f"{len(failures)} benchmark regression(s):\n" + "\n".join(failures)
+            )
+        self.stdout.write(self.style.SUCCESS("All endpoints within budget"))
+
+    def authenticate(self, user):
+        """Send a real JWT so authentication cost is part of the measurement"""
+        if user is None:
+            self.client.credentials()
+            return
+
+        if user.pk not in self.tokens:
+            self.tokens[user.pk] = str(RefreshToken.for_user(user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f"JWT {self.tokens[user.pk]}")
+
+    def run_once(self, endpoint):
+        """One request inside a rolled back transaction"""
+        if not self.options["warm_cache"]:
+            JobCache.invalidate()
+        self.authenticate(endpoint.user)
+
+        with transaction.atomic():
+            if endpoint.setup:
+                endpoint.setup()
+            data = endpoint.data() if callable(endpoint.data) else endpoint.data
+            send = getattr(self.client, endpoint.method)
+
+            connection.queries_log.clear()
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = send(endpoint.url, data, format="json")
+                # Streamed bodies run their queries while being consumed
+                if response.streaming:
+                    size = sum(len(part) for part in response.streaming_content)
+                else:
+                    size = len(response.content)
+                elapsed = (time.perf_counter() - started) * 1000
+
+            transaction.set_rollback(True)
+
+        return response, elapsed, len(captured.captured_queries), size
+
+    def measure(self, endpoint):
+        for _ in range(self.options["warmup"]):
+            self.run_once(endpoint)
+
+        timings = []
+        for _ in range(max(1, self.options["iterations"])):
+            response, elapsed, queries, size = self.run_once(endpoint)
+            timings.append(elapsed)
+        timings.sort()
+
+        return {
+            "name": endpoint.name,
+            "method": endpoint.method,
+            "url": endpoint.url,
+            "route": resolve(endpoint.url.split("?")[0]).url_name,
+            "status": response.status_code,
+            "expected_status": endpoint.status,
+            "queries": queries,
+            "bytes": size,
+            "p50_ms": round(percentile(timings, 50), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+            "p99_ms": round(percentile(timings, 99), 2),
+            "max_ms": round(timings[-1], 2),
+            "mean_ms": round(sum(timings) / len(timings), 2),
+        }
+
+    def violations(self, result, budget):
+        violations = []
+        if result["status"] != result["expected_status"]:
+            violations.append(
+                f"status {result['status']}, expected {result['expected_status']}"
+            )
+        if budget is None:
+            return violations
+
+        if result["queries"] > budget["queries"]:
+            violations.append(f"{result['queries']} queries > {budget['queries']}")
+
+        max_p95 = budget["p95_ms"] * self.options["time_tolerance"]
+        if result["p95_ms"] > max_p95:
+            violations.append(f"p95 {result['p95_ms']}ms > {max_p95:.1f}ms")
+
+        max_bytes = budget["bytes"] * (1 + self.options["bytes_tolerance"])
+        if result["bytes"] > max_bytes:
+            violations.append(f"{result['bytes']} bytes > {int(max_bytes)}")
+
+        return violations
+
+    def load_budgets(self, path):
+        try:
+            with open(path) as budget_file:
+                return json.load(budget_file)["endpoints"]
+        except FileNotFoundError:
+            return {}
+
+    def write_budgets(self, path, results):
+        """Measured values become budgets; latency gets 2x headroom"""
+        budgets = {
+            "description": (
+                "Per-endpoint budgets for `manage.py benchmark_endpoints`, measured "
+                "on PostgreSQL after `manage.py generate_data` (default options). "
+                "Regenerate with --update-budgets."
+            ),
+            # With --only, budgets of the other endpoints are kept
+            "endpoints": self.load_budgets(path) if self.options["only"] else {},
+        }
+        for result in results:
+            budgets["endpoints"][result["name"]] = {
+                "queries": result["queries"],
+                "p95_ms": round(max(result["p95_ms"] * 2, 5), 1),
+                "bytes": result["bytes"],
+            }
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as budget_file:
+            json.dump(budgets, budget_file, indent=2)
+            budget_file.write("\n")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} budgets to {path}"))
+
+    def print_table(self, results):
+        self.stdout.write(
+            f"{'endpoint':<34} {'status':>6} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'queries':>7} {'bytes':>8}"
+        )
+        for result in results:
+            line = (
+                f"{result['name']:<34} {result['status']:>6} {result['p50_ms']:>8} "
+                f"{result['p95_ms']:>8} {result['queries']:>7} {result['bytes']:>8}"
+            )
+            if result["violations"]:
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+
+    def write_report(self, report):
+        output = self.options["output"]
+        if not output:
+            return
+
+        payload = json.dumps(report, indent=2, default=str)
+        if output == "-":
+            self.stdout.write(payload)
+        else:
+            with open(output, "w") as report_file:
+                report_file.write(payload + "\n")
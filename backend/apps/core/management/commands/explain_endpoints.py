@@ -0,0 +1,132 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.core.endpoints import sample_endpoints
+from apps.jobs.cache import JobCache
+
+# Tables whose scans are checked; anything else (sessions, ...) is ignored
+CHECKED_TABLES = (
+    "jobs_job",
+    "applications_application",
+    "applications_applicationfeedback",
+    "applications_applicationstatuscounter",
+    "reviews_review",
+    "reviews_reviewhelpful",
+    "reviews_recruiterratingsummary",
+    "authentication_user",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the main API endpoints, EXPLAIN every SELECT they issue and fail "
+        "if PostgreSQL plans a sequential scan on a large table"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-rows",
+            type=int,
+            default=10000,
+            help="Sequential scans on tables with fewer (estimated) rows are allowed",
+        )
+        parser.add_argument(
+            "--skip-analyze",
+            action="store_true",
+            help="Do not ANALYZE the checked tables before planning",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("explain_endpoints needs a PostgreSQL database")
+
+        if not options["skip_analyze"]:
+            with connection.cursor() as cursor:
+                for table in CHECKED_TABLES:
+                    cursor.execute(f'ANALYZE "{table}"')
+
+        table_rows = self.table_rows()
+        client = APIClient()
+        problems = []
+
+        for endpoint in sample_endpoints():
+            name, url = endpoint.name, endpoint.url
+            # Cached job responses would skip the queries we want to see
+            JobCache.invalidate()
+            client.force_authenticate(endpoint.user)
+            # Start from an empty log so busy endpoints don't overflow it
+            connection.queries_log.clear()
+
+            with transaction.atomic():
+                if endpoint.setup:
+                    endpoint.setup()
+                with CaptureQueriesContext(connection) as captured:
+                    response = client.get(url)
+                transaction.set_rollback(True)
+
+            if response.status_code != 200:
+                problems.append(f"{name}: GET {url} returned {response.status_code}")
+                continue
+
+            # Page-number totals count the whole filtered set, which PostgreSQL
+            # rightly reads sequentially; ?pagination=cursor is the indexed path
+            selects = [
+                query["sql"]
+                for query in captured.captured_queries
+                if query["sql"].lstrip().upper().startswith("SELECT")
+                and not query["sql"].lstrip().upper().startswith("SELECT COUNT(*)")
+            ]
+            scans = set()
+            for sql in selects:
+                for table in self.sequential_scans(sql):
+                    if table_rows.get(table, 0) >= options["min_rows"]:
+                        scans.add(table)
+                        if options["verbosity"] > 1:
+                            self.stdout.write(f"  {sql}")
+
+            if scans:
+                problems.append(
+                    f"{name}: sequential scan on {', '.join(sorted(scans))}"
+                )
+                self.stdout.write(self.style.ERROR(f"SEQ SCAN {name} ({url})"))
+            else:
+                self.stdout.write(f"ok       {name} ({len(selects)} queries)")
+
+        if problems:
+            raise CommandError(
+                f"{len(problems)} endpoint(s) failed:\n" + "\n".join(problems)
+            )
+
+        self.stdout.write(self.style.SUCCESS("No sequential scans on large tables"))
+
+    def table_rows(self):
+        """Planner row estimates for the checked tables"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT relname, reltuples FROM pg_class WHERE relname = ANY(%s)",
+                [list(CHECKED_TABLES)],
+            )
+            return {name: rows for name, rows in cursor.fetchall()}
+
+    def sequential_scans(self, sql):
+        """Checked tables read by a Seq Scan node anywhere in the query plan"""
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        tables = []
+        nodes = [plan[0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            if node["Node Type"] == "Seq Scan":
+                if node.get("Relation Name") in CHECKED_TABLES:
+                    tables.append(node["Relation Name"])
+            nodes.extend(node.get("Plans", []))
+
+        return tables
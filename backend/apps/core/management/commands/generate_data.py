@@ -0,0 +1,424 @@
+import bisect
+import itertools
+import json
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.applications.models import Application
+from apps.applications.services import (
+    ApplicationCounterServices,
+    ApplicationMatchServices,
+)
+from apps.authentication.models import UserProfile
+from apps.jobs.cache import JobCache
+from apps.jobs.models import Job
+from apps.jobs import feed, similarity
+from apps.jobs.search import update_search_vectors
+from apps.reviews.models import Review, ReviewHelpful
+from apps.reviews.services import (
+    LeaderboardServices,
+    RecruiterRatingServices,
+    ReviewHelpfulServices,
+)
+
+User = get_user_model()
+
+FIXTURES = ["auth.json", "jobs.json", "applications.json", "reviews.json"]
+
+SENIORITY = ["", "", "Junior ", "Senior ", "Lead ", "Principal ", "Staff "]
+STATUS_WEIGHTS = {"pending": 50, "reviewed": 20, "accepted": 10, "rejected": 20}
+
+
+@contextmanager
+def historical_timestamps(*models):
+    """Let bulk_create keep the generated auto_now/auto_now_add values"""
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large, realistic dataset (users, profiles, jobs, applications, "
+        "reviews, helpful votes) from the fixture records, for load testing"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument(
+            "--recruiter-ratio",
+            type=float,
+            default=0.1,
+            help="Share of generated users that are recruiters",
+        )
+        parser.add_argument("--jobs", type=int, default=2000)
+        parser.add_argument("--applications", type=int, default=50000)
+        parser.add_argument(
+            "--reviews",
+            type=int,
+            default=5000,
+            help="Reviews, written by applicants of the reviewed job",
+        )
+        parser.add_argument("--helpful-votes", type=int, default=20000)
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.1,
+            help=(
+                "Zipf exponent for hot recruiters, jobs and reviews "
+                "(0 spreads activity uniformly)"
+            ),
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Spread timestamps over this many past days",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Random seed; the same seed on an empty database gives the same data",
+        )
+        parser.add_argument(
+            "--password",
+            default="password123",
+            help="Password of every generated user",
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+        self.templates = self.load_templates()
+
+        started = time.monotonic()
+        with historical_timestamps(
+            User, UserProfile, Job, Application, Review, ReviewHelpful
+        ):
+            recruiters, seekers = self.create_users()
+            jobs = self.create_jobs(recruiters)
+            applications = self.create_applications(jobs, seekers)
+            reviews = self.create_reviews(applications, jobs)
+            self.create_helpful_votes(reviews, recruiters + seekers)
+
+        self.stdout.write("Refreshing derived data...")
+        # Rows were inserted in order, so id ranges select what we generated
+        if jobs:
+            update_search_vectors(
+                Job.objects.filter(pk__gte=jobs[0][0], pk__lte=jobs[-1][0])
+            )
+            similarity.rebuild()
+            feed.rebuild()
+        ApplicationCounterServices.reconcile()
+        ApplicationMatchServices.score_all(missing_only=True)
+        RecruiterRatingServices.rebuild()
+        LeaderboardServices.refresh()
+        if reviews:
+            ReviewHelpfulServices.recount(
+                Review.objects.filter(pk__gte=reviews[0], pk__lte=reviews[-1])
+            )
+        JobCache.invalidate()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated data in {time.monotonic() - started:.1f}s "
+                f"(seed {options['seed']})"
+            )
+        )
+
+    # Templates
+
+    def load_templates(self):
+        """Group the fixture records by model"""
+        records = {}
+        for name in FIXTURES:
+            path = settings.BASE_DIR / "fixtures" / name
+            with open(path) as fixture:
+                for record in json.load(fixture):
+                    records.setdefault(record["model"], []).append(record["fields"])
+
+        users = records.get("authentication.user", [])
+        names = [user["full_name"].split() for user in users]
+        return {
+            "first_names": sorted({parts[0] for parts in names}),
+            "last_names": sorted({parts[-1] for parts in names}),
+            "profiles": records.get("authentication.userprofile", []),
+            "jobs": records.get("jobs.job", []),
+            "cover_letters": [
+                app["cover_letter"]
+                for app in records.get("applications.application", [])
+                if app.get("cover_letter")
+            ],
+            "comments": [
+                review["comment"]
+                for review in records.get("reviews.review", [])
+                if review.get("comment")
+            ],
+        }
+
+    # Helpers
+
+    def skewed_choice(self, population):
+        """
+        Return a picker that favours a few "hot" members of the population
+        (Zipf-like, weight 1 / rank ** skew). Hot members are shuffled so they
+        are not simply the oldest rows.
+        """
+        skew = self.options["skew"]
+        if skew <= 0:
+            return lambda: self.rng.choice(population)
+
+        ranked = list(population)
+        self.rng.shuffle(ranked)
+        cumulative = list(
+            itertools.accumulate(1 / rank**skew for rank in range(1, len(ranked) + 1))
+        )
+        total = cumulative[-1]
+        last = len(ranked) - 1
+
+        def pick():
+            index = bisect.bisect_right(cumulative, self.rng.random() * total)
+            return ranked[min(index, last)]
+
+        return pick
+
+    def past(self, after=None):
+        """Random timestamp in the generated window (or after a given one)"""
+        start = after or self.now - timedelta(days=self.options["days"])
+        span = max((self.now - start).total_seconds(), 1)
+        return start + timedelta(seconds=self.rng.random() * span)
+
+    def batches(self, label, total, build):
+        """Call build(count) for each batch and report progress"""
+        done = 0
+        while done < total:
+            count = min(self.batch_size, total - done)
+            with transaction.atomic():
+                build(count)
+            done += count
+            self.stdout.write(f"  {label}: {done}/{total} ({done * 100 // total}%)")
+
+    # Generators
+
+    def create_users(self):
+        total = self.options["users"]
+        recruiter_count = max(1, int(total * self.options["recruiter_ratio"]))
+        if total <= recruiter_count:
+            raise CommandError("--users must leave room for job seekers")
+
+        email = f"user.{self.options['seed']}.0@example.com"
+        if User.objects.filter(email=email).exists():
+            raise CommandError(
+                f"Data for seed {self.options['seed']} already exists; "
+                "use another --seed or flush the database"
+            )
+
+        password = make_password(self.options["password"])  # Hash once
+        profiles = self.templates["profiles"] or [{}]
+        recruiters, seekers = [], []
+        created = itertools.count()
+
+        def build(count):
+            users, user_profiles = [], []
+            for _ in range(count):
+                n = next(created)
+                role = "recruiter" if n < recruiter_count else "seeker"
+                joined = self.past()
+                user = User(
+                    id=uuid.UUID(int=self.rng.getrandbits(128), version=4),
+                    email=f"user.{self.options['seed']}.{n}@example.com",
+                    full_name=(
+                        f"{self.rng.choice(self.templates['first_names'])} "
+                        f"{self.rng.choice(self.templates['last_names'])}"
+                    ),
+                    password=password,
+                    role=role,
+                    is_active=True,
+                    is_verified=self.rng.random() < 0.9,
+                    created_at=joined,
+                    updated_at=joined,
+                )
+                profile = self.rng.choice(profiles)
+                user_profiles.append(
+                    UserProfile(
+                        user=user,
+                        phone_number=f"+1-555-{n % 10000:04d}",
+                        bio=profile.get("bio"),
+                        skills=profile.get("skills"),
+                        experience=(
+                            self.now - timedelta(days=self.rng.randint(0, 7300))
+                        ).date(),
+                        created_at=joined,
+                        updated_at=joined,
+                    )
+                )
+                users.append(user)
+                (recruiters if role == "recruiter" else seekers).append(user.id)
+
+            User.objects.bulk_create(users)
+            UserProfile.objects.bulk_create(user_profiles)
+
+        self.batches("users", total, build)
+        return recruiters, seekers
+
+    def create_jobs(self, recruiters):
+        """Returns (id, recruiter_id, created_at) for every generated job"""
+        total = self.options["jobs"]
+        if not self.templates["jobs"]:
+            raise CommandError("fixtures/jobs.json has no job templates")
+
+        pick_recruiter = self.skewed_choice(recruiters)
+        jobs = []
+
+        def build(count):
+            batch = []
+            for _ in range(count):
+                template = self.rng.choice(self.templates["jobs"])
+                salary = template.get("salary")
+                posted = self.past()
+                batch.append(
+                    Job(
+                        recruiter_id=pick_recruiter(),
+                        category=template["category"],
+                        title=f"{self.rng.choice(SENIORITY)}{template['title']}",
+                        description=template["description"],
+                        requirements=template["requirements"],
+                        location=template["location"],
+                        job_type=template["job_type"],
+                        salary=(
+                            int(salary * self.rng.uniform(0.8, 1.25))
+                            if salary
+                            else None
+                        ),
+                        experience_required=self.rng.randint(0, 10),
+                        position_count=self.rng.randint(1, 5),
+                        company_name=template["company_name"],
+                        application_deadline=(
+                            posted + timedelta(days=self.rng.randint(14, 90))
+                        ),
+                        created_at=posted,
+                        updated_at=posted,
+                    )
+                )
+            Job.objects.bulk_create(batch)
+            jobs.extend((job.pk, job.recruiter_id, job.created_at) for job in batch)
+
+        self.batches("jobs", total, build)
+        return jobs
+
+    def create_applications(self, jobs, seekers):
+        """Returns (job_id, applicant_id, applied_at) for every application"""
+        capacity = len(jobs) * len(seekers)
+        total = min(self.options["applications"], capacity)
+        pick_job = self.skewed_choice(jobs)
+        statuses, weights = zip(*STATUS_WEIGHTS.items())
+        cover_letters = self.templates["cover_letters"] or [""]
+        seen = set()
+        applications = []
+
+        def build(count):
+            batch = []
+            while len(batch) < count:
+                job_id, _, posted = pick_job()
+                applicant_id = self.rng.choice(seekers)
+                if (job_id, applicant_id) in seen:
+                    continue
+                seen.add((job_id, applicant_id))
+
+                applied = self.past(after=posted)
+                batch.append(
+                    Application(
+                        job_id=job_id,
+                        applicant_id=applicant_id,
+                        cover_letter=self.rng.choice(cover_letters),
+                        status=self.rng.choices(statuses, weights)[0],
+                        applied_at=applied,
+                        updated_at=applied,
+                    )
+                )
+                applications.append((job_id, applicant_id, applied))
+            Application.objects.bulk_create(batch)
+
+        self.batches("applications", total, build)
+        return applications
+
+    def create_reviews(self, applications, jobs):
+        """Reviews by applicants of the job; returns the review ids"""
+        total = min(self.options["reviews"], len(applications))
+        recruiter_of = {job_id: recruiter_id for job_id, recruiter_id, _ in jobs}
+
+        # Each recruiter has a "true" quality so ratings are not pure noise
+        quality = {}
+        comments = self.templates["comments"] or [""]
+        chosen = iter(self.rng.sample(applications, total))
+        review_ids = []
+
+        def build(count):
+            batch = []
+            for job_id, reviewer_id, applied in itertools.islice(chosen, count):
+                recruiter_id = recruiter_of[job_id]
+                mean = quality.setdefault(recruiter_id, self.rng.gauss(3.8, 0.6))
+                created = self.past(after=applied)
+                batch.append(
+                    Review(
+                        job_id=job_id,
+                        recruiter_id=recruiter_id,
+                        reviewer_id=reviewer_id,
+                        rating=min(5, max(1, round(self.rng.gauss(mean, 0.9)))),
+                        comment=self.rng.choice(comments),
+                        created_at=created,
+                    )
+                )
+            Review.objects.bulk_create(batch)
+            review_ids.extend(review.pk for review in batch)
+
+        self.batches("reviews", total, build)
+        return review_ids
+
+    def create_helpful_votes(self, reviews, users):
+        if not reviews:
+            return
+
+        total = min(self.options["helpful_votes"], len(reviews) * len(users))
+        pick_review = self.skewed_choice(reviews)
+        seen = set()
+
+        def build(count):
+            batch = []
+            while len(batch) < count:
+                vote = (pick_review(), self.rng.choice(users))
+                if vote in seen:
+                    continue
+                seen.add(vote)
+                batch.append(
+                    ReviewHelpful(
+                        review_id=vote[0], user_id=vote[1], created_at=self.past()
+                    )
+                )
+            ReviewHelpful.objects.bulk_create(batch)
+
+        self.batches("helpful votes", total, build)
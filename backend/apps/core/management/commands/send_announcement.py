@@ -0,0 +1,110 @@
+import json
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Exists, OuterRef
+
+from apps.applications.models import Application
+from apps.core.services import EmailServices
+from apps.jobs.models import Job
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Email an announcement to job seekers, one personalized email each. "
+        "Subject and bodies are Django templates with user_name and email "
+        "in their context."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subject", required=True, help="Subject template")
+        parser.add_argument("--html", required=True, help="HTML body template file")
+        parser.add_argument("--text", required=True, help="Text body template file")
+        parser.add_argument(
+            "--category",
+            choices=[choice[0] for choice in Job.CATEGORY_CHOICES],
+            help="Only seekers who applied to a job in this category",
+        )
+        parser.add_argument(
+            "--verified-only",
+            action="store_true",
+            help="Skip seekers who have not verified their email",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only count the recipients"
+        )
+        parser.add_argument(
+            "--errors", help="Write failed recipients to this file as NDJSON"
+        )
+
+    def handle(self, *args, **options):
+        recipients = self.recipients(options)
+        count = recipients.count()
+
+        if options["dry_run"]:
+            self.stdout.write(f"{count} recipient(s)")
+            return
+        if not count:
+            raise CommandError("No recipients")
+
+        html_message = self.read(options["html"])
+        plain_message = self.read(options["text"])
+
+        self.stdout.write(
+            f"Sending to {count} recipient(s) in chunks of "
+            f"{settings.EMAIL_BULK_CHUNK_SIZE} ({settings.EMAIL_BULK_WORKERS} "
+            f"at a time, {settings.EMAIL_BULK_RATE_PER_SECOND or 'no'} per second limit)"
+        )
+        outcomes = EmailServices.send_personalized_bulk(
+            (
+                {"email": email, "user_name": full_name}
+                for email, full_name in recipients.values_list(
+                    "email", "full_name"
+                ).iterator(chunk_size=2000)
+            ),
+            options["subject"],
+            html_message,
+            plain_message,
+        )
+
+        failed = {email: error for email, error in outcomes.items() if error}
+        for email, error in list(failed.items())[:20]:
+            self.stdout.write(self.style.ERROR(f"{email}: {error}"))
+        if len(failed) > 20:
+            self.stdout.write(f"... and {len(failed) - 20} more")
+
+        if options["errors"]:
+            with open(options["errors"], "w") as error_file:
+                for email, error in failed.items():
+                    error_file.write(
+                        json.dumps({"email": email, "error": error}) + "\n"
+                    )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Sent {len(outcomes) - len(failed)} email(s), {len(failed)} failed"
+            )
+        )
+
+    def recipients(self, options):
+        seekers = User.objects.filter(role="seeker", is_active=True)
+        if options["verified_only"]:
+            seekers = seekers.filter(is_verified=True)
+        if options["category"]:
+            seekers = seekers.filter(
+                Exists(
+                    Application.objects.filter(
+                        applicant=OuterRef("pk"), job__category=options["category"]
+                    )
+                )
+            )
+        return seekers.order_by("email")
+
+    def read(self, path):
+        try:
+            with open(path, encoding="utf-8") as template_file:
+                return template_file.read()
+        except OSError as e:
+            raise CommandError(f"Cannot read {path}: {e}")
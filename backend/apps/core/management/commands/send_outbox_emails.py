@@ -0,0 +1,57 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core import mail
+from apps.core.services import EmailOutboxServices
+
+
+class Command(BaseCommand):
+    help = "Deliver queued transactional emails from the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help="Emails delivered per batch",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting once it is drained",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait between polls when the outbox is empty (with --loop)",
+        )
+
+    def handle(self, *args, **options):
+        totals = {"sent": 0, "retried": 0, "failed": 0}
+
+        while True:
+            result = EmailOutboxServices.process_batch(options["batch_size"])
+            for key, value in result.items():
+                totals[key] += value
+
+            if sum(result.values()):
+                self.stdout.write(
+                    f"Batch: {result['sent']} sent, {result['retried']} retried, "
+                    f"{result['failed']} failed"
+                )
+                continue
+
+            # Do not hold a mail session open while the outbox is empty
+            mail.close_connection()
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Outbox drained: {totals['sent']} sent, {totals['retried']} retried, "
+                f"{totals['failed']} failed"
+            )
+        )
@@ -0,0 +1,103 @@
+import os
+import time
+from functools import wraps
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from apps.core.timing import view_label
+
+# With PROMETHEUS_MULTIPROC_DIR set (gunicorn), every worker writes its samples
+# to that directory and /metrics/ aggregates them (see gunicorn.conf.py)
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUESTS = Counter(
+    "jobly_http_requests_total",
+    "API requests by viewset action, method and status code",
+    ["view", "method", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "jobly_http_request_duration_seconds",
+    "Request latency by viewset action",
+    ["view", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "jobly_http_request_db_queries",
+    "SQL queries issued per request",
+    ["view"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250, 500, 1000),
+)
+REQUEST_DB_TIME = Histogram(
+    "jobly_http_request_db_seconds",
+    "Time spent in SQL queries per request",
+    ["view"],
+    buckets=LATENCY_BUCKETS,
+)
+
+EMAIL_LATENCY = Histogram(
+    "jobly_email_send_duration_seconds",
+    "EmailServices send latency (render and deliver) by email kind",
+    ["kind"],
+    buckets=LATENCY_BUCKETS,
+)
+EMAILS_SENT = Counter("jobly_emails_sent_total", "Emails sent by email kind", ["kind"])
+EMAIL_FAILURES = Counter(
+    "jobly_email_send_failures_total", "Emails that failed to send", ["kind"]
+)
+
+
+def observe_request(request, response, timer, total_ms):
+    """Record one served request (called by RequestTimingMiddleware)"""
+    view = view_label(request)
+
+    REQUESTS.labels(view, request.method, str(response.status_code)).inc()
+    REQUEST_LATENCY.labels(view, request.method).observe(total_ms / 1000)
+    REQUEST_QUERIES.labels(view).observe(timer.counts["db"])
+    REQUEST_DB_TIME.labels(view).observe(timer.durations["db"] / 1000)
+
+
+def record_email(kind, sent, seconds):
+    """Record one send attempt of an email kind"""
+    EMAIL_LATENCY.labels(kind).observe(seconds)
+    (EMAILS_SENT if sent else EMAIL_FAILURES).labels(kind).inc()
+
+
+def track_email(kind):
+    """
+    Record latency and outcome of an EmailServices send method, which
+    returns True when the email was sent
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            sent = False
+            try:
+                sent = func(*args, **kwargs)
+                return sent
+            finally:
+                record_email(kind, sent, time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+def export():
+    """Text exposition of all metrics, aggregated across workers if needed"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,73 @@
+import json
+import logging
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from apps.core import metrics, timing
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimingMiddleware:
+    """
+    Per-request DB query count/time, serializer, template and email time.
+    With REQUEST_TIMING, adds a Server-Timing header and logs requests slower
+    than REQUEST_TIMING_SLOW_MS; with METRICS, feeds the Prometheus request
+    metrics. Removed from the stack when both are off.
+    """
+
+    def __init__(self, get_response):
+        self.server_timing = settings.REQUEST_TIMING
+        self.metrics = settings.METRICS
+        if not (self.server_timing or self.metrics):
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        if self.server_timing:
+            timing.install()
+
+    def __call__(self, request):
+        timer = timing.RequestTimer()
+        token = timing.current_timer.set(timer)
+
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(timing.query_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            timing.current_timer.reset(token)
+
+        total = timer.elapsed()
+
+        if self.metrics:
+            metrics.observe_request(request, response, timer, total)
+
+        if self.server_timing:
+            response["Server-Timing"] = timer.server_timing(total)
+            if total >= settings.REQUEST_TIMING_SLOW_MS:
+                self.log_slow_request(request, response, timer, total)
+
+        return response
+
+    def log_slow_request(self, request, response, timer, total):
+        user = getattr(request, "user", None)
+        record = {
+            "event": "slow_request",
+            "method": request.method,
+            "path": request.path,
+            "view": timing.view_label(request),
+            "status": response.status_code,
+            "user_id": getattr(user, "pk", None),
+            "total_ms": round(total, 1),
+            "db_queries": timer.counts["db"],
+            "db_ms": round(timer.durations["db"], 1),
+            "serialize_ms": round(timer.durations["serialize"], 1),
+            "template_ms": round(timer.durations["template"], 1),
+            "email_ms": round(timer.durations["email"], 1),
+        }
+        logger.warning(json.dumps(record))
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.2 on 2026-10-17 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="emailoutbox",
+            name="email_outbox_pending_dedupe",
+        ),
+        migrations.RemoveIndex(
+            model_name="emailoutbox",
+            name="email_outbox_due_idx",
+        ),
+        migrations.AlterField(
+            model_name="emailoutbox",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("sending", "Sending"),
+                    ("sent", "Sent"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="emailoutbox",
+            index=models.Index(
+                condition=models.Q(("status__in", ["pending", "sending"])),
+                fields=["next_attempt_at", "id"],
+                name="email_outbox_due_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="emailoutbox",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status__in", ["pending", "sending"])),
+                fields=("dedupe_key",),
+                name="email_outbox_pending_dedupe",
+            ),
+        ),
+    ]
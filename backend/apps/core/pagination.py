@@ -0,0 +1,215 @@
+import base64
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination.
+
+    Pages are keyed on the view's default ordering (e.g. ``-created_at``) with
+    ``id`` as tie-breaker, so every page is an index range scan instead of a
+    COUNT(*) plus OFFSET scan. The total count is only computed on request
+    (``?include_count=true``). Pages only follow that ordering: a queryset
+    already ordered otherwise (``?ordering=``, search rank) is rejected.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    count_query_param = "include_count"
+    invalid_cursor_message = "Invalid cursor"
+    unsupported_ordering_message = (
+        "Cursor pagination follows the default ordering; "
+        "it cannot be combined with ordering or search"
+    )
+    # Ordering to page on; defaults to the view's
+    ordering = None
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering_field(self, view):
+        """Return (field name, descending) for the (view's default) ordering"""
+        ordering = self.ordering or getattr(view, "ordering", None) or ["-pk"]
+        if isinstance(ordering, str):
+            ordering = [ordering]
+
+        field = ordering[0]
+        descending = field.startswith("-")
+        field = field.lstrip("-")
+        return ("id" if field == "pk" else field), descending
+
+    def decode_cursor(self, request, model):
+        """(value, pk, reverse) of the cursor, coerced to the model's fields"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            value, pk = data["v"], data["id"]
+            if value is not None:
+                value = self.to_python(model, self.field, value)
+            pk = model._meta.pk.to_python(pk)
+            return value, pk, bool(data.get("r", False))
+        except (TypeError, ValueError, KeyError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def to_python(model, field, value):
+        """A cursor value as the field's Python type (as is for annotations)"""
+        try:
+            return model._meta.get_field(field).to_python(value)
+        except FieldDoesNotExist:
+            return value
+
+    def check_ordering(self, queryset, descending):
+        """Reject querysets already ordered on something else than the keyset"""
+        ordering = queryset.query.order_by
+        if not ordering:
+            return
+
+        first = ordering[0]
+        if not isinstance(first, str):
+            raise ParseError(self.unsupported_ordering_message)
+
+        name = first.lstrip("-")
+        same_field = name == self.field or {name, self.field} == {"id", "pk"}
+        if not same_field or first.startswith("-") != descending:
+            raise ParseError(self.unsupported_ordering_message)
+
+    def encode_cursor(self, obj, reverse):
+        value = getattr(obj, self.field)
+        data = {
+            "v": value.isoformat() if hasattr(value, "isoformat") else value,
+            "id": obj.pk if isinstance(obj.pk, int) else str(obj.pk),
+            "r": reverse,
+        }
+        encoded = base64.urlsafe_b64encode(json.dumps(data).encode("ascii"))
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, encoded.decode("ascii")
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field, descending = self.get_ordering_field(view)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param) in ("1", "true", "True"):
+            self.count = queryset.count()
+
+        self.check_ordering(queryset, descending)
+        cursor = self.decode_cursor(request, queryset.model)
+        reverse = bool(cursor and cursor[2])
+
+        # Walking backwards flips the ordering and the comparison
+        walk_descending = descending != reverse
+        prefix = "-" if walk_descending else ""
+        queryset = queryset.order_by(f"{prefix}{self.field}", f"{prefix}id")
+
+        if cursor:
+            value, pk, _ = cursor
+            lookup = "lt" if walk_descending else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{lookup}": value})
+                | Q(**{self.field: value, f"id__{lookup}": pk})
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = bool(results), has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = results
+        return results
+
+    def get_next_link(self):
+        if not (self.has_next and self.page):
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param
+            )
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        payload = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            payload = {"count": self.count, **payload}
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class StandardPagination(PageNumberPagination):
+    """
+    Page number pagination by default, keyset pagination on request.
+
+    Clients opt into keyset mode with ``?pagination=cursor`` (or by following a
+    ``cursor`` link), which is what crawlers and infinite scroll should use
+    for deep pages.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    mode_query_param = "pagination"
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -1,8 +1,20 @@
+import hashlib
+import json
+import logging
 import uuid
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
-from apps.authentication.models import EmailVerification
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from apps.applications.models import Application
+from apps.authentication.models import EmailVerification, User
+from apps.core import mail
+from apps.core.metrics import track_email
+from apps.core.models import EmailOutbox
 from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+
+logger = logging.getLogger(__name__)
 
 
 class Services:
@@ -18,13 +30,19 @@ class EmailServices:
     """Service for sending various types of emails using Django Anymail + Brevo"""
 
     @staticmethod
-    def send_verification_email(user, frontend_url=None):
+    @track_email("verification")
+    def send_verification_email(
+        user, frontend_url=None, connection=None, token=None, fail_silently=True
+    ):
         """
         Send verification email via Django Anymail + Brevo
 
         Args:
             user: User instance to send verification email to
             frontend_url: Optional frontend URL (uses FRONTEND_URL env var if not provided)
+            connection: Optional open mail connection (defaults to the pooled one)
+            token: Optional token to send (a new one is generated if not provided)
+            fail_silently: Return False instead of raising when sending fails
 
         Returns:
             bool: True if email sent successfully, False otherwise
@@ -34,7 +52,8 @@ class EmailServices:
             frontend_url = settings.FRONTEND_URL
 
         # Generate verification token
-        token = str(uuid.uuid4())
+        if token is None:
+            token = str(uuid.uuid4())
 
         # Create or update verification record
         verification, created = EmailVerification.objects.update_or_create(
@@ -52,28 +71,26 @@ class EmailServices:
         }
 
         try:
-            # Render HTML email from template
-            html_message = render_to_string("emails/verify_email.html", context)
-            plain_message = render_to_string("emails/verify_email.txt", context)
-
-            # Send email
-            send_mail(
+            message = mail.build_message(
+                "verify_email",
                 subject="Verify Your Email - Jobly",
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False,
+                to=[user.email],
+                context=context,
             )
-            print(f"Verification email sent with token: {token}")
+            mail.send(message, connection)
             return True
 
-        except Exception as e:
-            print(f"Email send error: {str(e)}")
+        except Exception:
+            if not fail_silently:
+                raise
+            logger.exception("Error sending verification email")
             return False
 
     @staticmethod
-    def send_password_reset_email(user, reset_link, frontend_url=None):
+    @track_email("password_reset")
+    def send_password_reset_email(
+        user, reset_link, frontend_url=None, connection=None, fail_silently=True
+    ):
         """
         Send password reset email via Django Anymail + Brevo
 
@@ -81,6 +98,8 @@ class EmailServices:
             user: User instance to send reset email to
             reset_link: Full reset link from frontend
             frontend_url: Optional frontend URL (uses FRONTEND_URL env var if not provided)
+            connection: Optional open mail connection (defaults to the pooled one)
+            fail_silently: Return False instead of raising when sending fails
 
         Returns:
             bool: True if email sent successfully, False otherwise
@@ -97,32 +116,31 @@ class EmailServices:
         }
 
         try:
-            # Render HTML email from template
-            html_message = render_to_string("emails/password_reset.html", context)
-            plain_message = render_to_string("emails/password_reset.txt", context)
-
-            # Send email
-            send_mail(
+            message = mail.build_message(
+                "password_reset",
                 subject="Reset Your Password - Jobly",
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False,
+                to=[user.email],
+                context=context,
             )
+            mail.send(message, connection)
             return True
 
-        except Exception as e:
-            print(f"Email send error: {str(e)}")
+        except Exception:
+            if not fail_silently:
+                raise
+            logger.exception("Error sending password reset email")
             return False
 
     @staticmethod
-    def send_welcome_email(user):
+    @track_email("welcome")
+    def send_welcome_email(user, connection=None, fail_silently=True):
         """
         Send welcome email after successful registration
 
         Args:
             user: User instance to send welcome email to
+            connection: Optional open mail connection (defaults to the pooled one)
+            fail_silently: Return False instead of raising when sending fails
 
         Returns:
             bool: True if email sent successfully, False otherwise
@@ -134,30 +152,31 @@ class EmailServices:
         }
 
         try:
-            html_message = render_to_string("emails/welcome.html", context)
-            plain_message = render_to_string("emails/welcome.txt", context)
-
-            send_mail(
+            message = mail.build_message(
+                "welcome",
                 subject="Welcome to Jobly!",
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False,
+                to=[user.email],
+                context=context,
             )
+            mail.send(message, connection)
             return True
 
-        except Exception as e:
-            print(f"Email send error: {str(e)}")
+        except Exception:
+            if not fail_silently:
+                raise
+            logger.exception("Error sending welcome email")
             return False
 
     @staticmethod
-    def send_account_verified_email(user):
+    @track_email("account_verified")
+    def send_account_verified_email(user, connection=None, fail_silently=True):
         """
         Send confirmation email after email verification
 
         Args:
             user: User instance whose email was verified
+            connection: Optional open mail connection (defaults to the pooled one)
+            fail_silently: Return False instead of raising when sending fails
 
         Returns:
             bool: True if email sent successfully, False otherwise
@@ -168,21 +187,19 @@ class EmailServices:
         }
 
         try:
-            html_message = render_to_string("emails/account_verified.html", context)
-            plain_message = render_to_string("emails/account_verified.txt", context)
-
-            send_mail(
+            message = mail.build_message(
+                "account_verified",
                 subject="Email Verified - Jobly",
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False,
+                to=[user.email],
+                context=context,
             )
+            mail.send(message, connection)
             return True
 
-        except Exception as e:
-            print(f"Email send error: {str(e)}")
+        except Exception:
+            if not fail_silently:
+                raise
+            logger.exception("Error sending account verified email")
             return False
 
     @staticmethod
@@ -201,27 +218,57 @@ class EmailServices:
         """
 
         try:
-            send_mail(
+            message = EmailMultiAlternatives(
                 subject=subject,
-                message=plain_message,
+                body=plain_message,
                 from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=recipients,
-                html_message=html_message,
-                fail_silently=False,
+                to=recipients,
             )
+            message.attach_alternative(html_message, "text/html")
+            mail.send(message)
             return True
 
-        except Exception as e:
-            print(f"Bulk email send error: {str(e)}")
+        except Exception:
+            logger.exception("Error sending bulk email")
             return False
 
     @staticmethod
-    def send_application_received_email(application):
+    def send_personalized_bulk(
+        recipients, subject, html_message, plain_message, context=None
+    ):
+        """
+        Send one personalized email per recipient (recipients never see each
+        other). Subject and bodies are template strings rendered per
+        recipient; see mail.send_bulk for chunking, concurrency and the rate
+        limit.
+
+        Args:
+            recipients: Email addresses, or dicts with an "email" key and
+                per-recipient context such as "user_name"
+            subject: Email subject template
+            html_message: HTML email template
+            plain_message: Plain text email template
+            context: Optional context shared by all recipients
+
+        Returns:
+            dict: per-recipient outcome, None if sent or the error message
+        """
+        return mail.send_bulk(
+            recipients, subject, html_message, plain_message, context=context
+        )
+
+    @staticmethod
+    @track_email("application_received")
+    def send_application_received_email(
+        application, connection=None, fail_silently=True
+    ):
         """
         Send email to job seeker confirming application was received.
 
         Args:
             application: Application instance
+            connection: Optional open mail connection (defaults to the pooled one)
+            fail_silently: Return False instead of raising when sending fails
         """
         user = application.applicant
         job = application.job
@@ -234,30 +281,33 @@ class EmailServices:
         }
 
         try:
-            html_message = render_to_string("emails/application_received.html", context)
-            plain_message = render_to_string("emails/application_received.txt", context)
-
-            send_mail(
+            message = mail.build_message(
+                "application_received",
                 subject=f"Application Received - {job.title} at {job.company_name}",
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False,
+                to=[user.email],
+                context=context,
             )
+            mail.send(message, connection)
             return True
 
-        except Exception as e:
-            print(f"Error sending application received email: {str(e)}")
+        except Exception:
+            if not fail_silently:
+                raise
+            logger.exception("Error sending application received email")
             return False
 
     @staticmethod
-    def send_new_application_notification(application):
+    @track_email("new_application")
+    def send_new_application_notification(
+        application, connection=None, fail_silently=True
+    ):
         """
         Send email to recruiter notifying them of a new application.
 
         Args:
             application: Application instance
+            connection: Optional open mail connection (defaults to the pooled one)
+            fail_silently: Return False instead of raising when sending fails
         """
         recruiter = application.job.recruiter
         applicant = application.applicant
@@ -272,31 +322,34 @@ class EmailServices:
         }
 
         try:
-            html_message = render_to_string("emails/new_application.html", context)
-            plain_message = render_to_string("emails/new_application.txt", context)
-
-            send_mail(
+            message = mail.build_message(
+                "new_application",
                 subject=f"New Application for {job.title}",
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[recruiter.email],
-                html_message=html_message,
-                fail_silently=False,
+                to=[recruiter.email],
+                context=context,
             )
+            mail.send(message, connection)
             return True
 
-        except Exception as e:
-            print(f"Error sending new application notification: {str(e)}")
+        except Exception:
+            if not fail_silently:
+                raise
+            logger.exception("Error sending new application notification")
             return False
 
     @staticmethod
-    def send_application_status_update_email(application, feedback_text):
+    @track_email("application_status_update")
+    def send_application_status_update_email(
+        application, feedback_text, connection=None, fail_silently=True
+    ):
         """
         Send email to job seeker when application status is updated.
 
         Args:
             application: Application instance
             feedback_text: Feedback from recruiter
+            connection: Optional open mail connection (defaults to the pooled one)
+            fail_silently: Return False instead of raising when sending fails
         """
         user = application.applicant
         job = application.job
@@ -319,34 +372,33 @@ class EmailServices:
         }
 
         try:
-            html_message = render_to_string(
-                "emails/application_status_update.html", context
-            )
-            plain_message = render_to_string(
-                "emails/application_status_update.txt", context
-            )
-
-            send_mail(
+            message = mail.build_message(
+                "application_status_update",
                 subject=f"Application Status Update - {job.title}",
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False,
+                to=[user.email],
+                context=context,
             )
+            mail.send(message, connection)
             return True
 
-        except Exception as e:
-            print(f"Error sending application status update email: {str(e)}")
+        except Exception:
+            if not fail_silently:
+                raise
+            logger.exception("Error sending application status update email")
             return False
 
     @staticmethod
-    def send_application_accepted_email(application):
+    @track_email("application_accepted")
+    def send_application_accepted_email(
+        application, connection=None, fail_silently=True
+    ):
         """
         Send celebratory email when application is accepted.
 
         Args:
             application: Application instance
+            connection: Optional open mail connection (defaults to the pooled one)
+            fail_silently: Return False instead of raising when sending fails
         """
         user = application.applicant
         job = application.job
@@ -361,31 +413,34 @@ class EmailServices:
         }
 
         try:
-            html_message = render_to_string("emails/application_accepted.html", context)
-            plain_message = render_to_string("emails/application_accepted.txt", context)
-
-            send_mail(
+            message = mail.build_message(
+                "application_accepted",
                 subject=f"Congratulations! Your Application for {job.title} was Accepted!",
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False,
+                to=[user.email],
+                context=context,
             )
+            mail.send(message, connection)
             return True
 
-        except Exception as e:
-            print(f"Error sending application accepted email: {str(e)}")
+        except Exception:
+            if not fail_silently:
+                raise
+            logger.exception("Error sending application accepted email")
             return False
 
     @staticmethod
-    def send_application_rejected_email(application, feedback_text):
+    @track_email("application_rejected")
+    def send_application_rejected_email(
+        application, feedback_text, connection=None, fail_silently=True
+    ):
         """
         Send email when application is rejected.
 
         Args:
             application: Application instance
             feedback_text: Feedback from recruiter
+            connection: Optional open mail connection (defaults to the pooled one)
+            fail_silently: Return False instead of raising when sending fails
         """
         user = application.applicant
         job = application.job
@@ -398,19 +453,280 @@ class EmailServices:
         }
 
         try:
-            html_message = render_to_string("emails/application_rejected.html", context)
-            plain_message = render_to_string("emails/application_rejected.txt", context)
-
-            send_mail(
+            message = mail.build_message(
+                "application_rejected",
                 subject=f"Application Update - {job.title} at {job.company_name}",
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False,
+                to=[user.email],
+                context=context,
             )
+            mail.send(message, connection)
             return True
 
-        except Exception as e:
-            print(f"Error sending application rejected email: {str(e)}")
+        except Exception:
+            if not fail_silently:
+                raise
+            logger.exception("Error sending application rejected email")
             return False
+
+
+class EmailOutboxServices:
+    """
+    Queue transactional emails in the outbox instead of sending them inline.
+
+    Rows are written inside the caller's transaction, so an email is queued
+    only if the domain change commits. The send_outbox_emails command drains
+    the queue in batches with exponential backoff. Handlers raise on failure,
+    so the error is kept on the row.
+    """
+
+    @staticmethod
+    def _send_verification(payload):
+        user = User.objects.get(pk=payload["user_id"])
+        # The token is fixed at enqueue time, so a retry sends the same link
+        return EmailServices.send_verification_email(
+            user, token=payload.get("token"), fail_silently=False
+        )
+
+    @staticmethod
+    def _application(payload):
+        return Application.objects.select_related("job__recruiter", "applicant").get(
+            pk=payload["application_id"]
+        )
+
+    @staticmethod
+    def _send_application_received(payload):
+        application = EmailOutboxServices._application(payload)
+        return EmailServices.send_application_received_email(
+            application, fail_silently=False
+        )
+
+    @staticmethod
+    def _send_new_application(payload):
+        application = EmailOutboxServices._application(payload)
+        return EmailServices.send_new_application_notification(
+            application, fail_silently=False
+        )
+
+    @staticmethod
+    def _send_application_accepted(payload):
+        application = EmailOutboxServices._application(payload)
+        return EmailServices.send_application_accepted_email(
+            application, fail_silently=False
+        )
+
+    @staticmethod
+    def _send_application_rejected(payload):
+        application = EmailOutboxServices._application(payload)
+        return EmailServices.send_application_rejected_email(
+            application, payload["feedback_text"], fail_silently=False
+        )
+
+    @staticmethod
+    def _send_application_status_update(payload):
+        application = EmailOutboxServices._application(payload)
+        application.status = payload["status"]
+        return EmailServices.send_application_status_update_email(
+            application, payload["feedback_text"], fail_silently=False
+        )
+
+    HANDLERS = {
+        "verification": "_send_verification",
+        "application_received": "_send_application_received",
+        "new_application": "_send_new_application",
+        "application_accepted": "_send_application_accepted",
+        "application_rejected": "_send_application_rejected",
+        "application_status_update": "_send_application_status_update",
+    }
+
+    # Payload keys that differ on every enqueue without making a new email
+    UNIQUE_PAYLOAD_KEYS = {"token"}
+
+    @staticmethod
+    def build(kind, recipient, **payload):
+        """Build an unsaved outbox row for one recipient"""
+        if kind not in EmailOutboxServices.HANDLERS:
+            raise ValueError(f"Unknown email kind: {kind}")
+
+        identity = {
+            key: value
+            for key, value in payload.items()
+            if key not in EmailOutboxServices.UNIQUE_PAYLOAD_KEYS
+        }
+        fingerprint = json.dumps([kind, recipient, identity], sort_keys=True)
+        return EmailOutbox(
+            kind=kind,
+            recipient=recipient,
+            payload=payload,
+            dedupe_key=hashlib.sha256(fingerprint.encode("utf-8")).hexdigest(),
+        )
+
+    @staticmethod
+    def enqueue(messages):
+        """Insert outbox rows; duplicates of an email not yet sent are skipped"""
+        EmailOutbox.objects.bulk_create(messages, ignore_conflicts=True)
+
+    @staticmethod
+    def queue_verification_email(user):
+        EmailOutboxServices.enqueue(
+            [
+                EmailOutboxServices.build(
+                    "verification",
+                    user.email,
+                    user_id=str(user.pk),
+                    token=str(uuid.uuid4()),
+                )
+            ]
+        )
+
+    @staticmethod
+    def queue_application_emails(application):
+        """Confirmation to the applicant and notification to the recruiter"""
+        EmailOutboxServices.enqueue(
+            [
+                EmailOutboxServices.build(
+                    "application_received",
+                    application.applicant.email,
+                    application_id=application.pk,
+                ),
+                EmailOutboxServices.build(
+                    "new_application",
+                    application.job.recruiter.email,
+                    application_id=application.pk,
+                ),
+            ]
+        )
+
+    @staticmethod
+    def build_status_email(application, feedback_text):
+        """Outbox row matching the application's new status"""
+        recipient = application.applicant.email
+
+        if application.status == "accepted":
+            return EmailOutboxServices.build(
+                "application_accepted", recipient, application_id=application.pk
+            )
+        if application.status == "rejected":
+            return EmailOutboxServices.build(
+                "application_rejected",
+                recipient,
+                application_id=application.pk,
+                feedback_text=feedback_text,
+            )
+
+        # For pending and reviewed statuses
+        return EmailOutboxServices.build(
+            "application_status_update",
+            recipient,
+            application_id=application.pk,
+            status=application.status,
+            feedback_text=feedback_text,
+        )
+
+    @staticmethod
+    def queue_status_update_email(application, feedback_text):
+        EmailOutboxServices.enqueue(
+            [EmailOutboxServices.build_status_email(application, feedback_text)]
+        )
+
+    @staticmethod
+    def queue_status_update_emails(applications, feedback_text):
+        """One INSERT for the status emails of many applications"""
+        EmailOutboxServices.enqueue(
+            [
+                EmailOutboxServices.build_status_email(application, feedback_text)
+                for application in applications
+            ]
+        )
+
+    @staticmethod
+    def retry_delay(attempts):
+        """Exponential backoff: base, 2*base, 4*base, ... capped at one day"""
+        base = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS
+        return timedelta(seconds=min(base * 2 ** (attempts - 1), 86400))
+
+    @staticmethod
+    def deliver(message):
+        """Send one outbox row. Returns (sent, error)."""
+        handler = getattr(
+            EmailOutboxServices, EmailOutboxServices.HANDLERS[message.kind]
+        )
+        try:
+            return bool(handler(message.payload)), None
+        except Exception as e:
+            return False, str(e) or type(e).__name__
+
+    @staticmethod
+    def claim(batch_size):
+        """
+        Move one batch of due emails to sending and commit, so no lock is held
+        while talking to the mail server. The lease in next_attempt_at makes a
+        row due again if its worker dies before recording the result.
+        Rows are locked with SKIP LOCKED so several workers can claim in parallel.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            messages = list(
+                EmailOutbox.objects.select_for_update(skip_locked=True)
+                .filter(status__in=["pending", "sending"], next_attempt_at__lte=now)
+                .order_by("next_attempt_at", "id")[:batch_size]
+            )
+            EmailOutbox.objects.filter(pk__in=[m.pk for m in messages]).update(
+                status="sending",
+                attempts=F("attempts") + 1,
+                next_attempt_at=now
+                + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS),
+            )
+
+        for message in messages:
+            message.attempts += 1
+        return messages
+
+    @staticmethod
+    def process_batch(batch_size=None):
+        """
+        Claim one batch of due emails, then send them outside the transaction,
+        recording each result as soon as it is known.
+
+        Returns:
+            dict: counts of sent, retried and failed emails
+        """
+        batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        max_attempts = settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        result = {"sent": 0, "retried": 0, "failed": 0}
+
+        # Every email goes over the worker's pooled mail connection
+        for message in EmailOutboxServices.claim(batch_size):
+            if message.attempts > max_attempts:
+                # Its lease ran out on the last allowed attempt
+                sent, error = False, "Worker stopped while sending"
+            else:
+                sent, error = EmailOutboxServices.deliver(message)
+            EmailOutboxServices.record_attempt(
+                message, sent, error, max_attempts, result
+            )
+
+        return result
+
+    @staticmethod
+    def record_attempt(message, sent, error, max_attempts, result):
+        """Move a claimed outbox row to sent, back to pending or to failed"""
+        changes = {"last_error": None if sent else error or "Email could not be sent"}
+
+        if sent:
+            changes.update(status="sent", sent_at=timezone.now())
+            result["sent"] += 1
+        elif message.attempts >= max_attempts:
+            changes.update(status="failed")
+            result["failed"] += 1
+        else:
+            changes.update(
+                status="pending",
+                next_attempt_at=timezone.now()
+                + EmailOutboxServices.retry_delay(message.attempts),
+            )
+            result["retried"] += 1
+
+        # Only if still ours: an expired lease may have been claimed again
+        EmailOutbox.objects.filter(
+            pk=message.pk, status="sending", attempts=message.attempts
+        ).update(**changes)
@@ -1,3 +1,349 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.authentication.models import EmailVerification, User
+from apps.core import mail as core_mail
+from apps.core import timing
+from apps.core.models import EmailOutbox
+from apps.core.services import EmailOutboxServices, EmailServices
+
+
+@override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=3, EMAIL_OUTBOX_RETRY_BASE_SECONDS=60)
+class EmailOutboxTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="seeker@example.com", password="pass12345", full_name="Seeker"
+        )
+
+    def make_due(self):
+        EmailOutbox.objects.update(next_attempt_at=timezone.now())
+
+    def test_pending_duplicates_are_queued_once(self):
+        EmailOutboxServices.queue_verification_email(self.user)
+        EmailOutboxServices.queue_verification_email(self.user)
+        self.assertEqual(EmailOutbox.objects.count(), 1)
+
+    def test_sent_email_can_be_queued_again(self):
+        EmailOutboxServices.queue_verification_email(self.user)
+        EmailOutboxServices.process_batch()
+        EmailOutboxServices.queue_verification_email(self.user)
+        self.assertEqual(EmailOutbox.objects.filter(status="pending").count(), 1)
+
+    def test_due_emails_are_sent(self):
+        EmailOutboxServices.queue_verification_email(self.user)
+
+        result = EmailOutboxServices.process_batch()
+
+        self.assertEqual(result, {"sent": 1, "retried": 0, "failed": 0})
+        self.assertEqual(len(mail.outbox), 1)
+        message = EmailOutbox.objects.get()
+        self.assertEqual(message.status, "sent")
+        self.assertEqual(message.attempts, 1)
+        self.assertIsNotNone(message.sent_at)
+
+    def test_failed_send_is_retried_with_backoff(self):
+        EmailOutboxServices.queue_verification_email(self.user)
+
+        with mock.patch.object(
+            EmailServices, "send_verification_email", side_effect=OSError("down")
+        ):
+            result = EmailOutboxServices.process_batch()
+            self.assertEqual(result["retried"], 1)
+
+            message = EmailOutbox.objects.get()
+            self.assertEqual(message.status, "pending")
+            self.assertEqual(message.attempts, 1)
+            self.assertEqual(message.last_error, "down")
+            self.assertGreater(
+                message.next_attempt_at, timezone.now() + timedelta(seconds=50)
+            )
+
+            # Not due yet: the next pass leaves it alone
+            self.assertEqual(
+                EmailOutboxServices.process_batch(),
+                {"sent": 0, "retried": 0, "failed": 0},
+            )
+
+        self.make_due()
+        self.assertEqual(EmailOutboxServices.process_batch()["sent"], 1)
+        message.refresh_from_db()
+        self.assertEqual(message.status, "sent")
+        self.assertEqual(message.attempts, 2)
+        self.assertIsNone(message.last_error)
+
+    def test_gives_up_after_max_attempts(self):
+        EmailOutboxServices.queue_verification_email(self.user)
+
+        with mock.patch.object(
+            EmailServices, "send_verification_email", return_value=False
+        ):
+            for _ in range(3):
+                self.make_due()
+                EmailOutboxServices.process_batch()
+
+        message = EmailOutbox.objects.get()
+        self.assertEqual(message.status, "failed")
+        self.assertEqual(message.attempts, 3)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_mail_error_is_recorded(self):
+        EmailOutboxServices.queue_verification_email(self.user)
+
+        with mock.patch.object(
+            core_mail, "send", side_effect=SMTPServerDisconnected("gone")
+        ):
+            EmailOutboxServices.process_batch()
+
+        self.assertEqual(EmailOutbox.objects.get().last_error, "gone")
+
+    def test_retries_send_the_token_queued_with_the_email(self):
+        EmailOutboxServices.queue_verification_email(self.user)
+        token = EmailOutbox.objects.get().payload["token"]
+
+        with mock.patch.object(core_mail, "send", side_effect=OSError("down")):
+            EmailOutboxServices.process_batch()
+        self.make_due()
+        EmailOutboxServices.process_batch()
+
+        self.assertEqual(EmailVerification.objects.get(user=self.user).token, token)
+        self.assertIn(f"token={token}", mail.outbox[0].body)
+
+    def test_duplicate_with_a_new_token_is_still_queued_once(self):
+        EmailOutboxServices.queue_verification_email(self.user)
+        EmailOutbox.objects.update(status="sending")
+        EmailOutboxServices.queue_verification_email(self.user)
+        self.assertEqual(EmailOutbox.objects.count(), 1)
+
+    def test_rows_are_claimed_before_sending(self):
+        EmailOutboxServices.queue_verification_email(self.user)
+        seen = []
+
+        def send(message, connection=None):
+            row = EmailOutbox.objects.get()
+            seen.append((row.status, row.attempts))
+            return 1
+
+        with mock.patch.object(core_mail, "send", side_effect=send):
+            EmailOutboxServices.process_batch()
+
+        self.assertEqual(seen, [("sending", 1)])
+        self.assertEqual(EmailOutbox.objects.get().status, "sent")
+
+    def test_expired_lease_is_claimed_again(self):
+        EmailOutboxServices.queue_verification_email(self.user)
+        EmailOutbox.objects.update(
+            status="sending",
+            attempts=1,
+            next_attempt_at=timezone.now() + timedelta(minutes=5),
+        )
+        self.assertEqual(EmailOutboxServices.process_batch()["sent"], 0)
+
+        self.make_due()
+        self.assertEqual(EmailOutboxServices.process_batch()["sent"], 1)
+        self.assertEqual(EmailOutbox.objects.get().attempts, 2)
+
+    def test_expired_last_attempt_fails_without_sending(self):
+        EmailOutboxServices.queue_verification_email(self.user)
+        EmailOutbox.objects.update(status="sending", attempts=3)
+
+        self.assertEqual(EmailOutboxServices.process_batch()["failed"], 1)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(EmailOutbox.objects.get().status, "failed")
+
+    def test_retry_delay_doubles(self):
+        delays = [EmailOutboxServices.retry_delay(n).total_seconds() for n in (1, 2, 3)]
+        self.assertEqual(delays, [60, 120, 240])
+
+    def test_batch_size_limits_one_pass(self):
+        for index in range(3):
+            user = User.objects.create_user(
+                email=f"user{index}@example.com", password="pass12345"
+            )
+            EmailOutboxServices.queue_verification_email(user)
+
+        self.assertEqual(EmailOutboxServices.process_batch(batch_size=2)["sent"], 2)
+        self.assertEqual(EmailOutbox.objects.filter(status="pending").count(), 1)
+
+
+class MailSendTests(TestCase):
+    def setUp(self):
+        self.message = EmailMessage(
+            subject="Hi", body="Hello", to=["seeker@example.com"]
+        )
+
+    def connections(self, *behaviours):
+        """Mock pooled connections whose send_messages return or raise in turn"""
+        connections = []
+        for behaviour in behaviours:
+            connection = mock.Mock()
+            if isinstance(behaviour, Exception):
+                connection.send_messages.side_effect = behaviour
+            else:
+                connection.send_messages.return_value = behaviour
+            connections.append(connection)
+        return mock.patch.object(
+            core_mail, "pooled_connection", side_effect=connections
+        )
+
+    def test_dropped_session_is_retried_on_a_new_connection(self):
+        with self.connections(SMTPServerDisconnected("idle"), 1):
+            self.assertEqual(core_mail.send(self.message), 1)
+
+    def test_other_errors_are_not_retried(self):
+        refused = SMTPRecipientsRefused({"seeker@example.com": (550, b"no")})
+        with self.connections(refused, 1) as pooled:
+            with self.assertRaises(SMTPRecipientsRefused):
+                core_mail.send(self.message)
+        self.assertEqual(pooled.call_count, 1)
+
+    def test_failed_connect_is_retried(self):
+        with mock.patch.object(
+            core_mail,
+            "pooled_connection",
+            side_effect=[
+                ConnectionRefusedError(),
+                mock.Mock(**{"send_messages.return_value": 1}),
+            ],
+        ):
+            self.assertEqual(core_mail.send(self.message), 1)
+
+
+class BulkEmailTests(TestCase):
+    def test_send_bulk_email_sends_one_message_to_every_recipient(self):
+        sent = EmailServices.send_bulk_email(
+            ["a@example.com", "b@example.com"], "News", "<p>Hi</p>", "Hi"
+        )
+
+        self.assertIs(sent, True)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["a@example.com", "b@example.com"])
+
+    def test_send_personalized_bulk_renders_per_recipient(self):
+        outcomes = EmailServices.send_personalized_bulk(
+            [
+                {"email": "a@example.com", "user_name": "Ann"},
+                {"email": "b@example.com", "user_name": "Bob"},
+                "a@example.com",
+            ],
+            "Hello {{ user_name }}",
+            "<p>Hi {{ user_name }} from {{ site }}</p>",
+            "Hi {{ user_name }} from {{ site }}",
+            context={"site": "Jobly"},
+        )
+
+        self.assertEqual(outcomes, {"a@example.com": None, "b@example.com": None})
+        bodies = {message.to[0]: message.body for message in mail.outbox}
+        self.assertEqual(
+            bodies,
+            {
+                "a@example.com": "Hi Ann from Jobly",
+                "b@example.com": "Hi Bob from Jobly",
+            },
+        )
+
+
+class RequestTimerTests(TestCase):
+    def test_nested_blocks_are_timed_once(self):
+        timer = timing.RequestTimer()
+        with timer.measure("serialize"):
+            with timer.measure("serialize"):
+                pass
+        with timer.measure("db"):
+            pass
+
+        self.assertEqual(dict(timer.counts), {"serialize": 1, "db": 1})
+
+    def test_server_timing_lists_measured_components(self):
+        timer = timing.RequestTimer()
+        timer.durations["db"] = 4.25
+        timer.counts["db"] = 3
+        timer.durations["serialize"] = 1.0
+
+        self.assertEqual(
+            timer.server_timing(10),
+            'db;dur=4.2;desc="3 queries", serialize;dur=1.0, total;dur=10.0',
+        )
+
+    def test_measure_is_a_no_op_outside_a_request(self):
+        with timing.measure("db"):
+            pass
+        self.assertIsNone(timing.current_timer.get())
+
+
+@override_settings(REQUEST_TIMING=True, REQUEST_TIMING_SLOW_MS=60000)
+class RequestTimingMiddlewareTests(TestCase):
+    def setUp(self):
+        # The middleware is set up with the client's handler, after the override
+        self.client = APIClient()
+
+    def test_server_timing_counts_the_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/jobs/")
+
+        header = response["Server-Timing"]
+        self.assertIn(f'desc="{len(queries)} queries"', header)
+        self.assertRegex(header, r"serialize;dur=[0-9.]+")
+        self.assertRegex(header, r"total;dur=[0-9.]+$")
+
+    @override_settings(REQUEST_TIMING_SLOW_MS=0)
+    def test_slow_request_is_logged(self):
+        with self.assertLogs("apps.core.middleware", "WARNING") as logs:
+            self.client.get("/api/jobs/")
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["event"], "slow_request")
+        self.assertEqual(record["view"], "JobViewSet.list")
+        self.assertEqual(record["status"], 200)
+        self.assertGreaterEqual(record["db_queries"], 1)
+
+    @override_settings(REQUEST_TIMING=False, METRICS=False)
+    def test_off_by_default(self):
+        response = APIClient().get("/api/jobs/")
+        self.assertNotIn("Server-Timing", response)
+
+
+@override_settings(METRICS=True, METRICS_TOKEN="secret", DEBUG=False)
+class MetricsViewTests(TestCase):
+    def scrape(self, token=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        return self.client.get("/metrics/", headers=headers)
+
+    def test_scrape_with_the_token(self):
+        response = self.scrape("secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(b"jobly_http_requests_total", response.content)
+
+    def test_missing_or_wrong_token_is_rejected(self):
+        self.assertEqual(self.scrape().status_code, 401)
+        self.assertEqual(self.scrape("guess").status_code, 401)
+
+    @override_settings(METRICS_TOKEN=None)
+    def test_no_token_configured_fails_closed(self):
+        self.assertEqual(self.scrape().status_code, 404)
+
+    @override_settings(METRICS_TOKEN=None, DEBUG=True)
+    def test_no_token_is_open_in_debug(self):
+        self.assertEqual(self.scrape().status_code, 200)
+
+    @override_settings(METRICS=False)
+    def test_disabled(self):
+        self.assertEqual(self.scrape("secret").status_code, 404)
+
+    def test_requests_are_counted_per_view(self):
+        # The middleware is set up with the client's handler, after the override
+        client = APIClient()
+        client.get("/api/jobs/")
+
+        body = self.scrape("secret").content.decode()
+        self.assertIn('view="JobViewSet.list"', body)
@@ -0,0 +1,107 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from django.core.mail import EmailMessage
+from django.template.backends.django import Template
+from rest_framework.serializers import BaseSerializer
+
+# Timer of the request being served (set by RequestTimingMiddleware)
+current_timer = ContextVar("current_timer", default=None)
+
+_installed = False
+
+
+class RequestTimer:
+    """Time (ms) and call counts per component while serving one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = defaultdict(float)
+        self.counts = defaultdict(int)
+        self._active = set()
+
+    @contextmanager
+    def measure(self, name):
+        # Nested calls (a serializer inside a serializer) are timed once
+        if name in self._active:
+            yield
+            return
+
+        self._active.add(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] += (time.perf_counter() - started) * 1000
+            self.counts[name] += 1
+            self._active.discard(name)
+
+    def elapsed(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total):
+        """Server-Timing header value, e.g. db;dur=4.2;desc="3 queries" """
+        metrics = [
+            f'db;dur={self.durations["db"]:.1f};desc="{self.counts["db"]} queries"'
+        ]
+        for name in ("serialize", "template", "email"):
+            if name in self.durations:
+                metrics.append(f"{name};dur={self.durations[name]:.1f}")
+        metrics.append(f"total;dur={total:.1f}")
+        return ", ".join(metrics)
+
+
+def measure(name):
+    """Time a block against the current request (no-op outside one)"""
+    timer = current_timer.get()
+    return timer.measure(name) if timer is not None else nullcontext()
+
+
+def timed(name, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with measure(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def query_wrapper(execute, sql, params, many, context):
+    """Database execute wrapper (see connection.execute_wrapper)"""
+    with measure("db"):
+        return execute(sql, params, many, context)
+
+
+def install():
+    """
+    Wrap serializer output, template rendering and email sending with timers.
+    Only called when request timing is enabled, so it costs nothing otherwise.
+    """
+    global _installed
+    if _installed:
+        return
+
+    BaseSerializer.data = property(timed("serialize", BaseSerializer.data.fget))
+    Template.render = timed("template", Template.render)
+    EmailMessage.send = timed("email", EmailMessage.send)
+    _installed = True
+
+
+def view_label(request):
+    """
+    Viewset action serving the request, e.g. "JobViewSet.list"
+    (falls back to the URL name or "unresolved")
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+
+    view_class = getattr(match.func, "cls", None)
+    actions = getattr(match.func, "actions", None) or {}
+    action = actions.get(request.method.lower())
+    if view_class is not None and action:
+        return f"{view_class.__name__}.{action}"
+
+    return match.view_name or "unresolved"
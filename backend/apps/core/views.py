@@ -1,5 +1,28 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
 
+from apps.core import metrics
+
 
 def landing_page(request):
     return render(request, "index.html")
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition (enabled with METRICS). Scrapers send
+    METRICS_TOKEN; without one configured it is only served with DEBUG.
+    """
+    if not settings.METRICS:
+        raise Http404
+
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            raise Http404
+    elif request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse(status=401)
+
+    payload, content_type = metrics.export()
+    return HttpResponse(payload, content_type=content_type)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class JobsConfig(AppConfig):
     name = "apps.jobs"
+
+    def ready(self):
+        from apps.jobs import checks, signals  # noqa: F401
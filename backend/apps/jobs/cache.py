@@ -0,0 +1,82 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+
+class JobCache:
+    """
+    Versioned response cache for the public job endpoints.
+
+    Every key embeds the current namespace version, so invalidating after a
+    write is a single counter bump: old entries are simply never read again
+    and expire on their own TTL. No key scanning is needed, which keeps it
+    usable on the file and database backends. The counter must be seen by
+    every worker, so a per-process cache is rejected (see apps.jobs.checks).
+    JOB_CACHE_TIMEOUT=0 turns the cache off.
+    """
+
+    version_key = "jobs:cache-version"
+
+    @staticmethod
+    def timeout():
+        return getattr(settings, "JOB_CACHE_TIMEOUT", 0)
+
+    @classmethod
+    def enabled(cls):
+        return cls.timeout() > 0
+
+    @classmethod
+    def version(cls):
+        version = cache.get(cls.version_key)
+        if version is None:
+            # Seed from the clock so an evicted counter never reuses old keys
+            cache.add(cls.version_key, int(time.time() * 1000), None)
+            version = cache.get(cls.version_key)
+        return version
+
+    @classmethod
+    def invalidate(cls):
+        """Move to a fresh namespace; every cached job response goes stale"""
+        try:
+            cache.incr(cls.version_key)
+        except ValueError:
+            cache.set(cls.version_key, int(time.time() * 1000), None)
+
+    @staticmethod
+    def normalize_params(query_params, exclude=()):
+        """Stable representation of the query string (order-independent)"""
+        items = []
+        for key in sorted(query_params.keys()):
+            if key in exclude:
+                continue
+            values = sorted(v.strip() for v in query_params.getlist(key) if v.strip())
+            if values:
+                items.append(f"{key}={','.join(values)}")
+        return "&".join(items)
+
+    @classmethod
+    def key(cls, request, action, exclude=()):
+        """Cache key of a request; parameters in exclude do not change it"""
+        params = cls.normalize_params(request.query_params, exclude)
+        raw = f"{request.path}?{params}"
+        digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+        return f"jobs:{cls.version()}:{action}:{digest}"
+
+    @classmethod
+    def respond(cls, request, action, view_func):
+        """Serve a cached response body, or render it with view_func and store it"""
+        if not cls.enabled():
+            return view_func()
+
+        key = cls.key(request, action)
+
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = view_func()
+        if response.status_code == 200:
+            cache.set(key, response.data, cls.timeout())
+        return response
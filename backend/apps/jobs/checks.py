@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from apps.authentication.checks import PROCESS_LOCAL_CACHES
+
+
+@register(Tags.caches)
+def check_job_cache_is_shared(app_configs, **kwargs):
+    """
+    JobCache invalidates by bumping a version counter in the cache, which
+    only reaches other workers through a shared cache
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if settings.JOB_CACHE_TIMEOUT <= 0 or backend not in PROCESS_LOCAL_CACHES:
+        return []
+
+    return [
+        Error(
+            "JOB_CACHE_TIMEOUT needs a cache shared by every worker.",
+            hint=(
+                f"{backend} is per process, so other workers keep serving job "
+                "responses cached before a write. Configure a shared "
+                "CACHE_BACKEND (e.g. FileBasedCache, DatabaseCache, Redis) or "
+                "set JOB_CACHE_TIMEOUT=0."
+            ),
+            id="jobs.E001",
+        )
+    ]
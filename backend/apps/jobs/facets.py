@@ -0,0 +1,120 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from apps.jobs.cache import JobCache
+
+FACET_FIELDS = ("category", "job_type", "location")
+
+# Query parameters that pick a page or an ordering of the filtered jobs, not
+# the jobs themselves; facet counts are cached without them
+PAGE_PARAMS = (
+    "page",
+    "page_size",
+    "cursor",
+    "pagination",
+    "include_count",
+    "ordering",
+    "facets",
+    "facets_only",
+)
+
+
+def requested_facets(value):
+    """
+    Facet fields named by ?facets= ("true" or "all" for every field).
+
+    Raises:
+        ValueError: for an unknown field
+    """
+    if value.strip().lower() in ("1", "true", "all"):
+        return list(FACET_FIELDS)
+
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in FACET_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown facet(s): {', '.join(unknown)}. "
+            f"Choose from {', '.join(FACET_FIELDS)}"
+        )
+    return list(dict.fromkeys(fields))
+
+
+def facet_sql(queryset):
+    """
+    One statement counting the queryset per value of every facet field,
+    plus the total. On PostgreSQL it is a single GROUPING SETS pass over
+    the filtered jobs; elsewhere a UNION ALL of one GROUP BY per field.
+
+    Returns:
+        tuple: SQL and params; rows are (field, value, count), field None
+        for the total
+    """
+    inner, params = queryset.order_by().values(*FACET_FIELDS).query.sql_with_params()
+    quote = connection.ops.quote_name
+
+    if connection.vendor == "postgresql":
+        facet = " ".join(
+            f"WHEN GROUPING({quote(field)}) = 0 THEN '{field}'"
+            for field in FACET_FIELDS
+        )
+        value = ", ".join(f"{quote(field)}::text" for field in FACET_FIELDS)
+        sets = ", ".join(f"({quote(field)})" for field in FACET_FIELDS)
+        sql = (
+            f"SELECT CASE {facet} END, COALESCE({value}), COUNT(*) "
+            f"FROM ({inner}) AS jobs GROUP BY GROUPING SETS ({sets}, ())"
+        )
+        return sql, params
+
+    parts = [f"SELECT NULL, NULL, COUNT(*) FROM ({inner}) AS jobs"]
+    parts.extend(
+        f"SELECT '{field}', {quote(field)}, COUNT(*) FROM ({inner}) AS jobs "
+        f"GROUP BY {quote(field)}"
+        for field in FACET_FIELDS
+    )
+    return " UNION ALL ".join(parts), tuple(params) * len(parts)
+
+
+def count_facets(queryset):
+    """
+    Counts of the filtered jobs per facet value, most frequent first and
+    at most JOB_FACET_LIMIT values per field.
+
+    Returns:
+        dict: {"count": total, "facets": {field: [{"value", "count"}, ...]}}
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(*facet_sql(queryset))
+        rows = cursor.fetchall()
+
+    total = 0
+    facets = {field: [] for field in FACET_FIELDS}
+    for field, value, count in rows:
+        if field is None:
+            total = count
+        elif value is not None:
+            facets[field].append({"value": value, "count": count})
+
+    limit = settings.JOB_FACET_LIMIT
+    for field, values in facets.items():
+        values.sort(key=lambda item: (-item["count"], item["value"]))
+        del values[limit:]
+
+    return {"count": total, "facets": facets}
+
+
+def cached_facets(request, queryset):
+    """
+    count_facets of the filtered jobs, cached on the filter and search
+    parameters only, so every page and ordering of a result set shares one
+    entry. Entries go stale with the other job responses (JobCache).
+    """
+    if not JobCache.enabled():
+        return count_facets(queryset)
+
+    key = JobCache.key(request, "facets", exclude=PAGE_PARAMS)
+    result = cache.get(key)
+    if result is None:
+        result = count_facets(queryset)
+        cache.set(key, result, JobCache.timeout())
+    return result
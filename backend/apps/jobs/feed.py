@@ -0,0 +1,568 @@
+import math
+import numpy as np
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from apps.applications.models import Application
+from apps.authentication.models import UserProfile
+from apps.jobs.models import Job, PendingFeedJob, SeekerFeed, SeekerFeedEntry
+from apps.jobs.similarity import merge_top_k, words
+
+User = get_user_model()
+
+# Share of each signal in a feed score; they add up to 1
+SKILL_WEIGHT = 0.5
+EXPERIENCE_WEIGHT = 0.2
+CATEGORY_WEIGHT = 0.2
+JOB_TYPE_WEIGHT = 0.1
+
+CATEGORIES = {choice[0]: i for i, choice in enumerate(Job.CATEGORY_CHOICES)}
+JOB_TYPES = {choice[0]: i for i, choice in enumerate(Job.JOB_TYPE_CHOICES)}
+
+# Columns read to score a job
+JOB_FIELDS = ("id", "requirements", "experience_required", "category", "job_type")
+
+# Seekers scored at once
+BLOCK_SIZE = 512
+
+# Jobs scored at once for a block of seekers: a (BLOCK_SIZE, JOB_BLOCK_SIZE)
+# score matrix is the largest array, whatever the number of open jobs
+JOB_BLOCK_SIZE = 4096
+
+# Queued jobs rescored per transaction by rescore_pending()
+PENDING_BATCH_SIZE = 500
+
+# Feed rows per INSERT statement
+INSERT_BATCH_SIZE = 50000
+
+
+def active_seekers():
+    return User.objects.filter(role="seeker", is_active=True)
+
+
+def up_to_date_feeds():
+    """Built feeds with no profile or application change since"""
+    return SeekerFeed.objects.filter(built_at__isnull=False, version=F("built_version"))
+
+
+def latest_job_id():
+    return Job.objects.order_by("-id").values_list("id", flat=True).first() or 0
+
+
+def seeker_features(seeker_ids):
+    """
+    Scoring features of seekers: skill words, years of experience and the
+    share of their applications in each category and job type.
+
+    Returns:
+        dict: {seeker id: features}
+    """
+    today = timezone.now().date()
+    features = {
+        seeker_id: {"skills": [], "years": 0.0, "categories": {}, "job_types": {}}
+        for seeker_id in seeker_ids
+    }
+
+    for seeker_id, skills, started in UserProfile.objects.filter(
+        user_id__in=seeker_ids
+    ).values_list("user_id", "skills", "experience"):
+        features[seeker_id]["skills"] = sorted(set(words(skills)))
+        # Same formula as UserProfile.get_experience_years
+        if started:
+            features[seeker_id]["years"] = round(
+                max((today - started).days / 365.25, 0), 2
+            )
+
+    for key, field in (("categories", "job__category"), ("job_types", "job__job_type")):
+        counts = (
+            Application.objects.filter(applicant_id__in=seeker_ids)
+            .values_list("applicant_id", field)
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for seeker_id, value, count in counts:
+            features[seeker_id][key][value] = count
+
+    for seeker in features.values():
+        for key in ("categories", "job_types"):
+            total = sum(seeker[key].values())
+            seeker[key] = {
+                value: round(count / total, 4) for value, count in seeker[key].items()
+            }
+
+    return features
+
+
+def load_jobs(queryset):
+    """
+    Scoring columns of jobs as arrays, ordered by id. Unknown categories and
+    job types map to one extra column that matches nothing.
+
+    Returns:
+        dict: ids, requirement word sets, experience_required, category and
+        job type positions
+    """
+    rows = list(queryset.order_by("id").values_list(*JOB_FIELDS))
+    return {
+        "ids": np.array([row[0] for row in rows], dtype=np.int64),
+        "words": [set(words(row[1])) for row in rows],
+        "experience": np.array([row[2] for row in rows], dtype=np.float64),
+        "categories": np.array(
+            [CATEGORIES.get(row[3], len(CATEGORIES)) for row in rows], dtype=np.intp
+        ),
+        "job_types": np.array(
+            [JOB_TYPES.get(row[4], len(JOB_TYPES)) for row in rows], dtype=np.intp
+        ),
+    }
+
+
+def shares(features, key, positions):
+    """(seekers, positions + 1) matrix of application shares"""
+    matrix = np.zeros((len(features), len(positions) + 1), np.float32)
+    for row, seeker in enumerate(features):
+        for value, share in seeker[key].items():
+            if value in positions:
+                matrix[row, positions[value]] = share
+    return matrix
+
+
+def score(features, jobs):
+    """
+    Feed scores of jobs for seekers, between 0 and 1.
+
+    Skills: cosine between the seeker's skill words and the job's
+    requirement words (as in ApplicationMatchServices). Experience: years
+    over experience_required, capped at 1. Category and job type: share of
+    the seeker's past applications that went to the job's category / type.
+
+    Returns:
+        numpy.ndarray: (seekers, jobs) scores
+    """
+    vocabulary = {
+        word: i
+        for i, word in enumerate(
+            sorted({w for seeker in features for w in seeker["skills"]})
+        )
+    }
+
+    skills = np.zeros((len(features), len(vocabulary)), np.float32)
+    for row, seeker in enumerate(features):
+        if seeker["skills"]:
+            columns = [vocabulary[word] for word in seeker["skills"]]
+            skills[row, columns] = 1 / math.sqrt(len(columns))
+
+    required = np.zeros((len(jobs["ids"]), len(vocabulary)), np.float32)
+    for row, job_words in enumerate(jobs["words"]):
+        columns = [vocabulary[word] for word in job_words if word in vocabulary]
+        if columns:
+            required[row, columns] = 1 / math.sqrt(len(job_words))
+
+    scores = SKILL_WEIGHT * (skills @ required.T)
+
+    years = np.array([seeker["years"] for seeker in features], np.float32)[:, None]
+    needed = jobs["experience"][None, :]
+    scores += EXPERIENCE_WEIGHT * np.where(
+        needed > 0, np.minimum(years / np.maximum(needed, 1), 1), 1
+    ).astype(np.float32)
+
+    scores += (
+        CATEGORY_WEIGHT
+        * shares(features, "categories", CATEGORIES)[:, jobs["categories"]]
+    )
+    scores += (
+        JOB_TYPE_WEIGHT * shares(features, "job_types", JOB_TYPES)[:, jobs["job_types"]]
+    )
+    return scores
+
+
+def job_slice(jobs, start, stop):
+    """Rows start to stop of load_jobs() arrays"""
+    return {key: values[start:stop] for key, values in jobs.items()}
+
+
+def applied_jobs(seeker_ids, jobs):
+    """
+    Jobs each seeker already applied to, within the id range of jobs.
+
+    Returns:
+        tuple: seeker row positions and job id arrays
+    """
+    if not len(jobs["ids"]):
+        return np.array([], dtype=np.intp), np.array([], dtype=np.int64)
+
+    rows = {seeker_id: row for row, seeker_id in enumerate(seeker_ids)}
+    applied = list(
+        Application.objects.filter(
+            applicant_id__in=seeker_ids,
+            job_id__gte=int(jobs["ids"][0]),
+            job_id__lte=int(jobs["ids"][-1]),
+        ).values_list("applicant_id", "job_id")
+    )
+    return (
+        np.array([rows[seeker_id] for seeker_id, _ in applied], dtype=np.intp),
+        np.array([job_id for _, job_id in applied], dtype=np.int64),
+    )
+
+
+def exclude_applied(scores, applied, job_ids):
+    """Drop (set to -inf) the applied_jobs() found among job_ids"""
+    rows, applied_ids = applied
+    columns = np.searchsorted(job_ids, applied_ids)
+    found = columns < len(job_ids)
+    found[found] = job_ids[columns[found]] == applied_ids[found]
+    scores[rows[found], columns[found]] = -np.inf
+
+
+def score_blocks(features, seeker_ids, jobs):
+    """
+    Scores of jobs for a block of seekers, JOB_BLOCK_SIZE jobs at a time,
+    with the jobs they applied to excluded.
+
+    Yields:
+        tuple: position of the first job of the block and its
+        (seekers, jobs) scores
+    """
+    applied = applied_jobs(seeker_ids, jobs)
+    for start in range(0, len(jobs["ids"]), JOB_BLOCK_SIZE):
+        block = job_slice(jobs, start, start + JOB_BLOCK_SIZE)
+        scores = score(features, block)
+        exclude_applied(scores, applied, block["ids"])
+        yield start, scores
+
+
+def insert_entries(seeker_ids, job_ids, scores):
+    """
+    Write feed rows from parallel lists, skipping existing (seeker, job)
+    pairs. On PostgreSQL the lists go through unnest() in a few statements.
+    """
+    if connection.vendor != "postgresql":
+        SeekerFeedEntry.objects.bulk_create(
+            [
+                SeekerFeedEntry(seeker_id=seeker_id, job_id=job_id, score=score)
+                for seeker_id, job_id, score in zip(seeker_ids, job_ids, scores)
+            ],
+            batch_size=5000,
+            ignore_conflicts=True,
+        )
+        return
+
+    table = SeekerFeedEntry._meta.db_table
+    with connection.cursor() as cursor:
+        for start in range(0, len(seeker_ids), INSERT_BATCH_SIZE):
+            stop = start + INSERT_BATCH_SIZE
+            cursor.execute(
+                f"INSERT INTO {table} (seeker_id, job_id, score) "
+                "SELECT * FROM unnest(%s::uuid[], %s::bigint[], %s::float8[]) "
+                "ON CONFLICT DO NOTHING",
+                [
+                    [str(seeker_id) for seeker_id in seeker_ids[start:stop]],
+                    job_ids[start:stop],
+                    scores[start:stop],
+                ],
+            )
+
+
+def build(seeker_ids):
+    """
+    Replace the feeds of these seekers with their SEEKER_FEED_SIZE best open
+    jobs. Every open job is scored, BLOCK_SIZE seekers at a time, each block
+    in its own transaction.
+
+    A feed stores the version it was built from: a profile or application
+    change during the build bumps the version past it, so the feed is built
+    again on the next refresh.
+
+    Returns:
+        int: number of feed entries written
+    """
+    size = settings.SEEKER_FEED_SIZE
+    last_job_id = latest_job_id()
+    jobs = load_jobs(Job.objects.open().filter(id__lte=last_job_id))
+    written = 0
+
+    for start in range(0, len(seeker_ids), BLOCK_SIZE):
+        block = seeker_ids[start : start + BLOCK_SIZE]
+        # Rows exist before the features are read, so mark_stale() can bump
+        # the version of a feed that is being built for the first time
+        SeekerFeed.objects.bulk_create(
+            [SeekerFeed(seeker_id=seeker_id) for seeker_id in block],
+            ignore_conflicts=True,
+        )
+        versions = dict(
+            SeekerFeed.objects.filter(seeker_id__in=block).values_list(
+                "seeker_id", "version"
+            )
+        )
+        features = seeker_features(block)
+
+        columns = np.empty((len(block), 0), np.intp)
+        top = np.empty((len(block), 0), np.float32)
+        for offset, scores in score_blocks(
+            [features[seeker_id] for seeker_id in block], block, jobs
+        ):
+            columns, top = merge_top_k(columns, top, scores, offset, size)
+        keep = np.isfinite(top)
+        counts = keep.sum(1)
+
+        feeds = [
+            SeekerFeed(
+                seeker_id=seeker_id,
+                features=features[seeker_id],
+                last_job_id=last_job_id,
+                threshold=float(top[row, size - 1]) if counts[row] >= size else -1.0,
+                built_version=versions[seeker_id],
+                built_at=timezone.now(),
+            )
+            for row, seeker_id in enumerate(block)
+        ]
+
+        with transaction.atomic():
+            SeekerFeedEntry.objects.filter(seeker_id__in=block).delete()
+            insert_entries(
+                [
+                    seeker_id
+                    for row, seeker_id in enumerate(block)
+                    for _ in range(counts[row])
+                ],
+                jobs["ids"][columns[keep]].tolist(),
+                np.round(top[keep].astype(np.float64), 4).tolist(),
+            )
+            SeekerFeed.objects.bulk_update(
+                feeds,
+                ["features", "last_job_id", "threshold", "built_version", "built_at"],
+            )
+        written += int(counts.sum())
+
+    return written
+
+
+def rebuild():
+    """Rebuild the feed of every active seeker"""
+    return build(list(active_seekers().order_by("pk").values_list("pk", flat=True)))
+
+
+def prune_closed():
+    """
+    Delete feed entries of jobs past their deadline. Their feeds are no
+    longer full, so any new job may enter them.
+
+    Returns:
+        int: number of entries deleted
+    """
+    closed = SeekerFeedEntry.objects.filter(
+        job__application_deadline__lte=timezone.now()
+    )
+    SeekerFeed.objects.filter(Exists(closed.filter(seeker=OuterRef("pk")))).update(
+        threshold=-1.0
+    )
+    deleted, _ = closed.delete()
+    return deleted
+
+
+def merge(seeker_ids, proposals):
+    """
+    Add proposed (seeker, job, score) entries and trim the feeds of these
+    seekers back to SEEKER_FEED_SIZE, keeping the best scores.
+
+    Returns:
+        dict: {seeker id: new threshold}
+    """
+    size = settings.SEEKER_FEED_SIZE
+    insert_entries(*(list(column) for column in zip(*proposals)))
+
+    lists = {seeker_id: [] for seeker_id in seeker_ids}
+    for pk, seeker_id, entry_score in (
+        SeekerFeedEntry.objects.filter(seeker_id__in=seeker_ids)
+        .order_by("-score", "-id")
+        .values_list("pk", "seeker_id", "score")
+    ):
+        lists[seeker_id].append((pk, entry_score))
+
+    evicted = [pk for entries in lists.values() for pk, _ in entries[size:]]
+    SeekerFeedEntry.objects.filter(pk__in=evicted).delete()
+    return {
+        seeker_id: entries[size - 1][1] if len(entries) >= size else -1.0
+        for seeker_id, entries in lists.items()
+    }
+
+
+def merge_jobs(rows, jobs, **fields):
+    """
+    Score jobs for feeds, given as (seeker id, features, threshold) rows,
+    BLOCK_SIZE feeds at a time, and merge the best ones that beat a feed's
+    threshold into it. Fields are also set on every feed of a block.
+
+    Returns:
+        int: number of feed entries added
+    """
+    size = settings.SEEKER_FEED_SIZE
+    added = 0
+
+    for start in range(0, len(rows), BLOCK_SIZE):
+        block = rows[start : start + BLOCK_SIZE]
+        seeker_ids = [seeker_id for seeker_id, _, _ in block]
+        thresholds = np.array([threshold for _, _, threshold in block])[:, None]
+
+        # At most SEEKER_FEED_SIZE proposals per feed, whatever the job count
+        columns = np.empty((len(block), 0), np.intp)
+        top = np.empty((len(block), 0), np.float32)
+        for offset, scores in score_blocks(
+            [features for _, features, _ in block], seeker_ids, jobs
+        ):
+            scores[scores <= thresholds] = -np.inf
+            columns, top = merge_top_k(columns, top, scores, offset, size)
+        rows_in, positions = np.nonzero(np.isfinite(top))
+        proposals = [
+            (
+                seeker_ids[row],
+                int(jobs["ids"][columns[row, position]]),
+                round(float(top[row, position]), 4),
+            )
+            for row, position in zip(rows_in.tolist(), positions.tolist())
+        ]
+
+        with transaction.atomic():
+            merged = {}
+            if proposals:
+                touched = sorted({seeker_id for seeker_id, _, _ in proposals})
+                merged = merge(touched, proposals)
+                added += len(proposals)
+            SeekerFeed.objects.bulk_update(
+                [
+                    SeekerFeed(
+                        seeker_id=seeker_id,
+                        threshold=merged.get(seeker_id, threshold),
+                        **fields,
+                    )
+                    for seeker_id, _, threshold in block
+                    if fields or seeker_id in merged
+                ],
+                ["threshold", *fields],
+            )
+
+    return added
+
+
+def add_new_jobs():
+    """
+    Merge open jobs created since each up to date feed was built into the
+    feeds whose threshold they beat. Only the new jobs are scored, against
+    the features stored with each feed.
+
+    Returns:
+        int: number of feed entries added
+    """
+    last_job_id = latest_job_id()
+    feeds = up_to_date_feeds().filter(last_job_id__lt=last_job_id)
+    added = 0
+
+    watermarks = feeds.values_list("last_job_id", flat=True).distinct().order_by()
+    for watermark in list(watermarks):
+        jobs = load_jobs(
+            Job.objects.open().filter(id__gt=watermark, id__lte=last_job_id)
+        )
+        rows = list(
+            feeds.filter(last_job_id=watermark)
+            .order_by("pk")
+            .values_list("pk", "features", "threshold")
+        )
+        added += merge_jobs(rows, jobs, last_job_id=last_job_id)
+
+    return added
+
+
+def queue_jobs(job_ids):
+    """
+    Queue edited or reopened jobs for rescore_pending() in the caller's
+    transaction. Already queued jobs are skipped.
+    """
+    PendingFeedJob.objects.bulk_create(
+        [PendingFeedJob(job_id=job_id) for job_id in job_ids],
+        ignore_conflicts=True,
+    )
+
+
+def rescore_pending(batch_size=PENDING_BATCH_SIZE):
+    """
+    Rescore one batch of queued jobs and dequeue them in the same
+    transaction: their feed entries are dropped, then the ones still open
+    are merged into the up to date feeds again like new jobs. Rows are
+    locked with SKIP LOCKED so several workers can run in parallel.
+
+    Returns:
+        int: number of jobs rescored
+    """
+    with transaction.atomic():
+        job_ids = list(
+            PendingFeedJob.objects.select_for_update(skip_locked=True)
+            .order_by("queued_at", "job_id")
+            .values_list("job_id", flat=True)[:batch_size]
+        )
+        if not job_ids:
+            return 0
+
+        # Feeds losing an entry are no longer full; any job may enter them
+        entries = SeekerFeedEntry.objects.filter(job_id__in=job_ids)
+        SeekerFeed.objects.filter(Exists(entries.filter(seeker=OuterRef("pk")))).update(
+            threshold=-1.0
+        )
+        entries.delete()
+
+        # Jobs past a feed's watermark reach it through add_new_jobs()
+        jobs = load_jobs(Job.objects.open().filter(pk__in=job_ids))
+        if len(jobs["ids"]):
+            rows = list(
+                up_to_date_feeds()
+                .filter(last_job_id__gte=int(jobs["ids"][0]))
+                .order_by("pk")
+                .values_list("pk", "features", "threshold")
+            )
+            merge_jobs(rows, jobs)
+        PendingFeedJob.objects.filter(job_id__in=job_ids).delete()
+
+    return len(job_ids)
+
+
+def refresh():
+    """
+    Bring the feeds of all active seekers up to date: drop closed jobs,
+    fully build new and stale feeds, rescore edited jobs, then merge new
+    jobs into the other feeds.
+
+    Returns:
+        dict: pruned, built, rescored (jobs) and added entry counts
+    """
+    pruned = prune_closed()
+    pending = list(
+        active_seekers()
+        .filter(
+            Q(feed__isnull=True)
+            | Q(feed__built_at__isnull=True)
+            | Q(feed__version__gt=F("feed__built_version"))
+        )
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    built = build(pending) if pending else 0
+
+    rescored = 0
+    while batch := rescore_pending():
+        rescored += batch
+
+    return {
+        "pruned": pruned,
+        "built": built,
+        "rescored": rescored,
+        "added": add_new_jobs(),
+    }
+
+
+def mark_stale(seeker_ids):
+    """
+    Rebuild these seekers' feeds on the next refresh, including a feed
+    being built right now
+    """
+    SeekerFeed.objects.filter(seeker_id__in=seeker_ids).update(version=F("version") + 1)
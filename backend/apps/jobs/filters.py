@@ -0,0 +1,32 @@
+import django_filters
+from django.db.models import Q
+
+from apps.jobs.models import Job
+
+
+class JobFilter(django_filters.FilterSet):
+    """
+    Job list filters: exact category/job type/location, salary and
+    experience ranges, and deadline filters. Jobs without a deadline take
+    applications indefinitely, so they count as open and pass deadline_after.
+    """
+
+    min_salary = django_filters.NumberFilter(field_name="salary", lookup_expr="gte")
+    max_salary = django_filters.NumberFilter(field_name="salary", lookup_expr="lte")
+    max_experience = django_filters.NumberFilter(
+        field_name="experience_required", lookup_expr="lte"
+    )
+    deadline_after = django_filters.DateTimeFilter(method="filter_deadline_after")
+    open_only = django_filters.BooleanFilter(method="filter_open_only")
+
+    class Meta:
+        model = Job
+        fields = ["category", "job_type", "location"]
+
+    def filter_deadline_after(self, queryset, name, value):
+        return queryset.filter(
+            Q(application_deadline__isnull=True) | Q(application_deadline__gte=value)
+        )
+
+    def filter_open_only(self, queryset, name, value):
+        return queryset.open() if value else queryset
@@ -0,0 +1,36 @@
+import time
+from django.core.management.base import BaseCommand
+
+from apps.jobs import similarity
+from apps.jobs.cache import JobCache
+from apps.jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute job vectors and the precomputed similar_jobs neighbor lists "
+        "(run after deploying, after bulk changes or periodically; new and "
+        "edited jobs are merged in incrementally)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--category",
+            action="append",
+            choices=[choice[0] for choice in Job.CATEGORY_CHOICES],
+            help="Only rebuild this category (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        written = similarity.rebuild(options["category"])
+        JobCache.invalidate()
+
+        for category, count in written.items():
+            self.stdout.write(f"  {category}: {count} neighbor rows")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built {sum(written.values())} neighbor rows in "
+                f"{time.monotonic() - started:.1f}s"
+            )
+        )
@@ -0,0 +1,126 @@
+import csv
+import json
+import os
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.jobs.services import JobImportServices, chunked
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Import jobs for a recruiter from a CSV (header row with Job field names) "
+        "or NDJSON (one job object per line) file"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file")
+        parser.add_argument(
+            "--recruiter", required=True, help="Email of the recruiter posting the jobs"
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="File format (default: from the file extension)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.JOB_IMPORT_BATCH_SIZE,
+            help="Rows validated and inserted per transaction",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only validate the file"
+        )
+        parser.add_argument(
+            "--errors", help="Write per-row errors to this file as NDJSON"
+        )
+
+    def handle(self, *args, **options):
+        recruiter = User.objects.filter(
+            email=options["recruiter"], role="recruiter"
+        ).first()
+        if recruiter is None:
+            raise CommandError(f"No recruiter with email {options['recruiter']}")
+
+        file_format = options["format"] or self.guess_format(options["path"])
+        self.errors = []
+        totals = {"created": 0, "valid": 0, "failed": 0}
+
+        with open(options["path"], newline="", encoding="utf-8-sig") as source:
+            rows = (
+                self.read_csv(source)
+                if file_format == "csv"
+                else self.read_ndjson(source)
+            )
+
+            # One transaction (and one cache invalidation) per chunk keeps memory flat
+            for chunk in chunked(rows, options["batch_size"]):
+                result = JobImportServices.import_rows(
+                    recruiter,
+                    chunk,
+                    dry_run=options["dry_run"],
+                    batch_size=options["batch_size"],
+                )
+                self.errors.extend(result["errors"])
+                for key in totals:
+                    totals[key] += result[key]
+                self.stdout.write(
+                    f"  {totals['valid'] + totals['failed']} rows read, "
+                    f"{totals['created']} created"
+                )
+
+        self.report(totals, options)
+
+    def guess_format(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            return "csv"
+        if extension in (".ndjson", ".jsonl"):
+            return "ndjson"
+        raise CommandError("Cannot tell the file format; pass --format csv|ndjson")
+
+    def read_csv(self, source):
+        """Yield (line number, row) pairs; the header is line 1"""
+        reader = csv.DictReader(source)
+        for row in reader:
+            yield reader.line_num, row
+
+    def read_ndjson(self, source):
+        """Yield (line number, object) pairs, recording lines that aren't JSON"""
+        for line_number, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                self.errors.append(
+                    {"row": line_number, "errors": {"non_field_errors": [str(e)]}}
+                )
+
+    def report(self, totals, options):
+        failed = len(self.errors)
+
+        for error in self.errors[:20]:
+            self.stdout.write(
+                self.style.ERROR(f"line {error['row']}: {json.dumps(error['errors'])}")
+            )
+        if failed > 20:
+            self.stdout.write(f"... and {failed - 20} more")
+
+        if options["errors"]:
+            with open(options["errors"], "w") as error_file:
+                for error in self.errors:
+                    error_file.write(json.dumps(error, default=str) + "\n")
+
+        if options["dry_run"]:
+            self.stdout.write(f"{totals['valid']} valid row(s), {failed} invalid")
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Imported {totals['created']} job(s), {failed} row(s) failed"
+                )
+            )
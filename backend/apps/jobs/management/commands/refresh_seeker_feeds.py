@@ -0,0 +1,55 @@
+import time
+from django.core.management.base import BaseCommand
+
+from apps.jobs import feed
+
+
+class Command(BaseCommand):
+    help = (
+        "Bring the precomputed seeker job feeds up to date: build new and stale "
+        "feeds, rescore edited jobs, merge in jobs posted since the last run "
+        "and drop closed jobs "
+        "(run periodically, or with --loop as a worker)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Rescore every open job for every active seeker",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep refreshing instead of exiting after one pass",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60.0,
+            help="Seconds to wait between passes (with --loop)",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            started = time.monotonic()
+            written = feed.rebuild()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Built {written} feed entries in "
+                    f"{time.monotonic() - started:.1f}s"
+                )
+            )
+
+        while True:
+            started = time.monotonic()
+            result = feed.refresh()
+            self.stdout.write(
+                f"Feeds: {result['built']} entries built, {result['added']} added, "
+                f"{result['pruned']} pruned, {result['rescored']} jobs rescored "
+                f"in {time.monotonic() - started:.1f}s"
+            )
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,40 @@
+import time
+from django.core.management.base import BaseCommand
+
+from apps.jobs import similarity
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge jobs created or edited since the last run into the similar_jobs "
+        "neighbor lists (run periodically, or with --loop as a worker)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep indexing instead of exiting once the queue is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=10.0,
+            help="Seconds to wait when the queue is empty (with --loop)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            indexed = 0
+            while batch := similarity.index_pending():
+                indexed += batch
+
+            if indexed:
+                self.stdout.write(
+                    f"Indexed {indexed} job(s) in {time.monotonic() - started:.1f}s"
+                )
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,71 @@
+# Generated by Django 6.0.2 on 2026-10-17 15:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0005_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobVector",
+            fields=[
+                (
+                    "job",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="vector",
+                        serialize=False,
+                        to="jobs.job",
+                    ),
+                ),
+                ("vector", models.BinaryField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SimilarJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="neighbors",
+                        to="jobs.job",
+                    ),
+                ),
+                (
+                    "similar",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="neighbor_of",
+                        to="jobs.job",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["job", "-score"], name="similar_job_score_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("job", "similar"), name="unique_similar_job"
+                    )
+                ],
+            },
+        ),
+    ]
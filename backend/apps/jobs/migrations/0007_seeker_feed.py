@@ -0,0 +1,90 @@
+# Generated by Django 6.0.2 on 2026-10-17 16:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0001_initial"),
+        ("jobs", "0006_similar_jobs"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeekerFeed",
+            fields=[
+                (
+                    "seeker",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="feed",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("features", models.JSONField(default=dict)),
+                ("last_job_id", models.BigIntegerField(default=0)),
+                ("threshold", models.FloatField(default=-1.0)),
+                ("stale", models.BooleanField(default=True)),
+                ("built_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("stale", True)),
+                        fields=["stale"],
+                        name="seeker_feed_stale_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="SeekerFeedEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="feed_entries",
+                        to="jobs.job",
+                    ),
+                ),
+                (
+                    "seeker",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="feed_entries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Seeker Feed Entries",
+                "indexes": [
+                    models.Index(
+                        fields=["seeker", "-score", "-id"], name="seeker_feed_score_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("seeker", "job"), name="unique_seeker_feed_job"
+                    )
+                ],
+            },
+        ),
+    ]
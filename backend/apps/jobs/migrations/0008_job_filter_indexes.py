@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-17 17:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0007_seeker_feed"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["application_deadline"], name="job_deadline_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["category", "application_deadline"],
+                name="job_category_deadline_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["category", "salary", "id"], name="job_category_salary_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["experience_required", "salary"],
+                name="job_experience_salary_idx",
+            ),
+        ),
+    ]
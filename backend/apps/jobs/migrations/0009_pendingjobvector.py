@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-17 18:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0008_job_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingJobVector",
+            fields=[
+                (
+                    "job",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="jobs.job",
+                    ),
+                ),
+                ("queued_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 6.0.2 on 2026-10-17 19:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def stale_to_version(apps, schema_editor):
+    SeekerFeed = apps.get_model("jobs", "SeekerFeed")
+    SeekerFeed.objects.filter(stale=True).update(version=1)
+
+
+def version_to_stale(apps, schema_editor):
+    SeekerFeed = apps.get_model("jobs", "SeekerFeed")
+    SeekerFeed.objects.filter(version__gt=models.F("built_version")).update(stale=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0009_pendingjobvector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingFeedJob",
+            fields=[
+                (
+                    "job",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="jobs.job",
+                    ),
+                ),
+                ("queued_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="seekerfeed",
+            name="built_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="seekerfeed",
+            name="version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(stale_to_version, version_to_stale),
+        migrations.RemoveIndex(
+            model_name="seekerfeed",
+            name="seeker_feed_stale_idx",
+        ),
+        migrations.RemoveField(
+            model_name="seekerfeed",
+            name="stale",
+        ),
+        migrations.AddIndex(
+            model_name="seekerfeed",
+            index=models.Index(
+                condition=models.Q(("version__gt", models.F("built_version"))),
+                fields=["seeker"],
+                name="seeker_feed_outdated_idx",
+            ),
+        ),
+    ]
@@ -1,6 +1,10 @@
 from django.db import models
+from django.db.models import DEFERRED
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from cloudinary.models import CloudinaryField
 from django.contrib.auth import get_user_model
+from apps.jobs.querysets import JobQuerySet
 
 # from django.core.validators import FileExtensionValidator
 # from apps.core.validators import validate_file_size
@@ -69,5 +73,230 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Weighted full-text document (title > company > description),
+    # maintained by apps.jobs.search on save
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="job_search_vector_gin"),
+            # Default list ordering; (-created_at, -id) is also the keyset order
+            models.Index(fields=["-created_at", "-id"], name="job_created_idx"),
+            # Exact JobFilter fields, each followed by the default ordering
+            models.Index(
+                fields=["category", "-created_at", "-id"],
+                name="job_category_created_idx",
+            ),
+            models.Index(
+                fields=["job_type", "-created_at", "-id"],
+                name="job_type_created_idx",
+            ),
+            models.Index(
+                fields=["location", "-created_at", "-id"],
+                name="job_location_created_idx",
+            ),
+            # ?ordering=salary / -salary (both directions scan one index)
+            models.Index(fields=["salary", "id"], name="job_salary_idx"),
+            # JobFilter ranges: open_only / deadline_after (IS NULL is indexed
+            # too), alone or within a category
+            models.Index(fields=["application_deadline"], name="job_deadline_idx"),
+            models.Index(
+                fields=["category", "application_deadline"],
+                name="job_category_deadline_idx",
+            ),
+            # min/max_salary within a category, also ordered by salary
+            models.Index(
+                fields=["category", "salary", "id"], name="job_category_salary_idx"
+            ),
+            # max_experience, with or without min/max_salary
+            models.Index(
+                fields=["experience_required", "salary"],
+                name="job_experience_salary_idx",
+            ),
+            # my_jobs
+            models.Index(
+                fields=["recruiter", "-created_at", "-id"],
+                name="job_recruiter_created_idx",
+            ),
+            # similar_jobs
+            models.Index(
+                fields=["category", "location", "-created_at"],
+                name="job_category_location_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Column values as loaded, so save signals can tell what changed
+        instance._loaded_values = dict(
+            zip(field_names, (value for value in values if value is not DEFERRED))
+        )
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Later saves compare against what is now stored. Done after the
+        # post_save signals, so every receiver sees the values before this save
+        if getattr(self, "_loaded_values", None) is not None:
+            saved = kwargs.get("update_fields")
+            self._loaded_values.update(
+                (field.attname, getattr(self, field.attname))
+                for field in self._meta.concrete_fields
+                if field.attname in self.__dict__
+                and (saved is None or field.name in saved or field.attname in saved)
+            )
+
+    def fields_changed(self, fields, update_fields=None):
+        """
+        Whether a save (in its post_save signal) changed one of the columns.
+        New jobs, or ones built by hand rather than loaded, count as changed.
+        """
+        fields = set(fields)
+        if update_fields is not None:
+            fields &= set(update_fields)
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            return bool(fields)
+
+        # A deferred column assigned after loading has nothing to compare with
+        return any(
+            field not in loaded or loaded[field] != getattr(self, field)
+            for field in fields
+            if field in self.__dict__
+        )
+
     def __str__(self):
         return self.title
+
+
+class JobVector(models.Model):
+    """
+    Hashed, L2-normalized feature vector of a job (see apps.jobs.similarity),
+    packed as little-endian uint32 indices followed by float32 values
+    """
+
+    job = models.OneToOneField(
+        Job, on_delete=models.CASCADE, primary_key=True, related_name="vector"
+    )
+    vector = models.BinaryField()
+
+    def __str__(self):
+        return f"Vector of job {self.job_id}"
+
+
+class SimilarJob(models.Model):
+    """Precomputed nearest neighbor of a job, served by similar_jobs"""
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="neighbors")
+    similar = models.ForeignKey(
+        Job, on_delete=models.CASCADE, related_name="neighbor_of"
+    )
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job", "similar"], name="unique_similar_job"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["job", "-score"], name="similar_job_score_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} -> {self.similar_id} ({self.score:.3f})"
+
+
+class PendingJobVector(models.Model):
+    """
+    Job created or edited since its vector and neighbor lists were computed,
+    queued in the same transaction and indexed by refresh_similar_jobs
+    """
+
+    job = models.OneToOneField(
+        Job, on_delete=models.CASCADE, primary_key=True, related_name="+"
+    )
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Pending vector of job {self.job_id}"
+
+
+class PendingFeedJob(models.Model):
+    """
+    Job whose feed score columns were edited, or that was reopened, since
+    it was scored into the seeker feeds; rescored by refresh_seeker_feeds
+    """
+
+    job = models.OneToOneField(
+        Job, on_delete=models.CASCADE, primary_key=True, related_name="+"
+    )
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Pending feed scores of job {self.job_id}"
+
+
+class SeekerFeed(models.Model):
+    """
+    Feed state of one job seeker (see apps.jobs.feed): the profile features
+    the feed was scored with and the watermark of jobs already considered
+    """
+
+    seeker = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="feed"
+    )
+    # Skill words, experience years and category/job type shares of past
+    # applications, as scored by the last build
+    features = models.JSONField(default=dict)
+    # Jobs up to this id were scored for this seeker
+    last_job_id = models.BigIntegerField(default=0)
+    # Score a new job must beat to enter a full feed (-1 while not full)
+    threshold = models.FloatField(default=-1.0)
+    # Bumped when the profile or the applications change; the worker
+    # rebuilds feeds whose version is past the one they were built from
+    version = models.PositiveIntegerField(default=0)
+    built_version = models.PositiveIntegerField(default=0)
+    built_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["seeker"],
+                name="seeker_feed_outdated_idx",
+                condition=models.Q(version__gt=models.F("built_version")),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Feed of {self.seeker_id}"
+
+
+class SeekerFeedEntry(models.Model):
+    """Precomputed job of a seeker's personalized feed, served by jobs/feed"""
+
+    seeker = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="feed_entries"
+    )
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="feed_entries")
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["seeker", "job"], name="unique_seeker_feed_job"
+            )
+        ]
+        indexes = [
+            # Feed pages: (-score, -id) is the keyset order
+            models.Index(
+                fields=["seeker", "-score", "-id"], name="seeker_feed_score_idx"
+            ),
+        ]
+        verbose_name_plural = "Seeker Feed Entries"
+
+    def __str__(self):
+        return f"{self.seeker_id} -> {self.job_id} ({self.score:.3f})"
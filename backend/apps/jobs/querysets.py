@@ -0,0 +1,68 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class JobQuerySet(models.QuerySet):
+    """
+    Queryset profiles shaped after the job serializers.
+    Each profile joins the relations a serializer reads and loads only the
+    columns it renders, so a page of jobs costs a constant number of queries.
+    """
+
+    LIST_FIELDS = (
+        "id",
+        "title",
+        "company_name",
+        "company_logo",
+        "location",
+        "job_type",
+        "category",
+        "salary",
+        "created_at",
+        "updated_at",
+        "recruiter__full_name",
+    )
+
+    @staticmethod
+    def open_condition(prefix=""):
+        """Q for jobs still taking applications, through an optional relation"""
+        return Q(**{f"{prefix}application_deadline__isnull": True}) | Q(
+            **{f"{prefix}application_deadline__gt": timezone.now()}
+        )
+
+    def open(self):
+        """Jobs still taking applications (no deadline or a future one)"""
+        return self.filter(self.open_condition())
+
+    def for_list(self):
+        """Profile for JobListSerializer (no description/requirements text)"""
+        return self.select_related("recruiter").only(*self.LIST_FIELDS)
+
+    def for_detail(self):
+        """Profile for JobDetailSerializer (full job row, recruiter name/email)"""
+        return self.select_related("recruiter").defer(
+            "recruiter__password",
+            "recruiter__last_login",
+        )
+
+
+class QuerysetProfileMixin:
+    """
+    Apply a queryset profile per viewset action.
+
+    Viewsets declare ``queryset_profiles`` mapping an action name to the name of
+    a queryset method, e.g. ``{"list": "for_list", "retrieve": "for_detail"}``.
+    Actions without a profile get the plain queryset.
+    """
+
+    queryset_profiles: dict[str, str] = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        profile = self.queryset_profiles.get(getattr(self, "action", None) or "")
+
+        if profile:
+            queryset = getattr(queryset, profile)()
+
+        return queryset
@@ -0,0 +1,89 @@
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+SEARCH_CONFIG = "english"
+
+# Columns that make up the search document, with their weights
+SEARCH_WEIGHTS = {
+    "title": "A",
+    "company_name": "B",
+    "description": "C",
+}
+
+
+def search_enabled():
+    """Full-text search needs PostgreSQL; other backends fall back to icontains"""
+    return connection.vendor == "postgresql"
+
+
+def job_search_vector():
+    """Weighted search vector expression for Job rows"""
+    vector = None
+    for field, weight in SEARCH_WEIGHTS.items():
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vectors(queryset):
+    """Recompute the stored search vector for every job in the queryset"""
+    if not search_enabled():
+        return 0
+    return queryset.update(search_vector=job_search_vector())
+
+
+def build_search_query(terms):
+    """
+    Turn search terms into a prefix-matching tsquery.
+    Every word must match, and each word also matches longer words
+    ("dev" finds "developer"), mirroring the old icontains behaviour.
+    """
+    # Quoted words go through the same parser as the documents, so tokens
+    # like "UX/UI" or "node.js" stay whole instead of being split on \W
+    words = [
+        word.replace("\\", "\\\\").replace("'", "''")
+        for term in terms
+        for word in term.split()
+        if re.search(r"\w", word)
+    ]
+    if not words:
+        return None
+
+    raw = " & ".join(f"'{word}':*" for word in words)
+    return SearchQuery(raw, search_type="raw", config=SEARCH_CONFIG)
+
+
+class JobSearchFilter(SearchFilter):
+    """
+    Ranked full-text search over Job.search_vector (GIN indexed).
+    Falls back to DRF's icontains search on non-PostgreSQL databases.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not search_enabled():
+            return super().filter_queryset(request, queryset, view)
+
+        search_query = build_search_query(self.get_search_terms(request))
+        if search_query is None:
+            return queryset
+
+        return queryset.filter(search_vector=search_query).annotate(
+            search_rank=SearchRank(F("search_vector"), search_query)
+        )
+
+
+class JobOrderingFilter(OrderingFilter):
+    """Order search results by rank unless the client asked for an ordering"""
+
+    def get_default_ordering(self, view):
+        ordering = super().get_default_ordering(view)
+        if getattr(self, "_ranked", False):
+            return ("-search_rank",) + tuple(ordering or ())
+        return ordering
+
+    def filter_queryset(self, request, queryset, view):
+        self._ranked = "search_rank" in queryset.query.annotations
+        return super().filter_queryset(request, queryset, view)
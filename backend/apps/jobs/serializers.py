@@ -1,6 +1,7 @@
+from django.conf import settings
 from rest_framework import serializers
 from apps.core.validators import validate_file_size
-from apps.jobs.models import Job
+from apps.jobs.models import Job, SeekerFeedEntry
 
 
 class JobListSerializer(serializers.ModelSerializer):
@@ -26,6 +27,16 @@ class JobListSerializer(serializers.ModelSerializer):
         read_only_fields = ("company_logo", "created_at", "updated_at")
 
 
+class SeekerFeedEntrySerializer(serializers.ModelSerializer):
+    """Feed item: a job and how well it matches the seeker (0-1)"""
+
+    job = JobListSerializer(read_only=True)
+
+    class Meta:
+        model = SeekerFeedEntry
+        fields = ("score", "job")
+
+
 class JobDetailSerializer(serializers.ModelSerializer):
     """Serializer for job detail view (full details)"""
 
@@ -111,3 +122,27 @@ class JobCreateUpdateSerializer(serializers.ModelSerializer):
             )
 
         return value
+
+
+class JobImportSerializer(JobCreateUpdateSerializer):
+    """Validation rules for one bulk-imported job (no logo upload)"""
+
+    class Meta(JobCreateUpdateSerializer.Meta):
+        fields = tuple(
+            field
+            for field in JobCreateUpdateSerializer.Meta.fields
+            if field != "company_logo"
+        )
+
+
+class JobBulkImportSerializer(serializers.Serializer):
+    """Request body of bulk_import; each row is validated by JobImportServices"""
+
+    jobs = serializers.ListField(child=serializers.JSONField(), allow_empty=False)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate_jobs(self, value):
+        max_rows = settings.JOB_IMPORT_MAX_ROWS
+        if len(value) > max_rows:
+            raise serializers.ValidationError(f"At most {max_rows} jobs per request")
+        return value
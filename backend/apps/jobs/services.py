@@ -0,0 +1,117 @@
+from itertools import islice
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from apps.jobs.cache import JobCache
+from apps.jobs.models import Job
+from apps.jobs.search import update_search_vectors
+from apps.jobs.similarity import queue_jobs
+from apps.jobs.serializers import JobImportSerializer
+
+
+def chunked(iterable, size):
+    """Yield lists of at most size items"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class JobImportServices:
+    """
+    Bulk job import (the bulk_import action and the import_jobs command).
+
+    Rows are validated with the JobCreateUpdateSerializer rules through one
+    serializer instance, so fields are bound once instead of per row, and
+    inserted with bulk_create. Post-save signals don't run for bulk inserts,
+    so search vectors are filled and similar_jobs indexing is queued per
+    chunk, and the job cache is invalidated once per import.
+    """
+
+    @staticmethod
+    def clean_row(row):
+        """Strip text values and drop empty ones so model defaults apply"""
+        cleaned = {}
+        for field, value in row.items():
+            if field is None:
+                continue
+            if isinstance(value, str):
+                value = value.strip()
+            if value not in ("", None):
+                cleaned[field.strip()] = value
+        return cleaned
+
+    @staticmethod
+    def validate(rows):
+        """
+        Validate (row_number, row) pairs.
+
+        Returns:
+            tuple: validated data list and a list of {"row", "errors"} dicts
+        """
+        serializer = JobImportSerializer()
+        valid, errors = [], []
+
+        for row_number, row in rows:
+            if not isinstance(row, dict):
+                errors.append(
+                    {
+                        "row": row_number,
+                        "errors": {"non_field_errors": ["Expected an object"]},
+                    }
+                )
+                continue
+            try:
+                valid.append(
+                    serializer.run_validation(JobImportServices.clean_row(row))
+                )
+            except ValidationError as e:
+                errors.append({"row": row_number, "errors": e.detail})
+
+        return valid, errors
+
+    @staticmethod
+    def insert(recruiter, validated_rows, batch_size=None):
+        """Insert validated rows for the recruiter; returns the new jobs"""
+        batch_size = batch_size or settings.JOB_IMPORT_BATCH_SIZE
+        jobs = []
+
+        with transaction.atomic():
+            for chunk in chunked(validated_rows, batch_size):
+                created = Job.objects.bulk_create(
+                    [Job(recruiter=recruiter, **data) for data in chunk]
+                )
+                update_search_vectors(
+                    Job.objects.filter(pk__in=[job.pk for job in created])
+                )
+                queue_jobs([job.pk for job in created])
+                jobs.extend(created)
+
+            if jobs:
+                transaction.on_commit(JobCache.invalidate)
+
+        return jobs
+
+    @staticmethod
+    def import_rows(recruiter, rows, dry_run=False, batch_size=None):
+        """
+        Validate and insert (row_number, row) pairs. Valid rows are imported
+        even if others fail; nothing is written with dry_run.
+
+        Returns:
+            dict: created/failed counts, new job ids and per-row errors
+        """
+        valid, errors = JobImportServices.validate(rows)
+        jobs = (
+            []
+            if dry_run
+            else JobImportServices.insert(recruiter, valid, batch_size=batch_size)
+        )
+
+        return {
+            "created": 0 if dry_run else len(jobs),
+            "valid": len(valid),
+            "failed": len(errors),
+            "ids": [job.pk for job in jobs],
+            "errors": errors,
+        }
@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.applications.models import Application
+from apps.authentication.models import UserProfile
+from apps.jobs import feed
+from apps.jobs.cache import JobCache
+from apps.jobs.models import Job, SeekerFeedEntry
+from apps.jobs.search import SEARCH_WEIGHTS, update_search_vectors
+from apps.jobs.similarity import VECTOR_FIELDS, queue_jobs
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Job)
+def refresh_job_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    """Keep the stored search vector in sync when searchable columns change"""
+    if update_fields is not None and not set(update_fields) & set(SEARCH_WEIGHTS):
+        return
+
+    update_search_vectors(Job.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Job)
+def refresh_similar_jobs(sender, instance, created, update_fields=None, **kwargs):
+    """Queue new or edited jobs for the similar_jobs neighbor lists"""
+    if not created and not instance.fields_changed(
+        set(VECTOR_FIELDS) - {"id"}, update_fields
+    ):
+        return
+
+    queue_jobs([instance.pk])
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_cache(sender, instance, **kwargs):
+    """Drop cached job responses once the write is committed"""
+    transaction.on_commit(JobCache.invalidate)
+
+
+# User columns copied into job responses
+RECRUITER_FIELDS = {"full_name", "email"}
+
+
+@receiver(post_save, sender=User)
+def invalidate_job_cache_for_recruiter(sender, instance, update_fields=None, **kwargs):
+    """Job responses embed the recruiter's name and email"""
+    if instance.role != "recruiter":
+        return
+    if update_fields is not None and not RECRUITER_FIELDS & set(update_fields):
+        return
+
+    transaction.on_commit(JobCache.invalidate)
+
+
+@receiver(post_save, sender=UserProfile)
+def refresh_seeker_feed_on_profile(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    """The feed is scored on skills and experience"""
+    if created:
+        return
+    if update_fields is not None and not {"skills", "experience"} & set(update_fields):
+        return
+
+    feed.mark_stale([instance.user_id])
+
+
+@receiver(post_save, sender=Application)
+def refresh_seeker_feed_on_apply(sender, instance, created, raw=False, **kwargs):
+    """Applied jobs leave the feed; category/job type shares have moved"""
+    if raw or not created:
+        return
+
+    SeekerFeedEntry.objects.filter(
+        seeker_id=instance.applicant_id, job_id=instance.job_id
+    ).delete()
+    feed.mark_stale([instance.applicant_id])
+
+
+@receiver(post_delete, sender=Application)
+def refresh_seeker_feed_on_withdraw(sender, instance, origin=None, **kwargs):
+    """Category/job type shares have moved back"""
+    # Cascades: the seeker's feed goes with them, a job marks its applicants
+    if isinstance(origin, (Job, User)):
+        return
+
+    feed.mark_stale([instance.applicant_id])
+
+
+@receiver(pre_delete, sender=Job)
+def refresh_seeker_feeds_on_job_delete(sender, instance, **kwargs):
+    """The job's applications cascade with it, moving its applicants' shares"""
+    feed.mark_stale(Application.objects.filter(job=instance).values("applicant_id"))
+
+
+# Job columns feed scores are computed from, and the deadline that reopens it
+FEED_JOB_FIELDS = (set(feed.JOB_FIELDS) - {"id"}) | {"application_deadline"}
+
+
+@receiver(post_save, sender=Job)
+def rescore_feed_job(sender, instance, created, update_fields=None, **kwargs):
+    """Queue edited or reopened jobs; new ones are merged by their id"""
+    if created or not instance.fields_changed(FEED_JOB_FIELDS, update_fields):
+        return
+
+    feed.queue_jobs([instance.pk])
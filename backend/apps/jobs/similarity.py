@@ -0,0 +1,439 @@
+import math
+import re
+import zlib
+from collections import Counter, defaultdict
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+
+from apps.jobs.cache import JobCache
+from apps.jobs.models import Job, JobVector, PendingJobVector, SimilarJob
+
+# Weight of each part of a job in its vector. Title and requirement words
+# share one space, so "python" in a title matches "python" in requirements.
+FEATURE_WEIGHTS = {
+    "title": 3.0,
+    "requirements": 1.0,
+    "location": 2.0,
+    "job_type": 1.5,
+    "salary": 1.5,
+}
+
+# Upper bounds of the salary bands; jobs in the same band share a feature
+SALARY_BANDS = (30000, 50000, 75000, 100000, 150000, 200000)
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from have in is it of on or our the to we "
+    "will with you your".split()
+)
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Columns read to vectorize a job
+VECTOR_FIELDS = (
+    "id",
+    "category",
+    "title",
+    "requirements",
+    "location",
+    "job_type",
+    "salary",
+)
+
+# Side of the score blocks computed at once by rebuild()
+BLOCK_SIZE = 256
+
+# Neighbor rows per INSERT statement
+INSERT_BATCH_SIZE = 50000
+
+# When a job is indexed incrementally, this many of its closest jobs also
+# get it merged into their own neighbor lists
+REVERSE_CANDIDATES = 200
+
+# Queued jobs indexed per transaction by index_pending()
+PENDING_BATCH_SIZE = 500
+
+
+def words(text):
+    return [w for w in TOKEN_RE.findall((text or "").lower()) if w not in STOP_WORDS]
+
+
+def salary_band(salary):
+    if salary is None:
+        return None
+    for band, upper in enumerate(SALARY_BANDS):
+        if salary < upper:
+            return band
+    return len(SALARY_BANDS)
+
+
+def job_features(job):
+    """Weighted features of a job: text words with log-scaled counts"""
+    features = defaultdict(float)
+
+    for field in ("title", "requirements"):
+        for word, count in Counter(words(getattr(job, field))).items():
+            features[word] += FEATURE_WEIGHTS[field] * (1 + math.log(count))
+
+    # "New York, NY" and "New York" share the "loc:new" and "loc:york" features
+    for word in set(words(job.location)):
+        features[f"loc:{word}"] += FEATURE_WEIGHTS["location"]
+
+    features[f"type:{job.job_type}"] += FEATURE_WEIGHTS["job_type"]
+
+    band = salary_band(job.salary)
+    if band is not None:
+        features[f"salary:{band}"] += FEATURE_WEIGHTS["salary"]
+
+    return features
+
+
+def vectorize(job):
+    """
+    Signed feature hashing into SIMILAR_JOBS_FEATURES dimensions.
+
+    Returns:
+        tuple: uint32 indices and L2-normalized float32 values
+    """
+    size = settings.SIMILAR_JOBS_FEATURES
+    vector = defaultdict(float)
+    for feature, weight in job_features(job).items():
+        digest = zlib.crc32(feature.encode("utf-8"))
+        vector[digest % size] += weight if digest & 0x80000000 else -weight
+
+    indices = np.fromiter(vector.keys(), dtype=np.uint32, count=len(vector))
+    values = np.fromiter(vector.values(), dtype=np.float32, count=len(vector))
+    norm = np.linalg.norm(values)
+    if norm:
+        values /= norm
+    return indices, values
+
+
+def pack(indices, values):
+    return indices.astype("<u4").tobytes() + values.astype("<f4").tobytes()
+
+
+def unpack(data):
+    count = len(data) // 8
+    return (
+        np.frombuffer(data, dtype="<u4", count=count),
+        np.frombuffer(data, dtype="<f4", count=count, offset=4 * count),
+    )
+
+
+def dense(vectors):
+    """Stack (indices, values) vectors into a dense float32 matrix"""
+    matrix = np.zeros((len(vectors), settings.SIMILAR_JOBS_FEATURES), np.float32)
+    if vectors:
+        lengths = [len(indices) for indices, _ in vectors]
+        rows = np.repeat(np.arange(len(vectors)), lengths)
+        matrix[rows, np.concatenate([i for i, _ in vectors])] = np.concatenate(
+            [v for _, v in vectors]
+        )
+    return matrix
+
+
+def top_k(scores, k):
+    """Column positions of the k highest positive scores, best first"""
+    positive = np.flatnonzero(scores > 0)
+    if len(positive) > k:
+        positive = positive[np.argpartition(scores[positive], -k)[-k:]]
+    return positive[np.argsort(-scores[positive], kind="stable")]
+
+
+def store_vectors(jobs, vectors):
+    JobVector.objects.bulk_create(
+        [
+            JobVector(job_id=job.pk, vector=pack(*vector))
+            for job, vector in zip(jobs, vectors)
+        ],
+        update_conflicts=True,
+        unique_fields=["job"],
+        update_fields=["vector"],
+        batch_size=1000,
+    )
+
+
+def block_top_k(scores, k):
+    """
+    Per row of a score block, the columns of the k highest scores, best first.
+
+    Returns:
+        tuple: (rows, k) column and score arrays
+    """
+    k = min(k, scores.shape[1])
+    if not k:
+        return np.empty((len(scores), 0), np.int64), np.empty((len(scores), 0))
+    columns = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top = np.take_along_axis(scores, columns, axis=1)
+    order = np.argsort(-top, axis=1, kind="stable")
+    return (
+        np.take_along_axis(columns, order, axis=1),
+        np.take_along_axis(top, order, axis=1),
+    )
+
+
+def insert_neighbors(job_ids, similar_ids, scores):
+    """
+    Write neighbor rows from parallel arrays. On PostgreSQL the arrays go
+    through unnest() in a few statements instead of one model per row.
+    """
+    if connection.vendor != "postgresql":
+        SimilarJob.objects.bulk_create(
+            [
+                SimilarJob(job_id=job_id, similar_id=similar_id, score=score)
+                for job_id, similar_id, score in zip(
+                    job_ids.tolist(), similar_ids.tolist(), scores.tolist()
+                )
+            ],
+            batch_size=5000,
+        )
+        return
+
+    table = SimilarJob._meta.db_table
+    with connection.cursor() as cursor:
+        for start in range(0, len(job_ids), INSERT_BATCH_SIZE):
+            stop = start + INSERT_BATCH_SIZE
+            cursor.execute(
+                f"INSERT INTO {table} (job_id, similar_id, score) "
+                "SELECT * FROM unnest(%s::bigint[], %s::bigint[], %s::float8[])",
+                [
+                    job_ids[start:stop].tolist(),
+                    similar_ids[start:stop].tolist(),
+                    scores[start:stop].tolist(),
+                ],
+            )
+
+
+def merge_top_k(columns, top, scores, offset, k):
+    """
+    Merge a block of scores, whose first column is at offset, into running
+    per-row top k column positions and scores.
+
+    Returns:
+        tuple: the new (rows, k) column and score arrays
+    """
+    width = scores.shape[1]
+    candidates = np.concatenate(
+        (
+            columns,
+            np.broadcast_to(np.arange(offset, offset + width), (len(scores), width)),
+        ),
+        axis=1,
+    )
+    picked, top = block_top_k(np.concatenate((top, scores), axis=1), k)
+    return np.take_along_axis(candidates, picked, axis=1), top
+
+
+def block_neighbors(vectors, start, k):
+    """
+    Top k neighbors of the BLOCK_SIZE jobs from start, scored against every
+    job one BLOCK_SIZE square at a time and merged into a running top k, so
+    memory stays at a few BLOCK_SIZE-row blocks whatever the category size.
+
+    Returns:
+        tuple: (rows, k) column positions and score arrays
+    """
+    rows = dense(vectors[start : start + BLOCK_SIZE])
+    columns = np.empty((len(rows), 0), np.int64)
+    top = np.empty((len(rows), 0), np.float32)
+
+    for column_start in range(0, len(vectors), BLOCK_SIZE):
+        block_scores = rows @ dense(vectors[column_start : column_start + BLOCK_SIZE]).T
+        if column_start == start:
+            np.fill_diagonal(block_scores, 0)  # not its own neighbor
+        columns, top = merge_top_k(columns, top, block_scores, column_start, k)
+
+    return columns, top
+
+
+def rebuild(categories=None):
+    """
+    Recompute every job's vector and neighbor list, one category (and one
+    transaction) at a time. Scores are computed in BLOCK_SIZE squares (see
+    block_neighbors), never as a dense matrix over the whole category.
+    Neighbors are jobs of the same category.
+
+    Returns:
+        dict: number of neighbor rows written per category
+    """
+    k = settings.SIMILAR_JOBS_NEIGHBORS
+    written = {}
+
+    for category in categories or [choice[0] for choice in Job.CATEGORY_CHOICES]:
+        jobs = list(
+            Job.objects.filter(category=category).only(*VECTOR_FIELDS).order_by("id")
+        )
+        ids = np.array([job.pk for job in jobs], dtype=np.int64)
+        vectors = [vectorize(job) for job in jobs]
+
+        job_ids, similar_ids, scores = [], [], []
+        for start in range(0, len(jobs), BLOCK_SIZE):
+            columns, top = block_neighbors(vectors, start, k)
+            keep = top > 0
+            job_ids.append(np.repeat(ids[start : start + len(top)], keep.sum(1)))
+            similar_ids.append(ids[columns[keep]])
+            scores.append(top[keep])
+
+        with transaction.atomic():
+            SimilarJob.objects.filter(job__category=category).delete()
+            PendingJobVector.objects.filter(job__category=category).delete()
+            store_vectors(jobs, vectors)
+            if jobs:
+                insert_neighbors(
+                    np.concatenate(job_ids),
+                    np.concatenate(similar_ids),
+                    np.concatenate(scores),
+                )
+        written[category] = sum(len(part) for part in job_ids)
+
+    return written
+
+
+def load_vectors(category):
+    """
+    Stored vectors of a category as flat arrays.
+
+    Returns:
+        tuple: job ids, segment offsets, indices and values
+    """
+    rows = [
+        (job_id, unpack(bytes(data)))
+        for job_id, data in JobVector.objects.filter(
+            job__category=category
+        ).values_list("job_id", "vector")
+    ]
+    rows = [(job_id, vector) for job_id, vector in rows if len(vector[0])]
+    if not rows:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, empty, np.array([], dtype=np.float32)
+
+    lengths = np.array([len(indices) for _, (indices, _) in rows])
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    return (
+        np.array([job_id for job_id, _ in rows]),
+        offsets,
+        np.concatenate([indices for _, (indices, _) in rows]),
+        np.concatenate([values for _, (_, values) in rows]),
+    )
+
+
+def index_jobs(jobs):
+    """
+    Incremental update for new or edited jobs (Job instances with at least
+    VECTOR_FIELDS loaded): store their vectors, replace their neighbor lists
+    and merge them into the lists of their closest jobs. A handful of
+    queries per category, whatever the number of jobs.
+
+    Stale entries (a job that moved category, or scores of jobs it displaced
+    elsewhere) are corrected by the next rebuild.
+    """
+    if not jobs:
+        return
+
+    k = settings.SIMILAR_JOBS_NEIGHBORS
+    vectors = [vectorize(job) for job in jobs]
+    store_vectors(jobs, vectors)
+
+    by_category = defaultdict(list)
+    for job, vector in zip(jobs, vectors):
+        by_category[job.category].append((job.pk, vector))
+
+    for category, indexed in by_category.items():
+        ids, offsets, indices, values = load_vectors(category)
+        if not len(ids):
+            continue
+        indexed_ids = {job_id for job_id, _ in indexed}
+        others = ~np.isin(ids, list(indexed_ids))
+
+        neighbors = []
+        # (job id, neighbor id) -> score proposals for other jobs' lists
+        proposals = {}
+        for job_id, (job_indices, job_values) in indexed:
+            query = np.zeros(settings.SIMILAR_JOBS_FEATURES, np.float32)
+            query[job_indices] = job_values
+            scores = np.add.reduceat(values * query[indices], offsets)
+            scores[ids == job_id] = 0
+
+            neighbors.extend(
+                SimilarJob(
+                    job_id=job_id, similar_id=int(ids[i]), score=float(scores[i])
+                )
+                for i in top_k(scores, k)
+            )
+            for i in top_k(np.where(others, scores, 0), REVERSE_CANDIDATES):
+                proposals[(int(ids[i]), job_id)] = float(scores[i])
+
+        SimilarJob.objects.filter(job_id__in=indexed_ids).delete()
+        SimilarJob.objects.bulk_create(neighbors)
+        merge_neighbors(proposals, indexed_ids, k)
+
+
+def merge_neighbors(proposals, indexed_ids, k):
+    """
+    Add proposed (job, neighbor) pairs that make it into the job's top k,
+    evicting the entries they push out
+    """
+    if not proposals:
+        return
+
+    job_ids = {job_id for job_id, _ in proposals}
+    # Earlier scores of the re-indexed jobs are replaced by the proposals
+    SimilarJob.objects.filter(job_id__in=job_ids, similar_id__in=indexed_ids).delete()
+
+    lists = defaultdict(list)
+    for pk, job_id, similar_id, score in SimilarJob.objects.filter(
+        job_id__in=job_ids
+    ).values_list("pk", "job_id", "similar_id", "score"):
+        lists[job_id].append((score, pk, similar_id))
+    for (job_id, similar_id), score in proposals.items():
+        lists[job_id].append((score, None, similar_id))
+
+    added, evicted = [], []
+    for job_id, entries in lists.items():
+        entries.sort(key=lambda entry: -entry[0])
+        added.extend(
+            SimilarJob(job_id=job_id, similar_id=similar_id, score=score)
+            for score, pk, similar_id in entries[:k]
+            if pk is None
+        )
+        evicted.extend(pk for _, pk, _ in entries[k:] if pk is not None)
+
+    SimilarJob.objects.filter(pk__in=evicted).delete()
+    SimilarJob.objects.bulk_create(added)
+
+
+def queue_jobs(job_ids):
+    """
+    Queue jobs for index_jobs in the caller's transaction, so a job is
+    queued only if its change commits. Already queued jobs are skipped.
+    """
+    PendingJobVector.objects.bulk_create(
+        [PendingJobVector(job_id=job_id) for job_id in job_ids],
+        ignore_conflicts=True,
+    )
+
+
+def index_pending(batch_size=PENDING_BATCH_SIZE):
+    """
+    Index one batch of queued jobs and dequeue them in the same transaction.
+    Rows are locked with SKIP LOCKED so several workers can run in parallel.
+    Cached similar_jobs responses go stale once the batch is committed.
+
+    Returns:
+        int: number of jobs indexed
+    """
+    with transaction.atomic():
+        job_ids = list(
+            PendingJobVector.objects.select_for_update(skip_locked=True)
+            .order_by("queued_at", "job_id")
+            .values_list("job_id", flat=True)[:batch_size]
+        )
+        if not job_ids:
+            return 0
+
+        index_jobs(list(Job.objects.filter(pk__in=job_ids).only(*VECTOR_FIELDS)))
+        PendingJobVector.objects.filter(job_id__in=job_ids).delete()
+        transaction.on_commit(JobCache.invalidate)
+
+    return len(job_ids)
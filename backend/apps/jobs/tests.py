@@ -1,3 +1,1039 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.applications.models import Application
+from apps.authentication.models import User, UserProfile
+from apps.jobs import facets, feed, search, similarity
+from apps.jobs.cache import JobCache
+from apps.jobs.checks import check_job_cache_is_shared
+from apps.jobs.filters import JobFilter
+from apps.jobs.services import JobImportServices
+from apps.jobs.models import (
+    Job,
+    JobVector,
+    PendingFeedJob,
+    PendingJobVector,
+    SeekerFeed,
+    SeekerFeedEntry,
+    SimilarJob,
+)
+
+
+def make_recruiter(email="recruiter@example.com"):
+    return User.objects.create_user(
+        email=email, password="pass12345", full_name="Recruiter", role="recruiter"
+    )
+
+
+def make_seeker(email="seeker@example.com"):
+    return User.objects.create_user(
+        email=email, password="pass12345", full_name="Seeker", role="seeker"
+    )
+
+
+def make_job(recruiter, **fields):
+    values = {
+        "category": "it",
+        "title": "Backend developer",
+        "description": "Build APIs",
+        "requirements": "python django",
+        "location": "Dhaka",
+        "job_type": "full_time",
+        "company_name": "Acme",
+        "salary": 50000,
+    }
+    values.update(fields)
+    return Job.objects.create(recruiter=recruiter, **values)
+
+
+def encode_cursor(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode("ascii")).decode("ascii")
+
+
+def walk(client, url):
+    """Ids of every page reached by following the next links"""
+    ids = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, response.data
+        ids.extend(item["id"] for item in response.data["results"])
+        url = response.data["next"]
+    return ids
+
+
+class JobQuerysetProfileTests(TestCase):
+    """Job pages cost the same number of queries whatever their size"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.recruiters = [
+            make_recruiter(f"recruiter{index}@example.com") for index in range(3)
+        ]
+        for index in range(12):
+            make_job(self.recruiters[index % 3], title=f"Job {index}")
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.data)
+        return len(queries), response
+
+    def test_list_queries_do_not_grow_with_the_page(self):
+        small, _ = self.count_queries("/api/jobs/?page_size=2")
+        large, response = self.count_queries("/api/jobs/?page_size=12")
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.data["results"]), 12)
+        self.assertEqual(response.data["results"][0]["recruiter_name"], "Recruiter")
+
+    def test_my_jobs_queries_do_not_grow_with_the_page(self):
+        recruiter = self.recruiters[0]
+        for index in range(6):
+            make_job(recruiter, title=f"Extra {index}")
+        self.client.force_authenticate(recruiter)
+
+        small, _ = self.count_queries("/api/jobs/my_jobs/?page_size=2")
+        large, _ = self.count_queries("/api/jobs/my_jobs/?page_size=10")
+        self.assertEqual(small, large)
+
+    def test_similar_jobs_is_two_queries(self):
+        similarity.index_pending()
+        job = Job.objects.first()
+        count, response = self.count_queries(f"/api/jobs/{job.pk}/similar_jobs/")
+
+        self.assertEqual(count, 2)
+        self.assertEqual(len(response.data), 5)
+
+    def test_detail_is_one_query(self):
+        job = Job.objects.first()
+        count, response = self.count_queries(f"/api/jobs/{job.pk}/")
+
+        self.assertEqual(count, 1)
+        self.assertEqual(response.data["description"], job.description)
+
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+FILE_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": "/tmp/jobly-test-cache",
+    }
+}
+
+
+class JobCacheCheckTests(TestCase):
+    @override_settings(CACHES=LOCMEM, JOB_CACHE_TIMEOUT=60)
+    def test_process_local_cache_is_rejected(self):
+        errors = check_job_cache_is_shared(None)
+        self.assertEqual([error.id for error in errors], ["jobs.E001"])
+
+    @override_settings(CACHES=LOCMEM, JOB_CACHE_TIMEOUT=0)
+    def test_disabled_job_cache_needs_nothing(self):
+        self.assertEqual(check_job_cache_is_shared(None), [])
+
+    @override_settings(CACHES=FILE_CACHE, JOB_CACHE_TIMEOUT=60)
+    def test_shared_cache_is_accepted(self):
+        self.assertEqual(check_job_cache_is_shared(None), [])
+
+
+@override_settings(JOB_CACHE_TIMEOUT=60)
+class JobCacheInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter)
+
+    def names(self):
+        response = self.client.get("/api/jobs/")
+        return [item["recruiter_name"] for item in response.data["results"]]
+
+    def test_list_is_served_from_the_cache(self):
+        self.client.get("/api/jobs/")
+        with self.assertNumQueries(0):
+            self.client.get("/api/jobs/")
+
+    def test_job_write_invalidates(self):
+        self.client.get("/api/jobs/")
+        with self.captureOnCommitCallbacks(execute=True):
+            make_job(self.recruiter, title="Second job")
+
+        self.assertEqual(len(self.client.get("/api/jobs/").data["results"]), 2)
+
+    def test_recruiter_rename_invalidates(self):
+        self.assertEqual(self.names(), ["Recruiter"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recruiter.full_name = "Renamed"
+            self.recruiter.save(update_fields=["full_name"])
+
+        self.assertEqual(self.names(), ["Renamed"])
+
+    def test_unrelated_user_saves_keep_the_cache(self):
+        version = JobCache.version()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.recruiter.last_login = timezone.now()
+            self.recruiter.save(update_fields=["last_login"])
+            make_seeker().save()
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(JobCache.version(), version)
+
+    def test_indexing_similar_jobs_invalidates(self):
+        url = f"/api/jobs/{self.job.pk}/similar_jobs/"
+        similarity.index_pending()
+        self.assertEqual(self.client.get(url).data, [])
+
+        other = make_job(self.recruiter, title="Backend engineer")
+        with self.captureOnCommitCallbacks(execute=True):
+            similarity.index_pending()
+
+        self.assertEqual([item["id"] for item in self.client.get(url).data], [other.pk])
+
+
+class JobSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        recruiter = make_recruiter()
+        self.in_title = make_job(
+            recruiter, title="Django developer", description="Build services"
+        )
+        self.in_description = make_job(
+            recruiter, title="Engineer", description="Maintain django apps"
+        )
+        self.other = make_job(
+            recruiter, title="Nurse", description="Patient care", company_name="Clinic"
+        )
+
+    def find(self, terms, ordering=""):
+        response = self.client.get(f"/api/jobs/?search={terms}{ordering}")
+        self.assertEqual(response.status_code, 200, response.data)
+        return [item["id"] for item in response.data["results"]]
+
+    def test_search_filters_out_other_jobs(self):
+        self.assertCountEqual(
+            self.find("django"), [self.in_title.pk, self.in_description.pk]
+        )
+        self.assertEqual(self.find("clinic"), [self.other.pk])
+        self.assertEqual(self.find("django nurse"), [])
+
+    @skipUnless(connection.vendor == "postgresql", "search rank needs PostgreSQL")
+    def test_title_matches_rank_first(self):
+        # Created last, so it would lead by -created_at without ranking
+        self.assertEqual(
+            self.find("django"), [self.in_title.pk, self.in_description.pk]
+        )
+
+    @skipUnless(connection.vendor == "postgresql", "search rank needs PostgreSQL")
+    def test_prefix_words_match(self):
+        self.assertEqual(self.find("dev"), [self.in_title.pk])
+
+    @skipUnless(connection.vendor == "postgresql", "search rank needs PostgreSQL")
+    def test_explicit_ordering_wins_over_rank(self):
+        self.assertEqual(
+            self.find("django", "&ordering=-created_at"),
+            [self.in_description.pk, self.in_title.pk],
+        )
+
+    @mock.patch.object(search, "search_enabled", return_value=False)
+    def test_fallback_matches_substrings(self, search_enabled):
+        self.assertEqual(self.find("jang"), [self.in_description.pk, self.in_title.pk])
+
+
+class JobCursorPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        recruiter = make_recruiter()
+        for index in range(7):
+            make_job(recruiter, title=f"Job {index}")
+        self.expected = list(
+            Job.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def test_next_links_walk_every_job_once(self):
+        ids = walk(self.client, "/api/jobs/?pagination=cursor&page_size=3")
+        self.assertEqual(ids, self.expected)
+
+    def test_previous_link_returns_the_earlier_page(self):
+        first = self.client.get("/api/jobs/?pagination=cursor&page_size=3")
+        second = self.client.get(first.data["next"])
+        self.assertIsNone(first.data["previous"])
+
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(
+            [item["id"] for item in back.data["results"]],
+            [item["id"] for item in first.data["results"]],
+        )
+
+    def test_count_only_on_request(self):
+        response = self.client.get("/api/jobs/?pagination=cursor")
+        self.assertNotIn("count", response.data)
+
+        response = self.client.get("/api/jobs/?pagination=cursor&include_count=true")
+        self.assertEqual(response.data["count"], 7)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get("/api/jobs/?cursor=garbage")
+        self.assertEqual(response.status_code, 404)
+
+    def test_wrongly_typed_cursor_is_not_found(self):
+        for data in (
+            {"v": "not-a-date", "id": 1},
+            {"v": "2026-01-01T00:00:00+00:00", "id": "abc"},
+        ):
+            response = self.client.get(f"/api/jobs/?cursor={encode_cursor(data)}")
+            self.assertEqual(response.status_code, 404, data)
+
+    def test_cursor_with_other_ordering_is_rejected(self):
+        response = self.client.get("/api/jobs/?pagination=cursor&ordering=salary")
+        self.assertEqual(response.status_code, 400)
+
+    @skipUnless(connection.vendor == "postgresql", "search rank needs PostgreSQL")
+    def test_cursor_with_search_rank_is_rejected(self):
+        response = self.client.get("/api/jobs/?pagination=cursor&search=backend")
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_with_default_ordering_is_accepted(self):
+        response = self.client.get(
+            "/api/jobs/?pagination=cursor&ordering=-created_at&page_size=3"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]], self.expected[:3]
+        )
+
+
+@override_settings(SIMILAR_JOBS_NEIGHBORS=2)
+class NeighborMergeTests(TestCase):
+    def setUp(self):
+        recruiter = make_recruiter()
+        self.a, self.b, self.c, self.d = (
+            make_job(recruiter, title=f"Job {name}") for name in "abcd"
+        )
+        SimilarJob.objects.bulk_create(
+            [
+                SimilarJob(job=self.a, similar=self.b, score=0.9),
+                SimilarJob(job=self.a, similar=self.c, score=0.5),
+            ]
+        )
+
+    def neighbors(self, job):
+        return list(
+            SimilarJob.objects.filter(job=job)
+            .order_by("-score")
+            .values_list("similar_id", "score")
+        )
+
+    def test_better_proposal_evicts_the_weakest(self):
+        similarity.merge_neighbors({(self.a.pk, self.d.pk): 0.7}, {self.d.pk}, 2)
+        self.assertEqual(self.neighbors(self.a), [(self.b.pk, 0.9), (self.d.pk, 0.7)])
+
+    def test_weaker_proposal_is_dropped(self):
+        similarity.merge_neighbors({(self.a.pk, self.d.pk): 0.1}, {self.d.pk}, 2)
+        self.assertEqual(self.neighbors(self.a), [(self.b.pk, 0.9), (self.c.pk, 0.5)])
+
+    def test_reindexed_job_replaces_its_old_score(self):
+        similarity.merge_neighbors({(self.a.pk, self.c.pk): 0.95}, {self.c.pk}, 2)
+        self.assertEqual(self.neighbors(self.a), [(self.c.pk, 0.95), (self.b.pk, 0.9)])
+
+    def test_reindexed_job_can_drop_out(self):
+        similarity.merge_neighbors(
+            {(self.a.pk, self.c.pk): 0.2, (self.a.pk, self.d.pk): 0.6},
+            {self.c.pk, self.d.pk},
+            2,
+        )
+        self.assertEqual(self.neighbors(self.a), [(self.b.pk, 0.9), (self.d.pk, 0.6)])
+
+
+class SimilarJobsQueueTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.python = make_job(self.recruiter, title="Python developer")
+        make_job(self.recruiter, title="Nurse", requirements="patient care")
+        similarity.index_pending()
+
+    def test_saved_jobs_are_queued_until_indexed(self):
+        job = make_job(self.recruiter, title="Senior python developer")
+        self.assertTrue(PendingJobVector.objects.filter(job=job).exists())
+        self.assertFalse(SimilarJob.objects.filter(job=job).exists())
+
+        self.assertEqual(similarity.index_pending(), 1)
+
+        self.assertFalse(PendingJobVector.objects.exists())
+        neighbors = SimilarJob.objects.filter(job=job).order_by("-score")
+        self.assertEqual(neighbors[0].similar_id, self.python.pk)
+        # Merged into the lists of its closest jobs too
+        self.assertTrue(
+            SimilarJob.objects.filter(job=self.python, similar=job).exists()
+        )
+
+    def test_save_without_vector_changes_is_not_queued(self):
+        job = Job.objects.get(pk=self.python.pk)
+        job.description = "Build and run APIs"
+        job.save()
+        job.save(update_fields=["description"])
+        self.assertFalse(PendingJobVector.objects.exists())
+
+        job.title = "Python engineer"
+        job.save()
+        self.assertTrue(PendingJobVector.objects.filter(job=job).exists())
+
+    def test_second_save_compares_with_the_saved_values(self):
+        job = Job.objects.get(pk=self.python.pk)
+        job.salary = 90000
+        job.save()
+        similarity.index_pending()
+
+        job.save()
+        self.assertFalse(PendingJobVector.objects.exists())
+
+    def test_update_fields_without_vector_columns_are_not_queued(self):
+        job = Job.objects.get(pk=self.python.pk)
+        job.title = "Python engineer"
+        job.save(update_fields=["description"])
+        self.assertFalse(PendingJobVector.objects.exists())
+
+        job.save(update_fields=["title"])
+        self.assertTrue(PendingJobVector.objects.filter(job=job).exists())
+
+    def test_deferred_vector_columns_are_compared_when_loaded(self):
+        job = Job.objects.only("id", "title").get(pk=self.python.pk)
+        job.requirements = "python django"  # unchanged, but was not loaded
+        job.save()
+        self.assertTrue(PendingJobVector.objects.filter(job=job).exists())
+
+    def test_queue_skips_already_queued_jobs(self):
+        similarity.queue_jobs([self.python.pk])
+        similarity.queue_jobs([self.python.pk])
+        self.assertEqual(PendingJobVector.objects.filter(job=self.python).count(), 1)
+
+    def test_rolled_back_save_is_not_queued(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            make_job(self.recruiter, title="Python intern")
+            raise RuntimeError
+        self.assertFalse(PendingJobVector.objects.exists())
+
+    def test_index_pending_works_through_the_queue_in_batches(self):
+        jobs = [make_job(self.recruiter, title=f"Python {n}") for n in range(3)]
+
+        with mock.patch.object(JobCache, "invalidate") as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(similarity.index_pending(batch_size=2), 2)
+            invalidate.assert_called_once_with()
+
+        self.assertEqual(
+            list(PendingJobVector.objects.values_list("job_id", flat=True)),
+            [jobs[2].pk],
+        )
+        self.assertEqual(similarity.index_pending(batch_size=2), 1)
+        self.assertEqual(similarity.index_pending(batch_size=2), 0)
+        self.assertEqual(JobVector.objects.filter(job__in=jobs).count(), len(jobs))
+
+
+@override_settings(SIMILAR_JOBS_NEIGHBORS=3)
+class SimilarJobsRebuildTests(TestCase):
+    def setUp(self):
+        recruiter = make_recruiter()
+        titles = (
+            "Python developer",
+            "Senior python developer",
+            "Python data engineer",
+            "Django developer",
+            "Frontend developer",
+            "React frontend engineer",
+            "Data analyst",
+        )
+        self.jobs = [make_job(recruiter, title=title) for title in titles]
+        self.nurse = make_job(
+            recruiter, category="healthcare", title="Nurse", requirements="care"
+        )
+
+    def neighbor_scores(self):
+        """Per job, its neighbor scores best first"""
+        lists = {}
+        for job_id, similar_id, score in SimilarJob.objects.order_by(
+            "job_id", "-score"
+        ).values_list("job_id", "similar_id", "score"):
+            self.assertNotEqual(job_id, similar_id)
+            lists.setdefault(job_id, []).append(round(score, 5))
+        return lists
+
+    def test_blocks_give_the_same_neighbors_as_one_block(self):
+        written = similarity.rebuild(["it"])
+        expected = self.neighbor_scores()
+
+        with mock.patch.object(similarity, "BLOCK_SIZE", 2):
+            self.assertEqual(similarity.rebuild(["it"]), written)
+        self.assertEqual(self.neighbor_scores(), expected)
+        self.assertEqual({len(scores) for scores in expected.values()}, {3}, expected)
+
+    def test_rebuild_matches_incremental_lists(self):
+        similarity.index_pending()
+        similarity.rebuild(["it"])
+        rebuilt = self.neighbor_scores()
+
+        SimilarJob.objects.all().delete()
+        similarity.index_jobs(
+            list(Job.objects.filter(category="it").only(*similarity.VECTOR_FIELDS))
+        )
+        self.assertEqual(self.neighbor_scores(), rebuilt)
+
+    def test_rebuild_stays_within_a_category(self):
+        similarity.rebuild()
+        self.assertFalse(SimilarJob.objects.filter(similar=self.nurse).exists())
+        self.assertFalse(PendingJobVector.objects.exists())
+        self.assertEqual(JobVector.objects.count(), len(self.jobs) + 1)
+
+
+class JobFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        recruiter = make_recruiter()
+        self.jobs = [make_job(recruiter, title=f"Job {index}") for index in range(5)]
+        self.seeker = make_seeker()
+        self.client.force_authenticate(self.seeker)
+
+    def walk_feed(self, url):
+        """(job id, score) of every page reached by following the next links"""
+        items = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.data)
+            items.extend(
+                (item["job"]["id"], item["score"]) for item in response.data["results"]
+            )
+            url = response.data["next"]
+        return items
+
+    def test_unbuilt_feed_pages_through_newest_jobs(self):
+        first = self.client.get("/api/jobs/feed/?page_size=2")
+        self.assertIn("latest_cursor=", first.data["next"])
+
+        items = self.walk_feed("/api/jobs/feed/?page_size=2")
+        newest = sorted(self.jobs, key=lambda job: (job.created_at, job.pk))[::-1]
+        self.assertEqual(items, [(job.pk, None) for job in newest])
+
+    def test_built_feed_pages_by_score(self):
+        SeekerFeed.objects.create(seeker=self.seeker, built_at=timezone.now())
+        SeekerFeedEntry.objects.bulk_create(
+            SeekerFeedEntry(seeker=self.seeker, job=job, score=0.1 * (index + 1))
+            for index, job in enumerate(self.jobs[:3])
+        )
+
+        items = self.walk_feed("/api/jobs/feed/?page_size=2")
+        self.assertEqual(
+            [job_id for job_id, _ in items], [job.pk for job in self.jobs[2::-1]]
+        )
+        self.assertAlmostEqual(items[0][1], 0.3)
+
+    def test_only_seekers_have_a_feed(self):
+        self.client.force_authenticate(make_recruiter("other@example.com"))
+        self.assertEqual(self.client.get("/api/jobs/feed/").status_code, 403)
+
+    def test_built_feed_without_entries_stays_empty(self):
+        SeekerFeed.objects.create(seeker=self.seeker, built_at=timezone.now())
+
+        response = self.client.get("/api/jobs/feed/")
+        self.assertEqual((response.data["results"], response.data["next"]), ([], None))
+
+    def test_latest_cursor_keeps_paging_newest_jobs_once_built(self):
+        first = self.client.get("/api/jobs/feed/?page_size=2")
+        SeekerFeed.objects.create(seeker=self.seeker, built_at=timezone.now())
+        SeekerFeedEntry.objects.create(seeker=self.seeker, job=self.jobs[0], score=0.9)
+
+        items = [
+            (job_id, None) for job_id in (i["job"]["id"] for i in first.data["results"])
+        ]
+        items += self.walk_feed(first.data["next"])
+        newest = sorted(self.jobs, key=lambda job: (job.created_at, job.pk))[::-1]
+        self.assertEqual(items, [(job.pk, None) for job in newest])
+
+        self.assertEqual(self.walk_feed("/api/jobs/feed/"), [(self.jobs[0].pk, 0.9)])
+
+    def test_newest_jobs_skip_closed_jobs(self):
+        closed = self.jobs[2]
+        closed.application_deadline = timezone.now() - timedelta(days=1)
+        closed.save()
+
+        items = self.walk_feed("/api/jobs/feed/?page_size=2")
+        self.assertEqual(len(items), 4)
+        self.assertNotIn(closed.pk, [job_id for job_id, _ in items])
+
+    def test_invalid_latest_cursor_is_not_found(self):
+        response = self.client.get("/api/jobs/feed/?latest_cursor=bogus")
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(SEEKER_FEED_SIZE=2)
+class SeekerFeedRefreshTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.match, self.partial, self.other, self.unrelated, self.applied = (
+            make_job(self.recruiter, title=f"Job {n}", requirements=requirements)
+            for n, requirements in enumerate(
+                (
+                    "python django sql",
+                    "python",
+                    "java spring",
+                    "nursing care",
+                    "django sql",
+                )
+            )
+        )
+        self.seeker = make_seeker()
+        self.profile = UserProfile.objects.create(
+            user=self.seeker, skills="Python, Django and SQL"
+        )
+        self.application = Application.objects.create(
+            job=self.applied, applicant=self.seeker
+        )
+        feed.refresh()
+
+    def feed_jobs(self):
+        return list(
+            SeekerFeedEntry.objects.filter(seeker=self.seeker)
+            .order_by("-score", "-id")
+            .values_list("job_id", flat=True)
+        )
+
+    def seeker_feed(self):
+        return SeekerFeed.objects.get(seeker=self.seeker)
+
+    def test_build_keeps_the_best_unapplied_jobs(self):
+        self.assertEqual(self.feed_jobs(), [self.match.pk, self.partial.pk])
+        entry = SeekerFeedEntry.objects.get(seeker=self.seeker, job=self.partial)
+        self.assertAlmostEqual(self.seeker_feed().threshold, entry.score, places=4)
+
+    def test_job_blocks_give_the_same_feed(self):
+        entries = list(SeekerFeedEntry.objects.values_list("job_id", "score"))
+
+        with mock.patch.object(feed, "JOB_BLOCK_SIZE", 2):
+            feed.rebuild()
+        self.assertCountEqual(
+            SeekerFeedEntry.objects.values_list("job_id", "score"), entries
+        )
+
+    def test_edit_during_a_build_is_not_lost(self):
+        features = feed.seeker_features
+
+        def edit_during_build(seeker_ids):
+            found = features(seeker_ids)
+            self.profile.skills = "java spring"
+            self.profile.save()
+            return found
+
+        self.profile.skills = "python"
+        self.profile.save()
+        with mock.patch.object(feed, "seeker_features", edit_during_build):
+            feed.refresh()
+        self.assertEqual(self.seeker_feed().features["skills"], ["python"])
+
+        feed.refresh()
+        self.assertEqual(self.seeker_feed().features["skills"], ["java", "spring"])
+        self.assertEqual(self.feed_jobs()[0], self.other.pk)
+
+    def test_new_jobs_are_merged(self):
+        job = make_job(self.recruiter, requirements="django sql python")
+
+        self.assertEqual(feed.refresh()["added"], 1)
+        self.assertEqual(set(self.feed_jobs()), {self.match.pk, job.pk})
+        self.assertEqual(self.seeker_feed().last_job_id, job.pk)
+
+    def test_edited_jobs_are_rescored(self):
+        self.other.requirements = "sql django python"
+        self.other.save()
+        self.other.save(update_fields=["title"])
+        self.assertEqual(PendingFeedJob.objects.count(), 1)
+
+        self.assertEqual(feed.refresh()["rescored"], 1)
+        self.assertFalse(PendingFeedJob.objects.exists())
+        self.assertEqual(set(self.feed_jobs()), {self.match.pk, self.other.pk})
+
+    def test_reopened_jobs_are_rescored(self):
+        closed = make_job(
+            self.recruiter,
+            requirements="python django sql",
+            application_deadline=timezone.now() - timedelta(days=1),
+        )
+        feed.refresh()
+        self.assertNotIn(closed.pk, self.feed_jobs())
+
+        closed.application_deadline = timezone.now() + timedelta(days=30)
+        closed.save()
+        feed.refresh()
+        self.assertEqual(set(self.feed_jobs()), {self.match.pk, closed.pk})
+
+    def test_withdrawn_application_marks_the_feed_stale(self):
+        self.application.delete()
+        feed_state = self.seeker_feed()
+        self.assertGreater(feed_state.version, feed_state.built_version)
+
+        feed.refresh()
+        self.assertEqual(self.feed_jobs(), [self.match.pk, self.applied.pk])
+
+    def test_deleted_job_marks_its_applicants_stale(self):
+        self.applied.delete()
+        feed_state = self.seeker_feed()
+        self.assertGreater(feed_state.version, feed_state.built_version)
+
+    def test_deleted_seeker_takes_the_feed(self):
+        self.seeker.delete()
+        self.assertFalse(SeekerFeed.objects.exists())
+
+
+class JobFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        recruiter = make_recruiter()
+        now = timezone.now()
+        self.no_deadline = make_job(
+            recruiter, salary=30000, experience_required=0, application_deadline=None
+        )
+        self.open = make_job(
+            recruiter,
+            salary=60000,
+            experience_required=2,
+            application_deadline=now + timedelta(days=10),
+        )
+        self.closed = make_job(
+            recruiter,
+            salary=90000,
+            experience_required=5,
+            application_deadline=now - timedelta(days=1),
+        )
+        self.unpaid = make_job(
+            recruiter,
+            salary=None,
+            experience_required=1,
+            application_deadline=now + timedelta(days=1),
+        )
+
+    def filtered(self, **params):
+        jobs = JobFilter(params, queryset=Job.objects.all()).qs
+        return set(jobs.values_list("pk", flat=True))
+
+    def ids(self, *jobs):
+        return {job.pk for job in jobs}
+
+    def all_jobs(self):
+        return (self.no_deadline, self.open, self.closed, self.unpaid)
+
+    def test_salary_range(self):
+        self.assertEqual(
+            self.filtered(min_salary=60000), self.ids(self.open, self.closed)
+        )
+        self.assertEqual(
+            self.filtered(max_salary=60000), self.ids(self.no_deadline, self.open)
+        )
+        self.assertEqual(
+            self.filtered(min_salary=40000, max_salary=80000), self.ids(self.open)
+        )
+
+    def test_max_experience(self):
+        self.assertEqual(
+            self.filtered(max_experience=1), self.ids(self.no_deadline, self.unpaid)
+        )
+        self.assertEqual(self.filtered(max_experience=5), self.ids(*self.all_jobs()))
+
+    def test_deadline_after_includes_jobs_without_a_deadline(self):
+        after = (timezone.now() + timedelta(days=2)).isoformat()
+        self.assertEqual(
+            self.filtered(deadline_after=after), self.ids(self.no_deadline, self.open)
+        )
+
+    def test_open_only(self):
+        self.assertEqual(
+            self.filtered(open_only="true"),
+            self.ids(self.no_deadline, self.open, self.unpaid),
+        )
+        self.assertEqual(self.filtered(open_only="false"), self.ids(*self.all_jobs()))
+
+    def test_filters_combine_on_the_list_endpoint(self):
+        response = self.client.get(
+            "/api/jobs/?open_only=true&min_salary=20000&max_experience=3"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {job["id"] for job in response.data["results"]},
+            self.ids(self.no_deadline, self.open),
+        )
+
+    def test_invalid_values_are_bad_requests(self):
+        for query in ("min_salary=lots", "max_experience=-", "deadline_after=soon"):
+            response = self.client.get(f"/api/jobs/?{query}")
+            self.assertEqual(response.status_code, 400, query)
+
+
+class JobFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.recruiter = make_recruiter()
+        for category, job_type, location in (
+            ("it", "full_time", "Dhaka"),
+            ("it", "full_time", "Chittagong"),
+            ("it", "part_time", "Dhaka"),
+            ("finance", "full_time", "Dhaka"),
+        ):
+            make_job(
+                self.recruiter, category=category, job_type=job_type, location=location
+            )
+
+    def get(self, query):
+        response = self.client.get(f"/api/jobs/{query}")
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_requested_facets(self):
+        for value in ("true", "ALL", "1"):
+            self.assertEqual(facets.requested_facets(value), list(facets.FACET_FIELDS))
+        self.assertEqual(
+            facets.requested_facets(" location, category,location "),
+            ["location", "category"],
+        )
+        with self.assertRaisesMessage(ValueError, "Unknown facet(s): salary"):
+            facets.requested_facets("category,salary")
+
+    def test_count_facets(self):
+        self.assertEqual(
+            facets.count_facets(Job.objects.filter(job_type="full_time")),
+            {
+                "count": 3,
+                "facets": {
+                    "category": [
+                        {"value": "it", "count": 2},
+                        {"value": "finance", "count": 1},
+                    ],
+                    "job_type": [{"value": "full_time", "count": 3}],
+                    "location": [
+                        {"value": "Dhaka", "count": 2},
+                        {"value": "Chittagong", "count": 1},
+                    ],
+                },
+            },
+        )
+
+    @override_settings(JOB_FACET_LIMIT=1)
+    def test_values_are_limited_per_field(self):
+        counts = facets.count_facets(Job.objects.all())
+        self.assertEqual(counts["facets"]["location"], [{"value": "Dhaka", "count": 3}])
+        self.assertEqual(counts["count"], 4)
+
+    def test_list_adds_the_requested_facets_of_the_filtered_jobs(self):
+        data = self.get("?category=it&facets=job_type")
+
+        self.assertEqual(len(data["results"]), 3)
+        self.assertEqual(
+            data["facets"],
+            {
+                "job_type": [
+                    {"value": "full_time", "count": 2},
+                    {"value": "part_time", "count": 1},
+                ]
+            },
+        )
+
+    def test_facets_only(self):
+        data = self.get("?facets_only=true&location=Dhaka")
+
+        self.assertEqual(set(data), {"count", "facets"})
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(set(data["facets"]), set(facets.FACET_FIELDS))
+
+        data = self.get("?facets_only=1&facets=category")
+        self.assertEqual(set(data["facets"]), {"category"})
+
+    def test_unknown_facet_is_a_bad_request(self):
+        response = self.client.get("/api/jobs/?facets=category,salary")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("salary", response.data["error"])
+
+    @override_settings(JOB_CACHE_TIMEOUT=60)
+    def test_pages_and_orderings_share_cached_counts(self):
+        with mock.patch.object(
+            facets, "count_facets", wraps=facets.count_facets
+        ) as count:
+            self.get("?facets=category&page_size=1")
+            self.get("?facets=category&page_size=2&ordering=-salary")
+            self.assertEqual(count.call_count, 1)
+
+            self.get("?facets=category&category=it")
+            self.assertEqual(count.call_count, 2)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                make_job(self.recruiter, category="finance")
+            data = self.get("?facets=category&page_size=1")
+            self.assertEqual(count.call_count, 3)
+        self.assertEqual(
+            data["facets"]["category"],
+            [{"value": "it", "count": 3}, {"value": "finance", "count": 2}],
+        )
+
+    def test_disabled_cache_counts_every_request(self):
+        with mock.patch.object(
+            facets, "count_facets", wraps=facets.count_facets
+        ) as count:
+            self.get("?facets=category&page_size=1")
+            self.get("?facets=category&page_size=2")
+        self.assertEqual(count.call_count, 2)
+
+
+def import_row(**fields):
+    row = {
+        "title": "Data engineer",
+        "description": "Build pipelines",
+        "requirements": "python sql",
+        "location": "Dhaka",
+        "job_type": "full_time",
+        "category": "it",
+        "company_name": "Acme",
+        "salary": 60000,
+    }
+    row.update(fields)
+    return row
+
+
+class JobImportServicesTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+
+    def test_valid_rows_are_created_and_queued(self):
+        result = JobImportServices.import_rows(
+            self.recruiter,
+            enumerate([import_row(title=" Padded "), import_row(salary="")], 1),
+            batch_size=1,
+        )
+
+        self.assertEqual((result["created"], result["failed"]), (2, 0))
+        jobs = Job.objects.filter(pk__in=result["ids"]).order_by("pk")
+        self.assertEqual([job.title for job in jobs], ["Padded", "Data engineer"])
+        self.assertIsNone(jobs[1].salary)
+        self.assertEqual(PendingJobVector.objects.count(), 2)
+
+    def test_invalid_rows_are_reported_by_row(self):
+        rows = [import_row(), import_row(salary=-1), "not a job", import_row(title="")]
+        result = JobImportServices.import_rows(self.recruiter, enumerate(rows, 1))
+
+        self.assertEqual((result["created"], result["valid"]), (1, 1))
+        self.assertEqual([error["row"] for error in result["errors"]], [2, 3, 4])
+        self.assertIn("salary", result["errors"][0]["errors"])
+        self.assertIn("title", result["errors"][2]["errors"])
+
+    def test_dry_run_writes_nothing(self):
+        result = JobImportServices.import_rows(
+            self.recruiter, enumerate([import_row(), import_row()], 1), dry_run=True
+        )
+
+        self.assertEqual((result["created"], result["valid"]), (0, 2))
+        self.assertEqual(result["ids"], [])
+        self.assertFalse(Job.objects.exists())
+
+
+class JobBulkImportViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(make_recruiter())
+
+    def post(self, data, format="json"):
+        return self.client.post("/api/jobs/bulk_import/", data, format=format)
+
+    def test_rows_are_created(self):
+        response = self.post({"jobs": [import_row(), import_row(salary=0)]})
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual((response.data["created"], response.data["failed"]), (1, 1))
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_dry_run_strings_are_parsed(self):
+        for value, created in (("false", 1), ("0", 1), ("true", 0), (True, 0)):
+            response = self.post({"jobs": [import_row()], "dry_run": value})
+            self.assertEqual(response.data["created"], created, value)
+
+        self.assertEqual(
+            self.post({"jobs": [import_row()], "dry_run": "maybe"}).status_code, 400
+        )
+
+    def test_dry_run_is_ok_not_created(self):
+        response = self.post({"jobs": [import_row()], "dry_run": True})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(JOB_IMPORT_MAX_ROWS=2)
+    def test_bad_bodies_are_rejected(self):
+        for data in ({}, {"jobs": []}, {"jobs": "x"}, {"jobs": [import_row()] * 3}):
+            self.assertEqual(self.post(data).status_code, 400, data)
+        self.assertEqual(self.post([import_row()]).status_code, 400)
+
+    def test_no_valid_row_is_bad_request(self):
+        response = self.post({"jobs": [import_row(job_type="gig")]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"][0]["row"], 1)
+
+    def test_only_recruiters_import(self):
+        self.client.force_authenticate(make_seeker())
+        self.assertEqual(self.post({"jobs": [import_row()]}).status_code, 403)
+
+
+class ImportJobsCommandTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(content)
+        return path
+
+    def run_import(self, path, *args):
+        call_command(
+            "import_jobs",
+            path,
+            "--recruiter",
+            self.recruiter.email,
+            *args,
+            stdout=io.StringIO(),
+        )
+
+    def test_csv(self):
+        path = self.write(
+            "jobs.csv",
+            "title,description,requirements,location,job_type,category,company_name,salary\n"
+            "Analyst,Crunch numbers,excel,Dhaka,full_time,it,Acme,40000\n"
+            "Broken,Crunch numbers,excel,Dhaka,full_time,it,Acme,-5\n",
+        )
+        errors = os.path.join(self.directory.name, "errors.ndjson")
+
+        self.run_import(path, "--errors", errors)
+
+        self.assertEqual(list(Job.objects.values_list("title", flat=True)), ["Analyst"])
+        with open(errors) as handle:
+            reported = [json.loads(line) for line in handle]
+        # Line 1 is the header
+        self.assertEqual([error["row"] for error in reported], [3])
+
+    def test_ndjson_dry_run(self):
+        path = self.write("jobs.ndjson", json.dumps(import_row()) + "\n\nnot json\n")
+        self.run_import(path, "--dry-run")
+        self.assertFalse(Job.objects.exists())
+
+        self.run_import(path)
+        self.assertEqual(Job.objects.count(), 1)
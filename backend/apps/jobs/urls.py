@@ -23,13 +23,18 @@ urlpatterns = [
 # ============ CUSTOM ACTIONS ============
 # GET    /api/jobs/my_jobs/            - My jobs (recruiter only)
 # GET    /api/jobs/{id}/similar_jobs/  - Similar jobs (anyone)
+# POST   /api/jobs/bulk_import/        - Create many jobs at once (recruiter only)
+# GET    /api/jobs/feed/               - Personalized job feed (seeker only)
 
 # Query Parameters & Examples:
 # /api/jobs/?category=it&location=NYC&job_type=remote
 # /api/jobs/?search=python
 # /api/jobs/?category=it&ordering=-salary
+# /api/jobs/?min_salary=80000&max_salary=120000&open_only=true
+# /api/jobs/?search=python&facets=category,job_type
 # /api/jobs/my_jobs/
 # /api/jobs/5/similar_jobs/
+# /api/jobs/feed/?page_size=20
 
 # ============ DETAILED ENDPOINT DESCRIPTIONS ============
 
@@ -40,15 +45,28 @@ urlpatterns = [
 #     - category: it, healthcare, finance, education, marketing, design, other
 #     - job_type: full_time, part_time, remote, contract, internship
 #     - location: string (city name)
+#     - min_salary / max_salary: salary range (inclusive)
+#     - max_experience: experience_required at most this many years
+#     - deadline_after: ISO date/datetime; jobs without a deadline match too
+#     - open_only=true: only jobs still taking applications
+#       (no deadline or a deadline in the future)
 #   - Search fields: title, company_name, description
+#     (PostgreSQL full-text search, prefix matched, ranked title > company_name > description;
+#      results are ordered by rank unless ?ordering= is given)
 #   - Ordering: created_at, salary (default: -created_at, newest first)
 #   - Pagination: 10 items per page by default
+#     (?pagination=cursor switches to keyset pages on -created_at, id; count only with ?include_count=true)
+#   - Facets: ?facets=category,job_type,location (or ?facets=true) adds
+#     "facets": {"category": [{"value": "it", "count": 98}, ...], ...} with counts
+#     of the filtered/searched jobs (one aggregate query, cached per filter state);
+#     ?facets_only=true returns only {"count": ..., "facets": ...}
 #   - Returns: JobListSerializer (summary view)
 #   - Example:
 #     GET /api/jobs/
 #     GET /api/jobs/?category=it&job_type=remote
 #     GET /api/jobs/?search=django
-#     GET /api/jobs/?location=NYC&salary_min=100000
+#     GET /api/jobs/?location=NYC&min_salary=100000
+#     GET /api/jobs/?category=it&open_only=true&max_experience=3
 #     GET /api/jobs/?ordering=-salary
 #   - Response: {
 #       "count": 50,
@@ -184,11 +202,26 @@ urlpatterns = [
 #       }
 #     ]
 
+# POST /api/jobs/bulk_import/
+#   - Create up to JOB_IMPORT_MAX_ROWS (1000) jobs in one request
+#   - Access: Recruiter only
+#   - Body: {"jobs": [<job>, ...], "dry_run": false}
+#     (each job takes the POST /api/jobs/ fields except company_logo)
+#   - Valid jobs are inserted in batches; invalid ones are reported per row
+#   - dry_run: validate only, nothing is created
+#   - Response: {
+#       "created": 2, "valid": 2, "failed": 1, "ids": [41, 42],
+#       "errors": [{"row": 3, "errors": {"job_type": ["\"x\" is not a valid choice."]}}]
+#     }
+#   - Files: python manage.py import_jobs jobs.csv --recruiter jane@example.com
+#     (CSV with a header row, or NDJSON; --dry-run, --errors errors.ndjson)
+
 # GET /api/jobs/{id}/similar_jobs/
-#   - Get similar jobs based on category and location
+#   - Get the most similar jobs from the precomputed neighbor list
 #   - Access: Anyone (no auth required)
-#   - Returns: Maximum 5 similar jobs
-#   - Filters by: category AND location
+#   - Returns: Maximum 5 similar jobs, most similar first
+#   - Ranks by: title/requirement words, location words, job type, salary band
+#     (same category); python manage.py build_similar_jobs rebuilds the lists
 #   - Excludes: current job from results
 #   - Returns: List of JobListSerializer
 #   - Example: GET /api/jobs/1/similar_jobs/
@@ -208,6 +241,26 @@ urlpatterns = [
 #       ...
 #     ]
 
+# GET /api/jobs/feed/
+#   - Open jobs ranked for the current seeker, best match first
+#   - Access: Job seeker only
+#   - Ranks by: profile skills vs requirements, years of experience vs
+#     experience_required, categories/job types of the seeker's applications
+#   - Served from the precomputed feed (SEEKER_FEED_SIZE jobs per seeker)
+#     kept up to date by python manage.py refresh_seeker_feeds; applied jobs
+#     are left out
+#   - Pagination: cursor links (next/previous), ?page_size=20 (max 100)
+#   - Example: GET /api/jobs/feed/
+#   - Response: {
+#       "next": "http://.../api/jobs/feed/?cursor=eyJ2Ijo...",
+#       "previous": null,
+#       "results": [
+#         {"score": 0.8123, "job": {"id": 3, "title": "Python Backend Engineer", ...}},
+#         ...
+#       ]
+#     }
+#   - Before the seeker's feed is first built: newest open jobs, "score": null
+
 # ============ USEFUL QUERY COMBINATIONS ============
 
 # Search for Python jobs
@@ -246,6 +299,7 @@ urlpatterns = [
 # - PATCH /api/jobs/{id}/
 # - DELETE /api/jobs/{id}/
 # - GET /api/jobs/my_jobs/
+# - POST /api/jobs/bulk_import/
 
 # Include Authorization header:
 # Headers: {
@@ -312,6 +366,9 @@ urlpatterns = [
 # Pagination:
 # /api/jobs/?page=1
 # /api/jobs/?page=2
+# /api/jobs/?page=2&page_size=20
+# /api/jobs/?pagination=cursor (keyset mode; follow next/previous links)
+# /api/jobs/?pagination=cursor&include_count=true
 
 # ============ FIELD REFERENCE ============
 
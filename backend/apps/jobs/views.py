@@ -1,22 +1,49 @@
+from functools import partial
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
 from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
 
-from apps.jobs.models import Job
+from apps.jobs import facets
+from apps.jobs.cache import JobCache
+from apps.jobs.filters import JobFilter
+from apps.jobs.models import Job, SeekerFeed, SeekerFeedEntry
+from apps.jobs.querysets import JobQuerySet, QuerysetProfileMixin
+from apps.jobs.search import JobSearchFilter, JobOrderingFilter
+from apps.jobs.services import JobImportServices
 from apps.jobs.serializers import (
     JobListSerializer,
     JobDetailSerializer,
     JobCreateUpdateSerializer,
+    JobBulkImportSerializer,
+    SeekerFeedEntrySerializer,
 )
+from apps.core.pagination import KeysetPagination
 from apps.core.permissions import IsRecruiterOrReadOnly
 from apps.core.swagger_docs import SwaggerDocumentation
 
 
-class JobViewSet(viewsets.ModelViewSet):
+class FeedPagination(KeysetPagination):
+    """Keyset pages over feed entries, best score first"""
+
+    ordering = ["-score"]
+
+
+class LatestJobsPagination(KeysetPagination):
+    """
+    Keyset pages over the newest open jobs, shown until a seeker's feed is
+    built. Its own cursor parameter keeps its created_at cursors apart from
+    the feed's score cursors.
+    """
+
+    cursor_query_param = "latest_cursor"
+    ordering = ["-created_at"]
+
+
+class JobViewSet(QuerysetProfileMixin, viewsets.ModelViewSet):
     """
     ViewSet for Job listing, creation, and management.
     - Anyone can view jobs
@@ -25,14 +52,27 @@ class JobViewSet(viewsets.ModelViewSet):
 
     queryset = Job.objects.all()
     permission_classes = [AllowAny]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, JobSearchFilter, JobOrderingFilter]
 
-    # Filtering options
-    filterset_fields = ["category", "job_type", "location"]
+    # Filtering options (exact fields plus salary/experience/deadline ranges)
+    filterset_class = JobFilter
+    # Used by JobSearchFilter's icontains fallback off PostgreSQL
     search_fields = ["title", "company_name", "description"]
     ordering_fields = ["created_at", "salary"]
     ordering = ["-created_at"]  # Default ordering
 
+    # Queryset profile per action (see JobQuerySet)
+    queryset_profiles = {
+        "list": "for_list",
+        "my_jobs": "for_list",
+        "similar_jobs": "for_list",
+        "feed": "for_list",
+        "retrieve": "for_detail",
+        "update": "for_detail",
+        "partial_update": "for_detail",
+        "destroy": "for_detail",
+    }
+
     def get_serializer_class(self):
         """Return different serializer based on action"""
         if self.action == "retrieve":
@@ -45,10 +85,10 @@ class JobViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         """
         Override permissions:
-        - List and retrieve: AllowAny
+        - List, retrieve and similar jobs: AllowAny
         - Create, update, delete: IsAuthenticated + IsRecruiter
         """
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "similar_jobs"]:
             permission_classes = [AllowAny]
         elif self.action in ["create", "update", "partial_update", "destroy"]:
             permission_classes = [IsAuthenticated, IsRecruiterOrReadOnly]
@@ -57,6 +97,64 @@ class JobViewSet(viewsets.ModelViewSet):
 
         return [permission() for permission in permission_classes]
 
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                "facets",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description=(
+                    "Comma-separated fields to count the filtered jobs by "
+                    f"({', '.join(facets.FACET_FIELDS)}), or true for all"
+                ),
+            ),
+            openapi.Parameter(
+                "facets_only",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_BOOLEAN,
+                required=False,
+                description="Return the count and facets without a page of jobs",
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        """List jobs (cached per normalized query string)"""
+        return JobCache.respond(
+            request, "list", partial(self.list_jobs, request, *args, **kwargs)
+        )
+
+    def list_jobs(self, request, *args, **kwargs):
+        """Uncached body of list: a page of jobs and the requested facet counts"""
+        facets_only = request.query_params.get("facets_only") in ("1", "true", "True")
+        fields = request.query_params.get("facets", "")
+        try:
+            fields = facets.requested_facets(fields) if fields else []
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if facets_only and not fields:
+            fields = list(facets.FACET_FIELDS)
+
+        if not fields:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        counts = facets.cached_facets(request, queryset)
+        selected = {field: counts["facets"][field] for field in fields}
+
+        if facets_only:
+            return Response({"count": counts["count"], "facets": selected})
+
+        response = super().list(request, *args, **kwargs)
+        response.data["facets"] = selected
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        """Job details (cached)"""
+        return JobCache.respond(
+            request, "retrieve", partial(super().retrieve, request, *args, **kwargs)
+        )
+
     def create(self, request, *args, **kwargs):
         """Create a new job (recruiter only)"""
         # Check if user is recruiter
@@ -133,10 +231,150 @@ class JobViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        jobs = Job.objects.filter(recruiter=request.user)
+        jobs = self.get_queryset().filter(recruiter=request.user)
         serializer = JobListSerializer(jobs, many=True)
         return Response(serializer.data)
 
+    @SwaggerDocumentation.custom_action(
+        method="get",
+        response_schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "next": openapi.Schema(type=openapi.TYPE_STRING),
+                "previous": openapi.Schema(type=openapi.TYPE_STRING),
+                "results": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                ),
+            },
+        ),
+        description="Open jobs ranked for the current job seeker",
+        manual_parameters=[
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Page cursor from the next/previous links",
+            ),
+            openapi.Parameter(
+                "latest_cursor",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Page cursor of the newest-jobs feed (not built yet)",
+            ),
+            openapi.Parameter(
+                "page_size",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+                description="Jobs per page (at most 100)",
+            ),
+        ],
+    )
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
+    def feed(self, request):
+        """Personalized job feed, paged from the precomputed entries"""
+        if request.user.role != "seeker":
+            return Response(
+                {"error": "Only job seekers have a job feed"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        entries = (
+            SeekerFeedEntry.objects.filter(seeker=request.user)
+            .filter(JobQuerySet.open_condition("job__"))
+            .select_related("job__recruiter")
+            .only(
+                "id",
+                "score",
+                "job_id",
+                *(f"job__{field}" for field in JobQuerySet.LIST_FIELDS),
+            )
+        )
+        if LatestJobsPagination.cursor_query_param in request.query_params:
+            return self.latest_jobs_feed(request)
+
+        paginator = FeedPagination()
+        page = paginator.paginate_queryset(entries, request, self)
+
+        # Not built yet (new seeker): newest open jobs until the next refresh
+        if not page and paginator.cursor_query_param not in request.query_params:
+            if not SeekerFeed.objects.filter(
+                seeker=request.user, built_at__isnull=False
+            ).exists():
+                return self.latest_jobs_feed(request)
+
+        serializer = SeekerFeedEntrySerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def latest_jobs_feed(self, request):
+        """Feed-shaped pages of the newest open jobs, without scores"""
+        paginator = LatestJobsPagination()
+        jobs = paginator.paginate_queryset(self.get_queryset().open(), request, self)
+        return paginator.get_paginated_response(
+            [
+                {"score": None, "job": job}
+                for job in JobListSerializer(jobs, many=True).data
+            ]
+        )
+
+    @SwaggerDocumentation.custom_action(
+        method="post",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["jobs"],
+            properties={
+                "jobs": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                ),
+                "dry_run": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+            },
+        ),
+        response_schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "created": openapi.Schema(type=openapi.TYPE_INTEGER),
+                "valid": openapi.Schema(type=openapi.TYPE_INTEGER),
+                "failed": openapi.Schema(type=openapi.TYPE_INTEGER),
+                "ids": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_INTEGER),
+                ),
+                "errors": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                ),
+            },
+        ),
+        description="Create many jobs in one request (recruiter only)",
+    )
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
+    def bulk_import(self, request):
+        """Validate and create a list of jobs; invalid rows are reported"""
+        if request.user.role != "recruiter":
+            return Response(
+                {"error": "Only recruiters can post jobs"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = JobBulkImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = JobImportServices.import_rows(
+            request.user,
+            enumerate(serializer.validated_data["jobs"], start=1),
+            dry_run=serializer.validated_data["dry_run"],
+        )
+
+        if result["valid"] == 0:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        if result["created"]:
+            return Response(result, status=status.HTTP_201_CREATED)
+        return Response(result, status=status.HTTP_200_OK)
+
     @SwaggerDocumentation.custom_action(
         method="get",
         response_schema=openapi.Schema(
@@ -147,13 +385,28 @@ class JobViewSet(viewsets.ModelViewSet):
     )
     @action(detail=True, methods=["get"], permission_classes=[AllowAny])
     def similar_jobs(self, request, pk=None):
-        """Get similar jobs based on category and location"""
+        """Get the most similar jobs from the precomputed neighbor list (cached)"""
+        return JobCache.respond(
+            request, "similar_jobs", partial(self.find_similar_jobs, request)
+        )
+
+    def find_similar_jobs(self, request):
+        """Uncached body of similar_jobs"""
         job = self.get_object()
 
-        similar = Job.objects.filter(
-            category=job.category,
-            location=job.location,
-        ).exclude(id=job.id)[:5]
+        # Ranked neighbors stored by apps.jobs.similarity: one index range scan
+        similar = list(
+            self.get_queryset()
+            .filter(neighbor_of__job=job)
+            .order_by("-neighbor_of__score")[:5]
+        )
+
+        # Jobs without a neighbor list yet (before the first build_similar_jobs)
+        if not similar:
+            similar = self.get_queryset().filter(
+                category=job.category, location=job.location
+            )
+            similar = similar.exclude(id=job.id)[:5]
 
         serializer = JobListSerializer(similar, many=True)
         return Response(serializer.data)
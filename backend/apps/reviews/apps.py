@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ReviewsConfig(AppConfig):
     name = "apps.reviews"
+
+    def ready(self):
+        from apps.reviews import signals  # noqa: F401
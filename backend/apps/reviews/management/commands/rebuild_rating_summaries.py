@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.reviews.services import LeaderboardServices, RecruiterRatingServices
+
+
+class Command(BaseCommand):
+    help = "Rebuild recruiter rating rollups from the reviews table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many rollups have drifted",
+        )
+
+    def handle(self, *args, **options):
+        drifted = RecruiterRatingServices.rebuild(dry_run=options["dry_run"])
+
+        if options["dry_run"]:
+            self.stdout.write(f"{drifted} rollup(s) out of sync")
+        else:
+            # Scores are derived from the rollups, so re-rank on top of them
+            LeaderboardServices.refresh()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {drifted} rollup(s)"))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from apps.reviews.services import LeaderboardServices
+
+
+class Command(BaseCommand):
+    help = "Recompute recruiter scores and rebuild the top recruiters leaderboard"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--if-stale",
+            action="store_true",
+            help=(
+                "Only copy the current scores into the snapshot, and only if a "
+                "review changed since it was taken (cheap enough to run every minute)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["if_stale"]:
+            if not LeaderboardServices.is_stale():
+                self.stdout.write("Leaderboard is up to date")
+                return
+            written = LeaderboardServices.rebuild_snapshot()
+        else:
+            written = LeaderboardServices.refresh()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Leaderboard rebuilt with {written} recruiter(s)")
+        )
@@ -0,0 +1,92 @@
+# Generated by Django 6.0.2 on 2026-10-17 10:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+STAR_FIELDS = {
+    1: "one_star",
+    2: "two_star",
+    3: "three_star",
+    4: "four_star",
+    5: "five_star",
+}
+
+
+def populate_summaries(apps, schema_editor):
+    Review = apps.get_model("reviews", "Review")
+    RecruiterRatingSummary = apps.get_model("reviews", "RecruiterRatingSummary")
+
+    summaries = {}
+    rows = (
+        Review.objects.values("recruiter", "rating")
+        .annotate(n=Count("id"), total=Sum("rating"))
+        .order_by()
+    )
+    for row in rows:
+        summary = summaries.setdefault(
+            row["recruiter"], RecruiterRatingSummary(recruiter_id=row["recruiter"])
+        )
+        summary.review_count += row["n"]
+        summary.rating_sum += row["total"]
+        field = STAR_FIELDS[row["rating"]]
+        setattr(summary, field, getattr(summary, field) + row["n"])
+
+    for summary in summaries.values():
+        summary.average_rating = summary.rating_sum / summary.review_count
+
+    RecruiterRatingSummary.objects.bulk_create(summaries.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecruiterRatingSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("review_count", models.IntegerField(default=0)),
+                ("rating_sum", models.IntegerField(default=0)),
+                ("average_rating", models.FloatField(default=0)),
+                ("one_star", models.IntegerField(default=0)),
+                ("two_star", models.IntegerField(default=0)),
+                ("three_star", models.IntegerField(default=0)),
+                ("four_star", models.IntegerField(default=0)),
+                ("five_star", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "recruiter",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rating_summary",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Recruiter Rating Summaries",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("review_count__gte", 1)),
+                        fields=["-average_rating"],
+                        name="rating_summary_avg_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 6.0.2 on 2026-10-17 11:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_leaderboard(apps, schema_editor):
+    RecruiterRatingSummary = apps.get_model("reviews", "RecruiterRatingSummary")
+    LeaderboardEntry = apps.get_model("reviews", "LeaderboardEntry")
+
+    summaries = list(
+        RecruiterRatingSummary.objects.filter(review_count__gte=1).select_related(
+            "recruiter"
+        )
+    )
+    if not summaries:
+        return
+
+    weight = float(settings.LEADERBOARD_PRIOR_WEIGHT)
+    prior = sum(s.rating_sum for s in summaries) / sum(
+        s.review_count for s in summaries
+    )
+    for summary in summaries:
+        summary.bayesian_score = (weight * prior + summary.rating_sum) / (
+            weight + summary.review_count
+        )
+    RecruiterRatingSummary.objects.bulk_update(summaries, ["bayesian_score"])
+
+    summaries.sort(key=lambda s: (-s.bayesian_score, -s.review_count, s.recruiter_id))
+    LeaderboardEntry.objects.bulk_create(
+        LeaderboardEntry(
+            rank=rank,
+            recruiter_id=summary.recruiter_id,
+            recruiter_name=summary.recruiter.full_name,
+            review_count=summary.review_count,
+            average_rating=summary.average_rating,
+            score=summary.bayesian_score,
+        )
+        for rank, summary in enumerate(summaries[: settings.LEADERBOARD_SIZE], start=1)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0002_recruiter_rating_summary"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaderboardEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveIntegerField(unique=True)),
+                ("recruiter_name", models.CharField(max_length=150)),
+                ("review_count", models.IntegerField()),
+                ("average_rating", models.FloatField()),
+                ("score", models.FloatField()),
+                ("computed_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name_plural": "Leaderboard Entries",
+                "ordering": ["rank"],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name="recruiterratingsummary",
+            name="rating_summary_avg_idx",
+        ),
+        migrations.AddField(
+            model_name="recruiterratingsummary",
+            name="bayesian_score",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="recruiterratingsummary",
+            index=models.Index(
+                condition=models.Q(("review_count__gte", 1)),
+                fields=["-bayesian_score"],
+                name="rating_summary_score_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="leaderboardentry",
+            name="recruiter",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="leaderboard_entries",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.RunPython(populate_leaderboard, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-17 11:24
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_helpful_counts(apps, schema_editor):
+    Review = apps.get_model("reviews", "Review")
+    ReviewHelpful = apps.get_model("reviews", "ReviewHelpful")
+
+    votes = (
+        ReviewHelpful.objects.filter(review=OuterRef("pk"))
+        .order_by()
+        .values("review")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    Review.objects.update(helpful_count=Coalesce(Subquery(votes), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0003_recruiter_leaderboard"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="review",
+            name="helpful_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_helpful_counts, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from apps.jobs.models import Job
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth import get_user_model
+from apps.reviews.querysets import ReviewQuerySet
 
 User = get_user_model()
 
@@ -26,10 +27,34 @@ class Review(models.Model):
 
     comment = models.TextField(max_length=1000, blank=True, null=True)
 
+    # Denormalized count of ReviewHelpful rows (see ReviewHelpfulServices)
+    helpful_count = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ReviewQuerySet.as_manager()
+
     class Meta:
         unique_together = ("job", "reviewer")
+        indexes = [
+            # Default list ordering; (-created_at, -id) is also the keyset order
+            models.Index(fields=["-created_at", "-id"], name="review_created_idx"),
+            # ?recruiter=, recruiter_reviews, my_received_reviews
+            models.Index(
+                fields=["recruiter", "-created_at", "-id"],
+                name="review_recruiter_created_idx",
+            ),
+            # ?job=, job_reviews
+            models.Index(
+                fields=["job", "-created_at", "-id"],
+                name="review_job_created_idx",
+            ),
+            # my_reviews
+            models.Index(
+                fields=["reviewer", "-created_at", "-id"],
+                name="review_reviewer_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Review for {self.recruiter.email}"
@@ -52,3 +77,71 @@ class ReviewHelpful(models.Model):
 
     def __str__(self):
         return f"{self.user.email} marked review {self.review.pk} as helpful"
+
+
+class RecruiterRatingSummary(models.Model):
+    """
+    Rating rollup for one recruiter, maintained incrementally on review
+    create/update/delete (see RecruiterRatingServices).
+    """
+
+    recruiter = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="rating_summary"
+    )
+
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    average_rating = models.FloatField(default=0)
+
+    # Confidence-weighted (Bayesian average) rating used by the leaderboard
+    bayesian_score = models.FloatField(default=0)
+
+    one_star = models.IntegerField(default=0)
+    two_star = models.IntegerField(default=0)
+    three_star = models.IntegerField(default=0)
+    four_star = models.IntegerField(default=0)
+    five_star = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    STAR_FIELDS = {
+        1: "one_star",
+        2: "two_star",
+        3: "three_star",
+        4: "four_star",
+        5: "five_star",
+    }
+
+    class Meta:
+        verbose_name_plural = "Recruiter Rating Summaries"
+        indexes = [
+            models.Index(
+                fields=["-bayesian_score"],
+                condition=models.Q(review_count__gte=1),
+                name="rating_summary_score_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.recruiter.email} - {self.average_rating} ({self.review_count})"
+
+
+class LeaderboardEntry(models.Model):
+    """Precomputed top recruiters snapshot, ranked by Bayesian score"""
+
+    rank = models.PositiveIntegerField(unique=True)
+    recruiter = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="leaderboard_entries"
+    )
+    recruiter_name = models.CharField(max_length=150)
+    review_count = models.IntegerField()
+    average_rating = models.FloatField()
+    score = models.FloatField()
+    computed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["rank"]
+        verbose_name_plural = "Leaderboard Entries"
+
+    def __str__(self):
+        return f"#{self.rank} {self.recruiter_name} ({self.score:.2f})"
@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class ReviewQuerySet(models.QuerySet):
+    """
+    Queryset profiles shaped after the review serializers, so a list of
+    reviews costs one query however long it is (see JobQuerySet)
+    """
+
+    LIST_FIELDS = (
+        "id",
+        "job__title",
+        "recruiter__full_name",
+        "recruiter__email",
+        "reviewer__full_name",
+        "reviewer__email",
+        "rating",
+        "helpful_count",
+        "created_at",
+    )
+
+    def for_list(self):
+        """Profile for ReviewListSerializer (no comment text)"""
+        return self.select_related("job", "recruiter", "reviewer").only(
+            *self.LIST_FIELDS
+        )
+
+    def for_detail(self):
+        """Profile for ReviewDetailSerializer (job as JobListSerializer)"""
+        return self.select_related("job__recruiter", "recruiter", "reviewer")
@@ -25,9 +25,10 @@ class ReviewListSerializer(serializers.ModelSerializer):
             "reviewer_name",
             "reviewer_email",
             "rating",
+            "helpful_count",
             "created_at",
         )
-        read_only_fields = ("created_at", "id")
+        read_only_fields = ("created_at", "id", "helpful_count")
 
 
 class ReviewDetailSerializer(serializers.ModelSerializer):
@@ -50,9 +51,17 @@ class ReviewDetailSerializer(serializers.ModelSerializer):
             "reviewer_email",
             "rating",
             "comment",
+            "helpful_count",
+            "created_at",
+        )
+        read_only_fields = (
             "created_at",
+            "id",
+            "recruiter",
+            "reviewer",
+            "job",
+            "helpful_count",
         )
-        read_only_fields = ("created_at", "id", "recruiter", "reviewer", "job")
 
 
 class ReviewCreateUpdateSerializer(serializers.ModelSerializer):
@@ -94,6 +103,11 @@ class ReviewCreateUpdateSerializer(serializers.ModelSerializer):
     def validate(self, data):
         """Check if user has applied to this job and hasn't reviewed yet"""
 
+        # Updates keep the review's job; only rating and comment change
+        if self.instance is not None:
+            data.pop("job_id", None)
+            return data
+
         job_id = data.get("job_id")
         job = Job.objects.get(id=job_id)
         reviewer = self.context["request"].user
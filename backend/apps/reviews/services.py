@@ -0,0 +1,399 @@
+from collections import defaultdict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Count,
+    F,
+    FloatField,
+    Max,
+    Min,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+from apps.reviews.models import (
+    LeaderboardEntry,
+    RecruiterRatingSummary,
+    Review,
+    ReviewHelpful,
+)
+
+STAR_FIELDS = RecruiterRatingSummary.STAR_FIELDS
+SUMMARY_FIELDS = ["review_count", "rating_sum", "average_rating"] + list(
+    STAR_FIELDS.values()
+)
+
+
+class RecruiterRatingServices:
+    """Maintain and read the RecruiterRatingSummary rollups"""
+
+    @staticmethod
+    def apply(recruiter_id, added=(), removed=(), create=False):
+        """
+        Move a recruiter's rollup by the given added/removed ratings in one
+        UPDATE with F() expressions, recomputing the average in the same
+        statement. Missing rollups are only created when create=True.
+        """
+        added, removed = list(added), list(removed)
+        if recruiter_id is None or not (added or removed):
+            return
+
+        count_delta = len(added) - len(removed)
+        sum_delta = sum(added) - sum(removed)
+        star_deltas = defaultdict(int)
+        for rating in added:
+            star_deltas[STAR_FIELDS[rating]] += 1
+        for rating in removed:
+            star_deltas[STAR_FIELDS[rating]] -= 1
+
+        new_count = F("review_count") + count_delta
+        new_sum = F("rating_sum") + sum_delta
+        updates = {
+            "review_count": new_count,
+            "rating_sum": new_sum,
+            "average_rating": Coalesce(
+                Cast(new_sum, FloatField()) / NullIf(new_count, 0),
+                Value(0.0),
+            ),
+            "bayesian_score": LeaderboardServices.score_expression(
+                new_count, new_sum, LeaderboardServices.prior()
+            ),
+            # update() skips auto_now; the leaderboard compares it to its snapshot
+            "updated_at": timezone.now(),
+            **{
+                field: F(field) + delta for field, delta in star_deltas.items() if delta
+            },
+        }
+
+        summaries = RecruiterRatingSummary.objects.filter(recruiter_id=recruiter_id)
+        if not summaries.update(**updates) and create:
+            RecruiterRatingSummary.objects.get_or_create(recruiter_id=recruiter_id)
+            summaries.update(**updates)
+
+    @staticmethod
+    def remove_many(reviews, exclude_recruiter=None):
+        """
+        Rollup moves for a queryset of reviews about to be deleted (a job or
+        a user and everything cascading from it). One aggregate query reads
+        the ratings per recruiter, then one UPDATE per recruiter.
+
+        Returns:
+            set: ids of the recruiters whose rollup moved
+        """
+        removed = defaultdict(list)
+        rows = reviews.values("recruiter_id", "rating").annotate(n=Count("id"))
+        for row in rows.order_by():
+            if row["recruiter_id"] != exclude_recruiter:
+                removed[row["recruiter_id"]] += [row["rating"]] * row["n"]
+
+        for recruiter_id, ratings in removed.items():
+            RecruiterRatingServices.apply(recruiter_id, removed=ratings)
+        return set(removed)
+
+    @staticmethod
+    def statistics(recruiter_id):
+        """Review statistics for ReviewStatisticsSerializer"""
+        summary = RecruiterRatingSummary.objects.filter(
+            recruiter_id=recruiter_id
+        ).first()
+
+        if summary is None or summary.review_count <= 0:
+            return {
+                "total_reviews": 0,
+                "average_rating": 0,
+                **{field: 0 for field in STAR_FIELDS.values()},
+            }
+
+        return {
+            "total_reviews": summary.review_count,
+            "average_rating": round(summary.average_rating, 2),
+            **{field: getattr(summary, field) for field in STAR_FIELDS.values()},
+        }
+
+    @staticmethod
+    def expected_summaries():
+        """Recompute every rollup from the reviews table"""
+        expected = {}
+        rows = (
+            Review.objects.values("recruiter", "rating")
+            .annotate(n=Count("id"), total=Sum("rating"))
+            .order_by()
+        )
+
+        for row in rows:
+            summary = expected.setdefault(
+                row["recruiter"], {field: 0 for field in SUMMARY_FIELDS}
+            )
+            summary["review_count"] += row["n"]
+            summary["rating_sum"] += row["total"]
+            summary[STAR_FIELDS[row["rating"]]] += row["n"]
+
+        for summary in expected.values():
+            summary["average_rating"] = summary["rating_sum"] / summary["review_count"]
+
+        return expected
+
+    @staticmethod
+    def rebuild(dry_run=False):
+        """
+        Repair rollup drift against the reviews table.
+
+        Returns:
+            int: number of rollups that were missing, wrong or stale
+        """
+
+        def current(summary):
+            return {field: getattr(summary, field) for field in SUMMARY_FIELDS}
+
+        with transaction.atomic():
+            expected = RecruiterRatingServices.expected_summaries()
+            existing = {
+                summary.recruiter_id: summary
+                for summary in RecruiterRatingSummary.objects.select_for_update()
+            }
+
+            to_create, to_update = [], []
+            for recruiter_id, values in expected.items():
+                summary = existing.pop(recruiter_id, None)
+                if summary is None:
+                    to_create.append(
+                        RecruiterRatingSummary(recruiter_id=recruiter_id, **values)
+                    )
+                elif current(summary) != values:
+                    for field, value in values.items():
+                        setattr(summary, field, value)
+                    to_update.append(summary)
+
+            # Rollups left over have no reviews behind them
+            stale = [s for s in existing.values() if any(current(s).values())]
+
+            if not dry_run:
+                RecruiterRatingSummary.objects.bulk_create(to_create)
+                for summary in stale:
+                    for field in SUMMARY_FIELDS:
+                        setattr(summary, field, 0)
+                RecruiterRatingSummary.objects.bulk_update(
+                    to_update + stale, SUMMARY_FIELDS
+                )
+
+        return len(to_create) + len(to_update) + len(stale)
+
+
+class LeaderboardServices:
+    """
+    Top recruiters ranked by a Bayesian average:
+
+        score = (C * m + rating_sum) / (C + review_count)
+
+    where m is the mean rating across all reviews and C is
+    LEADERBOARD_PRIOR_WEIGHT. Recruiters with few reviews are pulled towards
+    m, so one 5-star review no longer beats hundreds of 4.8s. Scores live on
+    RecruiterRatingSummary and the top LEADERBOARD_SIZE rows are copied into
+    LeaderboardEntry, which top_recruiters reads by rank. Review writes only
+    move the scores; refresh_leaderboard --if-stale copies them over once a
+    rollup is newer than the snapshot.
+    """
+
+    prior_key = "reviews:leaderboard-prior"
+    default_prior = 3.0  # Middle of the 1-5 scale, used before any reviews exist
+
+    @staticmethod
+    def compute_prior():
+        """Mean rating over every review, from the rollups"""
+        totals = RecruiterRatingSummary.objects.aggregate(
+            total=Sum("rating_sum"), count=Sum("review_count")
+        )
+        if not totals["count"]:
+            return LeaderboardServices.default_prior
+        return totals["total"] / totals["count"]
+
+    @staticmethod
+    def prior():
+        """Global mean, cached for LEADERBOARD_PRIOR_TIMEOUT seconds"""
+        value = cache.get(LeaderboardServices.prior_key)
+        if value is None:
+            value = LeaderboardServices.compute_prior()
+            cache.set(
+                LeaderboardServices.prior_key,
+                value,
+                settings.LEADERBOARD_PRIOR_TIMEOUT,
+            )
+        return value
+
+    @staticmethod
+    def invalidate_prior():
+        """A review write moved the mean; the next score recomputes it"""
+        cache.delete(LeaderboardServices.prior_key)
+
+    @staticmethod
+    def score_expression(count, total, prior):
+        """Bayesian average as a database expression over count/sum columns"""
+        weight = float(settings.LEADERBOARD_PRIOR_WEIGHT)
+        return Coalesce(
+            (Value(weight * prior) + Cast(total, FloatField()))
+            / NullIf(Value(weight) + Cast(count, FloatField()), Value(0.0)),
+            Value(0.0),
+        )
+
+    @staticmethod
+    def rebuild_snapshot():
+        """
+        Copy the current top recruiters into the leaderboard table.
+
+        Returns:
+            int: number of leaderboard entries written
+        """
+        top = (
+            RecruiterRatingSummary.objects.filter(review_count__gte=1)
+            .order_by("-bayesian_score", "-review_count", "recruiter_id")
+            .values(
+                "recruiter_id",
+                "recruiter__full_name",
+                "review_count",
+                "average_rating",
+                "bayesian_score",
+            )[: settings.LEADERBOARD_SIZE]
+        )
+        started = timezone.now()
+        entries = [
+            LeaderboardEntry(
+                rank=rank,
+                recruiter_id=row["recruiter_id"],
+                recruiter_name=row["recruiter__full_name"],
+                review_count=row["review_count"],
+                average_rating=row["average_rating"],
+                score=row["bayesian_score"],
+            )
+            for rank, row in enumerate(top, start=1)
+        ]
+
+        try:
+            with transaction.atomic():
+                LeaderboardEntry.objects.all().delete()
+                LeaderboardEntry.objects.bulk_create(entries)
+                # Rollups written while the top rows were read stay newer
+                LeaderboardEntry.objects.update(computed_at=started)
+        except IntegrityError:
+            # A concurrent rebuild wrote its snapshot first; keep that one
+            return 0
+
+        return len(entries)
+
+    @staticmethod
+    def refresh():
+        """
+        Recompute the prior and every score, then rebuild the snapshot.
+
+        Returns:
+            int: number of leaderboard entries written
+        """
+        with transaction.atomic():
+            prior = LeaderboardServices.compute_prior()
+            RecruiterRatingSummary.objects.update(
+                bayesian_score=LeaderboardServices.score_expression(
+                    F("review_count"), F("rating_sum"), prior
+                )
+            )
+            written = LeaderboardServices.rebuild_snapshot()
+
+        cache.set(
+            LeaderboardServices.prior_key, prior, settings.LEADERBOARD_PRIOR_TIMEOUT
+        )
+        return written
+
+    @staticmethod
+    def is_stale():
+        """Whether a rollup changed after the snapshot was taken"""
+        built = LeaderboardEntry.objects.aggregate(at=Min("computed_at"))["at"]
+        if built is None:
+            return RecruiterRatingSummary.objects.filter(review_count__gte=1).exists()
+
+        changed = RecruiterRatingSummary.objects.aggregate(at=Max("updated_at"))["at"]
+        return changed is not None and changed > built
+
+    @staticmethod
+    def top(limit):
+        """Leaderboard rows in rank order, shaped for top_recruiters"""
+        entries = LeaderboardEntry.objects.order_by("rank")[:limit]
+        return [
+            {
+                "rank": entry.rank,
+                "recruiter": entry.recruiter_id,
+                "recruiter__full_name": entry.recruiter_name,
+                "review_count": entry.review_count,
+                "avg_rating": entry.average_rating,
+                "score": round(entry.score, 4),
+            }
+            for entry in entries
+        ]
+
+
+class ReviewHelpfulServices:
+    """Helpful votes and the denormalized Review.helpful_count"""
+
+    @staticmethod
+    def adjust(review_id, delta):
+        """Move helpful_count by delta in a single UPDATE"""
+        Review.objects.filter(pk=review_id).update(
+            helpful_count=F("helpful_count") + delta
+        )
+
+    @staticmethod
+    def toggle(review, user):
+        """
+        Add the user's helpful vote, or remove it if it exists.
+        The vote row and the counter move in one transaction (the counter via
+        the ReviewHelpful signals); a concurrent duplicate vote loses on the
+        unique constraint instead of double counting.
+
+        Returns:
+            tuple: (marked as helpful, new helpful count)
+        """
+        with transaction.atomic():
+            # Delete row by row so post_delete fires and moves the counter
+            votes = ReviewHelpful.objects.filter(review=review, user=user)
+            removed = False
+            for vote in votes.select_for_update():
+                vote.delete()
+                removed = True
+
+            if not removed:
+                try:
+                    with transaction.atomic():
+                        ReviewHelpful.objects.create(review=review, user=user)
+                except IntegrityError:
+                    # Another request registered the same vote first
+                    pass
+
+            helpful_count = (
+                Review.objects.filter(pk=review.pk)
+                .values_list("helpful_count", flat=True)
+                .get()
+            )
+
+        return not removed, helpful_count
+
+    @staticmethod
+    def recount(queryset=None):
+        """
+        Reset helpful_count from the votes table.
+
+        Returns:
+            int: number of reviews updated
+        """
+        if queryset is None:
+            queryset = Review.objects.all()
+
+        votes = (
+            ReviewHelpful.objects.filter(review=OuterRef("pk"))
+            .order_by()
+            .values("review")
+            .annotate(n=Count("id"))
+            .values("n")
+        )
+        return queryset.update(helpful_count=Coalesce(Subquery(votes), Value(0)))
@@ -0,0 +1,120 @@
+from django.db import transaction
+from django.db.models import F, Q, QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from apps.authentication.models import User
+from apps.jobs.models import Job
+from apps.reviews.models import Review, ReviewHelpful
+from apps.reviews.services import (
+    LeaderboardServices,
+    RecruiterRatingServices,
+    ReviewHelpfulServices,
+)
+
+
+def invalidate_prior_on_commit():
+    """
+    The snapshot is rebuilt by refresh_leaderboard --if-stale, which sees the
+    rollup's updated_at; only the cached mean has to go
+    """
+    transaction.on_commit(LeaderboardServices.invalidate_prior)
+
+
+def deleted_directly(origin, model):
+    """
+    Whether a delete started at model itself rather than cascading from a
+    job or user, whose pre_delete receivers move the counters in bulk
+    """
+    if isinstance(origin, QuerySet):
+        return origin.model is model
+    return isinstance(origin, model)
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_rating(sender, instance, raw=False, **kwargs):
+    """Keep the stored rating so post_save can move the rollup"""
+    if raw or instance._state.adding or instance.pk is None:
+        instance._previous_rating = None
+        return
+
+    instance._previous_rating = (
+        Review.objects.filter(pk=instance.pk).values_list("rating", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Review)
+def roll_up_saved_review(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    if created:
+        RecruiterRatingServices.apply(
+            instance.recruiter_id, added=[instance.rating], create=True
+        )
+    elif instance._previous_rating and instance._previous_rating != instance.rating:
+        RecruiterRatingServices.apply(
+            instance.recruiter_id,
+            added=[instance.rating],
+            removed=[instance._previous_rating],
+        )
+    else:
+        return
+
+    invalidate_prior_on_commit()
+
+
+@receiver(post_delete, sender=Review)
+def roll_up_deleted_review(sender, instance, origin=None, **kwargs):
+    if not deleted_directly(origin, Review):
+        return
+
+    RecruiterRatingServices.apply(instance.recruiter_id, removed=[instance.rating])
+    invalidate_prior_on_commit()
+
+
+@receiver(pre_delete, sender=Job)
+def roll_up_job_reviews_deleted(sender, instance, origin=None, **kwargs):
+    """The job's reviews cascade with it; move the rollup in bulk"""
+    if isinstance(origin, User):
+        return
+
+    if RecruiterRatingServices.remove_many(Review.objects.filter(job=instance)):
+        invalidate_prior_on_commit()
+
+
+@receiver(pre_delete, sender=User)
+def roll_up_user_reviews_deleted(sender, instance, **kwargs):
+    """
+    Reviews a deleted user wrote, received or has on their jobs cascade with
+    them (their jobs' pre_delete skips user deletes). Their own rollup and
+    leaderboard rows go too; one snapshot rebuild reranks everyone else.
+    """
+    reviews = Review.objects.filter(
+        Q(reviewer=instance) | Q(recruiter=instance) | Q(job__recruiter=instance)
+    )
+    moved = RecruiterRatingServices.remove_many(reviews, exclude_recruiter=instance.pk)
+
+    # Their votes on other reviews are uncounted in one UPDATE (one vote
+    # per review and user)
+    Review.objects.filter(helpful_votes__user=instance).exclude(
+        pk__in=reviews.values("pk")
+    ).update(helpful_count=F("helpful_count") - 1)
+
+    if moved:
+        invalidate_prior_on_commit()
+    # Close the gap their own leaderboard row leaves
+    if instance.leaderboard_entries.exists():
+        transaction.on_commit(LeaderboardServices.rebuild_snapshot)
+
+
+@receiver(post_save, sender=ReviewHelpful)
+def count_helpful_vote(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        ReviewHelpfulServices.adjust(instance.review_id, 1)
+
+
+@receiver(post_delete, sender=ReviewHelpful)
+def uncount_helpful_vote(sender, instance, origin=None, **kwargs):
+    if deleted_directly(origin, ReviewHelpful):
+        ReviewHelpfulServices.adjust(instance.review_id, -1)
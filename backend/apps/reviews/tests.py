@@ -1,3 +1,387 @@
+import io
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.applications.models import Application
+from apps.authentication.models import User
+from apps.jobs.models import Job
+from apps.reviews.models import Review, ReviewHelpful
+from apps.reviews.services import LeaderboardServices, RecruiterRatingServices
+
+
+def make_user(email, role):
+    return User.objects.create_user(
+        email=email, password="pass12345", full_name=email.split("@")[0], role=role
+    )
+
+
+def make_job(recruiter, title="Backend developer"):
+    return Job.objects.create(
+        recruiter=recruiter,
+        category="it",
+        title=title,
+        description="Build APIs",
+        requirements="python django",
+        location="Dhaka",
+        job_type="full_time",
+        company_name="Acme",
+    )
+
+
+class ReviewTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.recruiter = make_user("recruiter@example.com", "recruiter")
+        self.seekers = [
+            make_user(f"seeker{index}@example.com", "seeker") for index in range(3)
+        ]
+        self.job = make_job(self.recruiter)
+        for seeker in self.seekers:
+            Application.objects.create(job=self.job, applicant=seeker)
+
+    def review(self, seeker, rating):
+        self.client.force_authenticate(seeker)
+        response = self.client.post(
+            "/api/reviews/", {"job_id": self.job.pk, "rating": rating}, format="json"
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        return Review.objects.get(job=self.job, reviewer=seeker)
+
+
+class RecruiterRatingSummaryTests(ReviewTestCase):
+    """The rollup must always match a recount of the reviews table"""
+
+    def statistics(self):
+        return RecruiterRatingServices.statistics(self.recruiter.pk)
+
+    def assertConsistent(self):
+        self.assertEqual(RecruiterRatingServices.rebuild(dry_run=True), 0)
+
+    def test_create(self):
+        for seeker, rating in zip(self.seekers, (5, 4, 4)):
+            self.review(seeker, rating)
+
+        self.assertConsistent()
+        statistics = self.statistics()
+        self.assertEqual(statistics["total_reviews"], 3)
+        self.assertEqual(statistics["average_rating"], 4.33)
+        self.assertEqual(statistics["four_star"], 2)
+
+    def test_update_rating(self):
+        review = self.review(self.seekers[0], 5)
+
+        response = self.client.patch(
+            f"/api/reviews/{review.pk}/", {"rating": 2}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+
+        self.assertConsistent()
+        statistics = self.statistics()
+        self.assertEqual((statistics["five_star"], statistics["two_star"]), (0, 1))
+        self.assertEqual(statistics["average_rating"], 2)
+
+    def test_update_comment_only(self):
+        review = self.review(self.seekers[0], 3)
+
+        self.client.patch(
+            f"/api/reviews/{review.pk}/", {"comment": "Fair process"}, format="json"
+        )
+        self.assertConsistent()
+        self.assertEqual(self.statistics()["total_reviews"], 1)
+
+    def test_delete(self):
+        review = self.review(self.seekers[0], 5)
+        self.review(self.seekers[1], 1)
+
+        self.client.force_authenticate(self.seekers[0])
+        response = self.client.delete(f"/api/reviews/{review.pk}/")
+        self.assertEqual(response.status_code, 204)
+
+        self.assertConsistent()
+        self.assertEqual(self.statistics()["average_rating"], 1)
+
+    def test_delete_last_review(self):
+        review = self.review(self.seekers[0], 4)
+        self.client.delete(f"/api/reviews/{review.pk}/")
+
+        self.assertConsistent()
+        self.assertEqual(self.statistics()["total_reviews"], 0)
+
+    def test_job_delete_cascades(self):
+        self.review(self.seekers[0], 4)
+        self.review(self.seekers[1], 2)
+        self.job.delete()
+
+        self.assertConsistent()
+        self.assertEqual(self.statistics()["total_reviews"], 0)
+
+    def test_recruiter_delete_cascades(self):
+        other = make_user("other@example.com", "recruiter")
+        other_job = make_job(other)
+        for seeker, rating in zip(self.seekers, (5, 3)):
+            self.review(seeker, rating)
+            Review.objects.create(
+                job=other_job, recruiter=other, reviewer=seeker, rating=4
+            )
+
+        self.recruiter.delete()
+
+        self.assertConsistent()
+        self.assertEqual(
+            RecruiterRatingServices.statistics(other.pk)["total_reviews"], 2
+        )
+
+    def test_reviewer_delete_cascades(self):
+        self.review(self.seekers[0], 5)
+        self.review(self.seekers[1], 1)
+        self.seekers[0].delete()
+
+        self.assertConsistent()
+        self.assertEqual(self.statistics()["average_rating"], 1)
+
+    def test_cascade_queries_do_not_grow_with_reviews(self):
+        def delete_queries(reviews):
+            job = make_job(self.recruiter, f"Job with {reviews} reviews")
+            for seeker in self.seekers[:reviews]:
+                Review.objects.create(
+                    job=job, recruiter=self.recruiter, reviewer=seeker, rating=5
+                )
+            with CaptureQueriesContext(connection) as queries:
+                job.delete()
+            return len(queries)
+
+        self.assertEqual(delete_queries(1), delete_queries(3))
+        self.assertConsistent()
+
+
+class ReviewUpdateValidationTests(ReviewTestCase):
+    """Updates skip the create-only checks and never move a review"""
+
+    def setUp(self):
+        super().setUp()
+        self.target = self.review(self.seekers[0], 4)
+
+    def test_update_without_job_id(self):
+        response = self.client.put(
+            f"/api/reviews/{self.target.pk}/",
+            {"rating": 2, "comment": "Slow replies"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.target.refresh_from_db()
+        self.assertEqual((self.target.rating, self.target.comment), (2, "Slow replies"))
+
+    def test_job_id_is_ignored_on_update(self):
+        other = make_job(self.recruiter, "Other job")
+        response = self.client.patch(
+            f"/api/reviews/{self.target.pk}/",
+            {"job_id": other.pk, "rating": 5},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.target.refresh_from_db()
+        self.assertEqual((self.target.job_id, self.target.rating), (self.job.pk, 5))
+
+
+class ReviewHelpfulTests(ReviewTestCase):
+    """helpful_count must always match the number of votes"""
+
+    def setUp(self):
+        super().setUp()
+        self.target = self.review(self.seekers[0], 4)
+
+    def toggle(self, user):
+        self.client.force_authenticate(user)
+        response = self.client.post(f"/api/reviews/{self.target.pk}/helpful/")
+        self.assertEqual(response.status_code, 200)
+        return response.data["helpful_count"]
+
+    def assertConsistent(self, expected):
+        self.target.refresh_from_db()
+        self.assertEqual(self.target.helpful_votes.count(), expected)
+        self.assertEqual(self.target.helpful_count, expected)
+
+    def test_votes_add_up(self):
+        counts = [self.toggle(user) for user in (self.recruiter, *self.seekers[1:])]
+
+        self.assertEqual(counts, [1, 2, 3])
+        self.assertConsistent(3)
+
+    def test_second_toggle_removes_the_vote(self):
+        self.toggle(self.recruiter)
+        self.toggle(self.seekers[1])
+
+        self.assertEqual(self.toggle(self.recruiter), 1)
+        self.assertConsistent(1)
+        self.assertEqual(self.toggle(self.recruiter), 2)
+        self.assertConsistent(2)
+
+    def test_voter_delete_uncounts(self):
+        self.toggle(self.recruiter)
+        self.toggle(self.seekers[1])
+        self.seekers[1].delete()
+
+        self.assertConsistent(1)
+
+    def test_review_delete_takes_its_votes(self):
+        self.toggle(self.recruiter)
+        self.toggle(self.seekers[1])
+        self.job.delete()
+
+        self.assertFalse(ReviewHelpful.objects.exists())
+
+
+class ReviewQueryCountTests(ReviewTestCase):
+    """Review lists cost the same number of queries however long they are"""
+
+    def setUp(self):
+        super().setUp()
+        for seeker, rating in zip(self.seekers, (5, 4, 3)):
+            self.target = self.review(seeker, rating)
+
+    def assertQueries(self, count, url, user=None):
+        self.client.force_authenticate(user)
+        with self.assertNumQueries(count):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_lists(self):
+        recruiter, job = self.recruiter.pk, self.job.pk
+        data = self.assertQueries(
+            1, f"/api/reviews/recruiter_reviews/?recruiter_id={recruiter}"
+        )
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data[0]["recruiter_name"], "recruiter")
+        self.assertQueries(1, f"/api/reviews/job_reviews/?job_id={job}")
+        self.assertQueries(1, "/api/reviews/my_received_reviews/", self.recruiter)
+        self.assertQueries(1, "/api/reviews/my_reviews/", self.seekers[0])
+        self.assertEqual(len(self.assertQueries(2, "/api/reviews/")["results"]), 3)
+
+    def test_detail(self):
+        data = self.assertQueries(1, f"/api/reviews/{self.target.pk}/")
+        self.assertEqual(data["job"]["recruiter_name"], "recruiter")
+        self.assertEqual(data["reviewer_email"], self.target.reviewer.email)
+
+
+class ReviewPermissionTests(ReviewTestCase):
+    def setUp(self):
+        super().setUp()
+        self.target = self.review(self.seekers[0], 4)
+        self.client.force_authenticate(None)
+
+    def test_public_actions_need_no_login(self):
+        recruiter, job = self.recruiter.pk, self.job.pk
+        for url in (
+            "/api/reviews/",
+            f"/api/reviews/{self.target.pk}/",
+            f"/api/reviews/recruiter_reviews/?recruiter_id={recruiter}",
+            f"/api/reviews/recruiter_statistics/?recruiter_id={recruiter}",
+            f"/api/reviews/job_reviews/?job_id={job}",
+            "/api/reviews/top_recruiters/",
+            f"/api/reviews/{self.target.pk}/helpful_votes/",
+        ):
+            self.assertEqual(self.client.get(url).status_code, 200, url)
+
+    def test_personal_actions_need_login(self):
+        for method, url in (
+            ("get", "/api/reviews/my_reviews/"),
+            ("get", "/api/reviews/my_received_reviews/"),
+            ("post", f"/api/reviews/{self.target.pk}/helpful/"),
+            ("post", "/api/reviews/"),
+            ("patch", f"/api/reviews/{self.target.pk}/"),
+            ("delete", f"/api/reviews/{self.target.pk}/"),
+        ):
+            response = getattr(self.client, method)(url)
+            self.assertEqual(response.status_code, 401, url)
+
+    def test_only_seekers_create(self):
+        self.client.force_authenticate(self.recruiter)
+        response = self.client.post(
+            "/api/reviews/", {"job_id": self.job.pk, "rating": 5}, format="json"
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_only_the_reviewer_edits(self):
+        self.client.force_authenticate(self.seekers[1])
+        response = self.client.patch(
+            f"/api/reviews/{self.target.pk}/", {"rating": 1}, format="json"
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.seekers = [
+            make_user(f"seeker{index}@example.com", "seeker") for index in range(5)
+        ]
+        # Mean rating 4: one 5 (newcomer), five 5s (steady), two 1s (poor)
+        self.newcomer = self.make_recruiter("newcomer", [5])
+        self.steady = self.make_recruiter("steady", [5] * 5)
+        self.poor = self.make_recruiter("poor", [1, 1])
+
+    def make_recruiter(self, name, ratings):
+        recruiter = make_user(f"{name}@example.com", "recruiter")
+        job = make_job(recruiter)
+        for seeker, rating in zip(self.seekers, ratings):
+            self.rate(seeker, job, rating)
+        return recruiter
+
+    def rate(self, seeker, job, rating):
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(
+                job=job, recruiter=job.recruiter, reviewer=seeker, rating=rating
+            )
+
+    def ranking(self):
+        response = self.client.get("/api/reviews/top_recruiters/")
+        self.assertEqual(response.status_code, 200)
+        return [row["recruiter"] for row in response.data]
+
+    def test_track_record_beats_a_single_review(self):
+        LeaderboardServices.refresh()
+
+        self.assertEqual(
+            self.ranking(), [self.steady.pk, self.newcomer.pk, self.poor.pk]
+        )
+        top = LeaderboardServices.top(1)[0]
+        # (5 * 4 + 25) / (5 + 5)
+        self.assertEqual((top["score"], top["review_count"]), (4.5, 5))
+
+    def test_empty_snapshot_is_built_on_demand(self):
+        self.assertEqual(self.ranking()[0], self.steady.pk)
+
+    def test_review_writes_mark_the_snapshot_stale(self):
+        LeaderboardServices.refresh()
+        self.assertFalse(LeaderboardServices.is_stale())
+
+        # Lifts the newcomer to (5 * 4 + 10) / 7 = 4.29, still below steady
+        self.rate(self.seekers[1], self.newcomer.jobs.get(), 5)
+        self.assertTrue(LeaderboardServices.is_stale())
+        self.assertEqual(len(self.ranking()), 3)
+
+        call_command("refresh_leaderboard", "--if-stale", stdout=io.StringIO())
+        self.assertFalse(LeaderboardServices.is_stale())
+        self.assertEqual(LeaderboardServices.top(3)[1]["review_count"], 2)
+
+    def test_review_writes_drop_the_cached_prior(self):
+        LeaderboardServices.refresh()
+        self.assertEqual(cache.get(LeaderboardServices.prior_key), 4)
+
+        self.rate(self.seekers[1], self.newcomer.jobs.get(), 5)
+        self.assertIsNone(cache.get(LeaderboardServices.prior_key))
+        self.assertAlmostEqual(LeaderboardServices.prior(), 37 / 9)
+
+    def test_deleted_recruiter_leaves_no_gap(self):
+        LeaderboardServices.refresh()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.steady.delete()
 
-# Create your tests here.
+        self.assertEqual([row["rank"] for row in LeaderboardServices.top(10)], [1, 2])
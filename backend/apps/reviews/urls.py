@@ -40,6 +40,7 @@ urlpatterns = [
 # /api/reviews/top_recruiters/?limit=20
 # /api/reviews/?recruiter_id=1&rating=5
 # /api/reviews/?search=django&ordering=-created_at
+# /api/reviews/?pagination=cursor (keyset pages on -created_at, id)
 
 # ============ CORE CRUD ============
 # GET /api/reviews/
@@ -136,16 +137,18 @@ urlpatterns = [
 #   - Example: GET /api/reviews/job_reviews/?job_id=5
 
 # GET /api/reviews/top_recruiters/
-#   - Get top rated recruiters by average rating
+#   - Get top rated recruiters by Bayesian score (precomputed leaderboard)
 #   - Anyone can access
 #   - Optional param: limit (default 10, max 100)
-#   - Returns: List of recruiters with avg_rating, review_count
+#   - Returns: List of recruiters with rank, avg_rating, review_count, score
 #   - Returns: [
 #       {
+#         "rank": 1,
 #         "recruiter": 3,
 #         "recruiter__full_name": "Jane Recruiter",
 #         "avg_rating": 4.8,
-#         "review_count": 15
+#         "review_count": 15,
+#         "score": 4.62
 #       },
 #       ...
 #     ]
@@ -4,10 +4,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Avg, Count
 from drf_yasg import openapi
 
-from apps.reviews.models import Review, ReviewHelpful
+from apps.reviews.models import RecruiterRatingSummary, Review
+from apps.reviews.services import (
+    LeaderboardServices,
+    RecruiterRatingServices,
+    ReviewHelpfulServices,
+)
 from apps.reviews.serializers import (
     ReviewListSerializer,
     ReviewDetailSerializer,
@@ -16,9 +20,10 @@ from apps.reviews.serializers import (
 )
 from apps.core.permissions import IsReviewerOrReadOnly, IsJobSeeker
 from apps.core.swagger_docs import SwaggerDocumentation
+from apps.jobs.querysets import QuerysetProfileMixin
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(QuerysetProfileMixin, viewsets.ModelViewSet):
     """
     ViewSet for Review management.
     - Anyone can view reviews
@@ -41,6 +46,17 @@ class ReviewViewSet(viewsets.ModelViewSet):
     ordering_fields = ["created_at", "rating"]
     ordering = ["-created_at"]
 
+    queryset_profiles = {
+        "list": "for_list",
+        "recruiter_reviews": "for_list",
+        "my_reviews": "for_list",
+        "my_received_reviews": "for_list",
+        "job_reviews": "for_list",
+        "retrieve": "for_detail",
+        "update": "for_detail",
+        "partial_update": "for_detail",
+    }
+
     def get_serializer_class(self):
         """Return different serializer based on action"""
         if self.action == "retrieve":
@@ -53,11 +69,20 @@ class ReviewViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         """
         Override permissions:
-        - List and retrieve: AllowAny
+        - List, retrieve and the public read actions: AllowAny
         - Create: IsAuthenticated + IsJobSeeker
         - Update, delete: IsAuthenticated + IsReviewer
+        - Other actions: IsAuthenticated
         """
-        if self.action in ["list", "retrieve"]:
+        if self.action in [
+            "list",
+            "retrieve",
+            "recruiter_reviews",
+            "recruiter_statistics",
+            "job_reviews",
+            "top_recruiters",
+            "helpful_votes",
+        ]:
             permission_classes = [AllowAny]
         elif self.action == "create":
             permission_classes = [IsAuthenticated, IsJobSeeker]
@@ -157,7 +182,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        reviews = Review.objects.filter(recruiter_id=recruiter_id)
+        reviews = self.get_queryset().filter(recruiter_id=recruiter_id)
 
         # Optional: filter by job if job_id provided
         job_id = request.query_params.get("job_id")
@@ -184,7 +209,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        reviews = Review.objects.filter(reviewer=request.user)
+        reviews = self.get_queryset().filter(reviewer=request.user)
         serializer = ReviewListSerializer(reviews, many=True)
         return Response(serializer.data)
 
@@ -205,7 +230,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        reviews = Review.objects.filter(recruiter=request.user)
+        reviews = self.get_queryset().filter(recruiter=request.user)
         serializer = ReviewListSerializer(reviews, many=True)
         return Response(serializer.data)
 
@@ -245,33 +270,8 @@ class ReviewViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        reviews = Review.objects.filter(recruiter_id=recruiter_id)
-
-        # Calculate statistics
-        total = reviews.count()
-
-        if total == 0:
-            statistics = {
-                "total_reviews": 0,
-                "average_rating": 0,
-                "five_star": 0,
-                "four_star": 0,
-                "three_star": 0,
-                "two_star": 0,
-                "one_star": 0,
-            }
-        else:
-            average = reviews.aggregate(avg_rating=Avg("rating"))["avg_rating"]
-
-            statistics = {
-                "total_reviews": total,
-                "average_rating": round(average, 2),
-                "five_star": reviews.filter(rating=5).count(),
-                "four_star": reviews.filter(rating=4).count(),
-                "three_star": reviews.filter(rating=3).count(),
-                "two_star": reviews.filter(rating=2).count(),
-                "one_star": reviews.filter(rating=1).count(),
-            }
+        # Served from the recruiter's rating rollup (one row lookup)
+        statistics = RecruiterRatingServices.statistics(recruiter_id)
 
         serializer = ReviewStatisticsSerializer(statistics)
         return Response(serializer.data)
@@ -304,7 +304,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        reviews = Review.objects.filter(job_id=job_id)
+        reviews = self.get_queryset().filter(job_id=job_id)
         serializer = ReviewListSerializer(reviews, many=True)
         return Response(serializer.data)
 
@@ -323,19 +323,23 @@ class ReviewViewSet(viewsets.ModelViewSet):
                 description="Number of recruiters to return",
             )
         ],
-        description="Get top recruiters by average rating",
+        description="Get top recruiters by Bayesian-weighted rating",
     )
     @action(detail=False, methods=["get"], permission_classes=[AllowAny])
     def top_recruiters(self, request):
-        """Get top recruiters by average rating"""
+        """Get top recruiters by Bayesian score (precomputed leaderboard)"""
         limit = int(request.query_params.get("limit", 10))
+        limit = max(1, min(limit, 100))
 
-        recruiters = (
-            Review.objects.values("recruiter", "recruiter__full_name")
-            .annotate(avg_rating=Avg("rating"), review_count=Count("id"))
-            .filter(review_count__gte=1)  # Only recruiters with at least 1 review
-            .order_by("-avg_rating")[:limit]
-        )
+        recruiters = LeaderboardServices.top(limit)
+
+        # Snapshot not built yet (fresh deploy); build it once on demand
+        if (
+            not recruiters
+            and RecruiterRatingSummary.objects.filter(review_count__gte=1).exists()
+        ):
+            LeaderboardServices.refresh()
+            recruiters = LeaderboardServices.top(limit)
 
         return Response(recruiters)
 
@@ -358,31 +362,20 @@ class ReviewViewSet(viewsets.ModelViewSet):
         Toggles helpful vote (add if not exists, remove if exists).
         """
         review = self.get_object()
-        user = request.user
 
-        # Check if user has already marked this review as helpful
-        helpful_vote = ReviewHelpful.objects.filter(review=review, user=user).first()
+        marked, helpful_count = ReviewHelpfulServices.toggle(review, request.user)
 
-        if helpful_vote:
-            # User already marked as helpful, so remove the vote (toggle)
-            helpful_vote.delete()
-            return Response(
-                {
-                    "message": "Review marked as not helpful",
-                    "helpful_count": review.helpful_votes.count(),
-                },
-                status=status.HTTP_200_OK,
-            )
-        else:
-            # Mark as helpful (create vote)
-            ReviewHelpful.objects.create(review=review, user=user)
-            return Response(
-                {
-                    "message": "Review marked as helpful",
-                    "helpful_count": review.helpful_votes.count(),
-                },
-                status=status.HTTP_200_OK,
-            )
+        return Response(
+            {
+                "message": (
+                    "Review marked as helpful"
+                    if marked
+                    else "Review marked as not helpful"
+                ),
+                "helpful_count": helpful_count,
+            },
+            status=status.HTTP_200_OK,
+        )
 
     @SwaggerDocumentation.custom_action(
         method="get",
@@ -401,7 +394,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
         """Get helpful votes count and votes details for a review"""
         review = self.get_object()
 
-        helpful_count = review.helpful_votes.count()
+        helpful_count = review.helpful_count
         is_helpful_by_user = False
 
         if request.user.is_authenticated:
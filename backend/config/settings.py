@@ -28,6 +28,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "drf_yasg",
     "rest_framework",
     "django_filters",
@@ -43,6 +44,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "apps.core.middleware.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -138,13 +140,34 @@ STORAGES = {
     },
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "jobly"),
+        "TIMEOUT": int(os.environ.get("CACHE_TIMEOUT", 300)),
+    }
+}
+
+# Seconds a cached public job response (list, detail, similar jobs) is kept
+# (0 disables). Needs a cache shared by all workers (see apps.jobs.checks)
+JOB_CACHE_TIMEOUT = int(os.environ.get("JOB_CACHE_TIMEOUT", 0))
+
+# Most frequent values returned per facet by GET /api/jobs/?facets=...
+JOB_FACET_LIMIT = int(os.environ.get("JOB_FACET_LIMIT", 20))
+
+# Seconds the authenticated user is cached per token subject (0 disables).
+# Needs a cache shared by all workers (see apps.authentication.checks)
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get("AUTH_USER_CACHE_TIMEOUT", 0))
+
 REST_FRAMEWORK = {
     "COERCE_DECIMAL_TO_STRING": False,
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.authentication.authentication.CachedJWTAuthentication",
     ),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "apps.core.pagination.StandardPagination",
     "PAGE_SIZE": 10,
 }
 
@@ -177,6 +200,75 @@ DEFAULT_FROM_EMAIL = os.environ.get("BREVO_EMAIL")
 
 FRONTEND_URL = os.environ.get("FRONTEND_URL")
 
+# Serve application status_summary from the denormalized counter table
+# (run `manage.py reconcile_application_counters` before enabling)
+APPLICATION_STATUS_COUNTERS = (
+    os.environ.get("APPLICATION_STATUS_COUNTERS", "False") == "True"
+)
+
+# Top recruiters leaderboard (refreshed by `manage.py refresh_leaderboard`)
+LEADERBOARD_SIZE = int(os.environ.get("LEADERBOARD_SIZE", 100))
+# Number of "virtual" reviews at the global mean added to every recruiter
+LEADERBOARD_PRIOR_WEIGHT = float(os.environ.get("LEADERBOARD_PRIOR_WEIGHT", 5))
+# Seconds the global mean rating is cached (also dropped on every review write)
+LEADERBOARD_PRIOR_TIMEOUT = int(os.environ.get("LEADERBOARD_PRIOR_TIMEOUT", 3600))
+
+# Transactional email outbox (drained by `manage.py send_outbox_emails`)
+EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = int(
+    os.environ.get("EMAIL_OUTBOX_RETRY_BASE_SECONDS", 60)
+)
+# Seconds a claimed email stays with its worker before another may retry it
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.environ.get("EMAIL_OUTBOX_LEASE_SECONDS", 300))
+
+# Bulk email (send_bulk_email / `manage.py send_announcement`): recipients per
+# connection, concurrent chunks and the overall send rate (0 = unlimited)
+EMAIL_BULK_CHUNK_SIZE = int(os.environ.get("EMAIL_BULK_CHUNK_SIZE", 100))
+EMAIL_BULK_WORKERS = int(os.environ.get("EMAIL_BULK_WORKERS", 4))
+EMAIL_BULK_RATE_PER_SECOND = float(os.environ.get("EMAIL_BULK_RATE_PER_SECOND", 20))
+
+# similar_jobs: neighbors stored per job (`manage.py build_similar_jobs`) and
+# hashed feature dimensions of the job vectors (rebuild after changing it)
+SIMILAR_JOBS_NEIGHBORS = int(os.environ.get("SIMILAR_JOBS_NEIGHBORS", 10))
+SIMILAR_JOBS_FEATURES = int(os.environ.get("SIMILAR_JOBS_FEATURES", 2048))
+
+# Personalized seeker feed: jobs kept per seeker (`manage.py refresh_seeker_feeds`)
+SEEKER_FEED_SIZE = int(os.environ.get("SEEKER_FEED_SIZE", 50))
+
+# Bulk job import (bulk_import action and `manage.py import_jobs`)
+JOB_IMPORT_MAX_ROWS = int(os.environ.get("JOB_IMPORT_MAX_ROWS", 1000))
+JOB_IMPORT_BATCH_SIZE = int(os.environ.get("JOB_IMPORT_BATCH_SIZE", 500))
+
+# Rows fetched per server-side cursor round trip and written per streamed
+# chunk by the applications export
+APPLICATION_EXPORT_CHUNK_SIZE = int(
+    os.environ.get("APPLICATION_EXPORT_CHUNK_SIZE", 2000)
+)
+
+# Maximum applications per bulk_update_status request
+APPLICATION_BULK_UPDATE_MAX = int(os.environ.get("APPLICATION_BULK_UPDATE_MAX", 500))
+
+# Per-request timing: Server-Timing header and a log record for slow requests
+REQUEST_TIMING = os.environ.get("REQUEST_TIMING", "False") == "True"
+REQUEST_TIMING_SLOW_MS = int(os.environ.get("REQUEST_TIMING_SLOW_MS", 500))
+
+# Prometheus metrics at /metrics/ (set PROMETHEUS_MULTIPROC_DIR under gunicorn)
+METRICS = os.environ.get("METRICS", "False") == "True"
+# Bearer token required to scrape /metrics/ (unset: only served with DEBUG)
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "apps": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
 if DEBUG:
     INSTALLED_APPS += [
         "debug_toolbar",
@@ -0,0 +1,24 @@
+import os
+
+# Prometheus multiprocess mode: each worker writes its metrics to files in
+# PROMETHEUS_MULTIPROC_DIR, which /metrics/ aggregates
+
+
+def on_starting(server):
+    """Start from an empty metrics directory (files of a previous run)"""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        return
+
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+
+
+def child_exit(server, worker):
+    """Drop the live-gauge files of a worker that exited"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)